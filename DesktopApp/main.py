@@ -4,6 +4,8 @@ import os
 
 # Add root directory to path to import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for bpd_common, shared with WebApp
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from _config.theme import Theme
 from components.side_bar import SideBar
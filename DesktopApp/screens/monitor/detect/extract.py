@@ -57,7 +57,7 @@ def get_multiple_predictions(label_encoder,prediction, threshold=0.5):
         predicted_label = label_encoder.inverse_transform([np.argmax(prediction)])
         return predicted_label
 
-def display_postures(frame, postures):
+def display_postures(frame, postures, font_scale=1):
         """Display posture labels on the frame"""
         # Convert posture name to string if it's not already
         posture_text = str(postures[0]) if isinstance(postures, (list, np.ndarray)) else str(postures)
@@ -68,7 +68,7 @@ def display_postures(frame, postures):
             posture_text,
             (20, 40),  # Position at top-left with some margin
             cv2.FONT_HERSHEY_SIMPLEX,
-            1,  # Font scale
+            font_scale,  # Font scale
             (255, 0, 0),  # Blue color in RGB
             2,  # Line thickness
             cv2.LINE_AA  # Anti-aliased line type
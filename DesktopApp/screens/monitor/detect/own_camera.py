@@ -11,11 +11,18 @@ import time
 from components.button import ButtonFactory
 from _config.theme import Theme
 from utils.model_loader import load_model_and_encoder
+from utils.frame_utils import resize_for_display, resize_for_processing
+from utils.adaptive_pose import AdaptivePose
+from utils.presence import PresenceGate
+from bpd_common.frame_dedup import FrameDeduplicator, PostureResult
+from bpd_common.landmark_filter import OneEuroFilter
 from screens.monitor.detect.extract import extract_keypoints, get_multiple_predictions, display_postures
 # Initialize MediaPipe
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
-pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5)
+
+# Pose chạy trên bản thu nhỏ (frame_utils.PROCESS_WIDTH), overlay vẽ trực tiếp ở kích thước hiển thị
+DISPLAY_SIZE = (448, 293)
 
 class OwnCamera(ctk.CTkFrame):
     def __init__(self, parent, controller=None, **kwargs):
@@ -46,9 +53,16 @@ class OwnCamera(ctk.CTkFrame):
         encoder_path = os.path.join(os.path.dirname(__file__), 'models/label_encoder.resolved.pkl')
         self.model, self.label_encoder = load_model_and_encoder(model_path, encoder_path)
 
-        # Initialize Mediapipe
+        # Initialize Mediapipe (tự chọn lite / full / heavy theo tải máy)
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5)
+        self.pose = AdaptivePose(static_image_mode=False, min_detection_confidence=0.5)
+
+        # Tạm dừng pose/classifier khi không có người trước camera
+        self.presence = PresenceGate()
+        # Bỏ qua pose/classifier khi khung hình gần như không đổi
+        self.dedup = FrameDeduplicator()
+        # Làm mượt keypoints theo thời gian để nhãn không bị nhảy
+        self.smoother = OneEuroFilter()
 
     def create_title_section(self):
         """Tạo phần tiêu đề riêng biệt trên cùng"""
@@ -163,6 +177,9 @@ class OwnCamera(ctk.CTkFrame):
                 print("Camera không thể mở!")
                 return
             self.camera_active = True
+            self.presence.reset()
+            self.dedup.reset()
+            self.smoother.reset()
             self.start_button.configure(
                 text="Stop Monitoring",
                 command=self.toggle_camera
@@ -171,8 +188,18 @@ class OwnCamera(ctk.CTkFrame):
             self.camera_thread.daemon = True
             self.camera_thread.start()
 
+    def session_stats(self):
+        """Thống kê phiên theo dõi: pose model, presence và dedup"""
+        stats = {}
+        stats.update(self.pose.stats())
+        stats.update(self.presence.stats())
+        stats.update(self.dedup.stats())
+        return stats
+
     def stop_camera(self):
         """Dừng camera"""
+        if self.camera_active:
+            print(f"Session stats: {self.session_stats()}")
         self.camera_active = False
         if self.cap and self.cap.isOpened():
             self.cap.release()
@@ -190,35 +217,53 @@ class OwnCamera(ctk.CTkFrame):
 
         ret, frame = self.cap.read()
         if ret:
-            # Chuyển đổi màu OpenCV từ BGR -> RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_rgb.flags.writeable = False
-
-            results = pose.process(frame_rgb)
-            frame_rgb.flags.writeable = True
-
-            if results.pose_landmarks:
+            process_frame = resize_for_processing(frame)
+            frame_rgb = cv2.cvtColor(resize_for_display(frame, DISPLAY_SIZE), cv2.COLOR_BGR2RGB)
+
+            result = None
+            if self.presence.should_process(process_frame):
+                result = self.dedup.lookup(process_frame)
+                if result is None:
+                    result = self.run_pipeline(process_frame)
+                    self.dedup.store(result)
+                self.presence.report(result.landmarks is not None, process_frame)
+
+            if self.presence.idle:
+                display_postures(frame_rgb, "Away", font_scale=0.6)
+            elif result is not None and result.landmarks is not None:
+                # Landmark đã chuẩn hoá [0, 1] nên vẽ thẳng lên khung hiển thị
                 mp_drawing.draw_landmarks(
-                    frame_rgb, results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
-                    mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=2)
+                    frame_rgb, result.landmarks, mp_pose.POSE_CONNECTIONS,
+                    mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=1, circle_radius=1),
+                    mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=1, circle_radius=1)
                 )
 
-                keypoints = extract_keypoints(results)
-                if keypoints is not None:
-                    keypoints = np.expand_dims(keypoints, axis=0)
-                    keypoints = keypoints.reshape((1, 33, 3, 1))
-                    prediction = self.model.predict(keypoints, verbose=0)
-                    posture_label = get_multiple_predictions(self.label_encoder,prediction, threshold=0.5)
-                    display_postures(frame_rgb, posture_label)
-
-            frame_rgb = cv2.resize(frame_rgb, (448, 293))
+                if result.prediction is not None:
+                    posture_label = get_multiple_predictions(self.label_encoder, result.prediction, threshold=0.5)
+                    display_postures(frame_rgb, posture_label, font_scale=0.6)
 
             img = ImageTk.PhotoImage(Image.fromarray(frame_rgb))
             self.camera_label.configure(image=img, text="")
             self.camera_label.image = img
 
-        self.after(30, self.update_video)
+        self.after(self.presence.poll_interval_ms, self.update_video)
+
+    def run_pipeline(self, process_frame):
+        """Chạy pose + classifier trên khung hình đã thu nhỏ (BGR)"""
+        # Chuyển đổi màu OpenCV từ BGR -> RGB (trên bản đã thu nhỏ)
+        process_rgb = cv2.cvtColor(process_frame, cv2.COLOR_BGR2RGB)
+        process_rgb.flags.writeable = False
+        results = self.pose.process(process_rgb)
+
+        result = PostureResult(landmarks=results.pose_landmarks, keypoints=extract_keypoints(results))
+        if result.keypoints is None:
+            self.smoother.reset()
+        else:
+            result.keypoints = self.smoother(result.keypoints)
+            keypoints = np.expand_dims(result.keypoints, axis=0)
+            keypoints = keypoints.reshape((1, 33, 3, 1))
+            result.prediction = self.model.predict(keypoints, verbose=0)
+        return result
 
 
 
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add root directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import adaptive_pose
+from utils.adaptive_pose import AdaptivePose
+
+# Fake per-frame latency of lite / full / heavy, in seconds
+LATENCY = {0: 0.003, 1: 0.005, 2: 0.015}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    """Fake estimators that advance a fake clock by their latency and report `scene.visibility`"""
+    clock = FakeClock()
+    scene = SimpleNamespace(visibility=0.3)
+
+    class FakePose:
+        def __init__(self, model_complexity, **kwargs):
+            self.complexity = model_complexity
+
+        def process(self, image):
+            clock.now += LATENCY[self.complexity]
+            landmarks = [SimpleNamespace(visibility=scene.visibility)] * 33
+            return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(adaptive_pose, "mp_pose", SimpleNamespace(Pose=FakePose))
+    monkeypatch.setattr(time, "perf_counter", clock)
+    monkeypatch.setattr(os, "getloadavg", lambda: (0.0, 0.0, 0.0), raising=False)
+    return scene
+
+
+def run(pose, frames):
+    for _ in range(frames):
+        pose.process(None)
+
+
+def test_heavy_on_poor_visibility_then_back_to_full(scene):
+    pose = AdaptivePose(initial_complexity=1, hysteresis_frames=3, cooldown_frames=5, smoothing=1.0)
+
+    run(pose, 2)
+    assert pose.name == "full"  # not enough agreeing frames yet
+    run(pose, 1)
+    assert pose.name == "heavy"
+
+    scene.visibility = 0.95
+    run(pose, 5 + 2)
+    assert pose.name == "heavy"  # cooldown, then hysteresis
+    run(pose, 1)
+    assert pose.name == "full"
+    assert pose.switches == 2
+
+    # Good visibility keeps it on full
+    run(pose, 50)
+    assert pose.name == "full"
+
+
+def test_heavy_is_kept_inside_the_visibility_margin(scene):
+    pose = AdaptivePose(initial_complexity=1, hysteresis_frames=3, cooldown_frames=5, smoothing=1.0)
+    run(pose, 3)
+    assert pose.name == "heavy"
+
+    scene.visibility = 0.65  # above min_visibility (0.6), below it plus the margin (0.7)
+    run(pose, 50)
+    assert pose.name == "heavy"
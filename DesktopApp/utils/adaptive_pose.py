@@ -0,0 +1,180 @@
+"""
+Adaptive MediaPipe Pose wrapper.
+Keeps the lite, full and heavy estimators loaded and switches between them
+based on measured latency, CPU load and landmark visibility.
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+import mediapipe as mp
+import numpy as np
+
+mp_pose = mp.solutions.pose
+
+# MediaPipe model_complexity -> readable name
+COMPLEXITY_NAMES = {0: "lite", 1: "full", 2: "heavy"}
+
+
+class AdaptivePose:
+    """
+    Drop-in replacement for `mp_pose.Pose` that picks the model complexity.
+
+    The controller steps down when the smoothed latency exceeds the frame
+    budget or the machine is busy, and steps up when there is headroom. Heavy
+    is only used when the full model reports poorly visible landmarks, and is
+    left again once visibility is back above `min_visibility` plus a margin. A
+    switch needs `hysteresis_frames` consecutive frames agreeing on the same
+    direction and is followed by a cooldown, so it does not thrash.
+    """
+
+    def __init__(
+        self,
+        latency_budget_ms: float = 33.0,
+        initial_complexity: Optional[int] = None,
+        min_visibility: float = 0.6,
+        visibility_margin: float = 0.1,
+        hysteresis_frames: int = 30,
+        cooldown_frames: int = 90,
+        smoothing: float = 0.1,
+        **pose_kwargs
+    ):
+        """
+        Args:
+            latency_budget_ms: Target time per `process` call
+            initial_complexity: Starting complexity, guessed from the CPU count if None
+            min_visibility: Mean landmark visibility below which heavy is allowed
+            visibility_margin: How far above min_visibility visibility must recover
+                before heavy steps back down to full
+            hysteresis_frames: Consecutive frames required before switching
+            cooldown_frames: Frames to wait after a switch before the next one
+            smoothing: Weight of the newest sample in the moving averages
+            **pose_kwargs: Passed to every `mp_pose.Pose` instance
+        """
+        pose_kwargs.setdefault("static_image_mode", False)
+        pose_kwargs.setdefault("min_detection_confidence", 0.5)
+        self.estimators = {
+            complexity: mp_pose.Pose(model_complexity=complexity, **pose_kwargs)
+            for complexity in COMPLEXITY_NAMES
+        }
+
+        if initial_complexity is None:
+            initial_complexity = 1 if (os.cpu_count() or 1) >= 4 else 0
+        self.complexity = initial_complexity
+
+        self.latency_budget_ms = latency_budget_ms
+        self.min_visibility = min_visibility
+        self.visibility_margin = visibility_margin
+        self.hysteresis_frames = hysteresis_frames
+        self.cooldown_frames = cooldown_frames
+        self.smoothing = smoothing
+
+        # Smoothed latency per complexity, filled in as each model gets used
+        self.latency_ms = {0: None, 1: None, 2: None}
+        self.visibility = None
+        self.cpu_load = None
+        self.switches = 0
+
+        self._pending = 0  # signed count of frames asking to go up (+) / down (-)
+        self._cooldown = 0
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+
+    @property
+    def name(self) -> str:
+        """Name of the active model"""
+        return COMPLEXITY_NAMES[self.complexity]
+
+    def process(self, image: np.ndarray):
+        """Run the active estimator and update the controller"""
+        start = time.perf_counter()
+        results = self.estimators[self.complexity].process(image)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.latency_ms[self.complexity] = self._ema(self.latency_ms[self.complexity], elapsed_ms)
+        if results.pose_landmarks:
+            visibility = float(np.mean([lm.visibility for lm in results.pose_landmarks.landmark]))
+            self.visibility = self._ema(self.visibility, visibility)
+        self.cpu_load = self._measure_cpu_load()
+
+        self._update(self._desired_step())
+        return results
+
+    def close(self):
+        """Release all estimators"""
+        for estimator in self.estimators.values():
+            estimator.close()
+
+    def stats(self) -> Dict[str, object]:
+        """Current controller state for session statistics"""
+        latency = self.latency_ms[self.complexity]
+        return {
+            "pose_model": self.name,
+            "pose_complexity": self.complexity,
+            "pose_latency_ms": round(latency, 1) if latency is not None else None,
+            "cpu_load": round(self.cpu_load, 2) if self.cpu_load is not None else None,
+            "landmark_visibility": round(self.visibility, 2) if self.visibility is not None else None,
+            "pose_model_switches": self.switches,
+        }
+
+    def _ema(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return previous + self.smoothing * (value - previous)
+
+    def _measure_cpu_load(self) -> float:
+        """System load per core where available, otherwise this process' CPU share"""
+        cpus = os.cpu_count() or 1
+        if hasattr(os, "getloadavg"):
+            return min(os.getloadavg()[0] / cpus, 1.0)
+
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        wall, cpu = now_wall - self._last_wall, now_cpu - self._last_cpu
+        self._last_wall, self._last_cpu = now_wall, now_cpu
+        load = min(cpu / (wall * cpus), 1.0) if wall > 0 else 0.0
+        return self._ema(self.cpu_load, load)
+
+    def _predicted_latency(self, complexity: int) -> float:
+        """Measured latency of a model, or an estimate from the active one"""
+        if self.latency_ms[complexity] is not None:
+            return self.latency_ms[complexity]
+        # Rough relative cost of lite / full / heavy on CPU
+        cost = {0: 1.0, 1: 1.6, 2: 4.5}
+        return self.latency_ms[self.complexity] * cost[complexity] / cost[self.complexity]
+
+    def _desired_step(self) -> int:
+        """-1 to step down, +1 to step up, 0 to stay"""
+        latency = self.latency_ms[self.complexity]
+        busy = self.cpu_load is not None and self.cpu_load > 0.9
+        if self.complexity > 0 and (latency > self.latency_budget_ms or busy):
+            return -1
+        # Landmarks are visible again: full is good enough
+        if self.complexity == 2 and self.visibility is not None \
+                and self.visibility >= self.min_visibility + self.visibility_margin:
+            return -1
+
+        target = self.complexity + 1
+        if target not in COMPLEXITY_NAMES or (self.cpu_load or 0.0) > 0.6:
+            return 0
+        # Heavy only pays off when the full model struggles to see the user
+        if target == 2 and (self.visibility is None or self.visibility >= self.min_visibility):
+            return 0
+        if self._predicted_latency(target) < 0.7 * self.latency_budget_ms:
+            return 1
+        return 0
+
+    def _update(self, step: int):
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+
+        if step == 0 or (step > 0) != (self._pending > 0):
+            self._pending = 0
+        self._pending += step
+
+        if abs(self._pending) >= self.hysteresis_frames:
+            self.complexity += step
+            self.switches += 1
+            self._pending = 0
+            self._cooldown = self.cooldown_frames
@@ -1,8 +1,13 @@
-import tensorflow as tf
 import pickle
 
 def load_model_and_encoder(model_path, encoder_path):
-    model = tf.keras.models.load_model(model_path)
+    # .npz: small distilled MLP that runs in NumPy, no TensorFlow needed
+    if model_path.endswith(".npz"):
+        from bpd_common.numpy_mlp import NumpyMLP
+        model = NumpyMLP.load(model_path)
+    else:
+        import tensorflow as tf
+        model = tf.keras.models.load_model(model_path)
     with open(encoder_path, "rb") as f:
         label_encoder = pickle.load(f)
     return model, label_encoder
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Cheap person-presence gate.
+Idles the pose and classifier stages while nobody is in front of the camera.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+THUMBNAIL_SIZE = (64, 48)
+
+
+def make_thumbnail(frame: np.ndarray, size: Tuple[int, int] = THUMBNAIL_SIZE) -> np.ndarray:
+    """Tiny blurred grayscale copy of a BGR/RGB frame as float32"""
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    small = cv2.GaussianBlur(small, (3, 3), 0)
+    return small.astype(np.float32)
+
+
+class PresenceGate:
+    """
+    Decides whether a frame is worth running pose on.
+
+    While active, every frame is processed. After `absent_frames` frames in a
+    row without landmarks the gate goes idle and remembers the empty scene as
+    a background thumbnail. While idle, frames are only compared against that
+    background (and the previous frame); a large enough change, or the
+    periodic probe, wakes the pipeline up again. The background slowly
+    follows the scene so lighting drift does not wake it.
+    """
+
+    def __init__(
+        self,
+        absent_frames: int = 45,
+        motion_threshold: float = 12.0,
+        probe_interval: float = 5.0,
+        active_interval_ms: int = 30,
+        idle_interval_ms: int = 250,
+        background_rate: float = 0.05,
+    ):
+        """
+        Args:
+            absent_frames: Frames without landmarks before going idle
+            motion_threshold: Mean absolute gray-level difference that counts as motion
+            probe_interval: Seconds between forced pose checks while idle
+            active_interval_ms: Capture interval while someone is present
+            idle_interval_ms: Capture interval while idle
+            background_rate: Running-average weight for the idle background
+        """
+        self.absent_frames = absent_frames
+        self.motion_threshold = motion_threshold
+        self.probe_interval = probe_interval
+        self.active_interval_ms = active_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.background_rate = background_rate
+
+        self.idle = False
+        self.frames_seen = 0
+        self.frames_idle = 0
+        self._missing = 0
+        self._background: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._last_probe = 0.0
+
+    @property
+    def poll_interval_ms(self) -> int:
+        """How long to wait before capturing the next frame"""
+        return self.idle_interval_ms if self.idle else self.active_interval_ms
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """Return True if pose should run on this frame"""
+        self.frames_seen += 1
+        if not self.idle:
+            return True
+
+        thumbnail = make_thumbnail(frame)
+        motion = max(
+            float(np.mean(cv2.absdiff(thumbnail, self._background))),
+            float(np.mean(cv2.absdiff(thumbnail, self._previous))),
+        )
+        self._previous = thumbnail
+
+        now = time.monotonic()
+        if motion >= self.motion_threshold or now - self._last_probe >= self.probe_interval:
+            self._last_probe = now
+            return True
+
+        cv2.accumulateWeighted(thumbnail, self._background, self.background_rate)
+        self.frames_idle += 1
+        return False
+
+    def report(self, has_landmarks: bool, frame: Optional[np.ndarray] = None):
+        """
+        Feed back whether pose found a person on a processed frame.
+
+        Args:
+            has_landmarks: Whether pose returned landmarks
+            frame: The frame, used as the background when going idle
+        """
+        if has_landmarks:
+            self._missing = 0
+            self.idle = False
+            return
+
+        self._missing += 1
+        if not self.idle and self._missing >= self.absent_frames and frame is not None:
+            self.idle = True
+            self._background = make_thumbnail(frame)
+            self._previous = self._background.copy()
+            self._last_probe = time.monotonic()
+
+    def reset(self):
+        """Forget the scene, e.g. when the camera is restarted"""
+        self.idle = False
+        self._missing = 0
+        self._background = None
+        self._previous = None
+
+    def stats(self) -> Dict[str, object]:
+        """Gate state for session statistics"""
+        return {
+            "presence": "away" if self.idle else "present",
+            "idle_frame_ratio": round(self.frames_idle / self.frames_seen, 3) if self.frames_seen else 0.0,
+        }
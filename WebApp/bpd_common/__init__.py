@@ -0,0 +1,13 @@
+"""
+WebApp's entry to the shared bpd_common package at the repository root.
+
+WebApp runs from its own directory, where the repository root is not on
+sys.path. Instead of each module adding it, this package points its
+submodule search path at ../bpd_common, so `from bpd_common.frame_dedup
+import ...` loads the shared files.
+"""
+
+import os
+
+__path__.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             "bpd_common"))
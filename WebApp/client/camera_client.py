@@ -0,0 +1,120 @@
+"""
+Reference camera client for the posture WebSocket server.
+
+Reads frames from a webcam or video file, sends them as JPEG frame
+messages and prints the results. Encoding hints from the server (JPEG
+quality, max width, fps) replace the settings given on the command line.
+Run from the WebApp directory:
+
+    python -m client.camera_client --url ws://localhost:8765/frames --camera-id 1
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+import cv2
+from websockets.asyncio.client import connect
+
+from server.protocol import EncodingHint, decode_hello, decode_result, encode_frame
+
+
+def encode_jpeg(frame, quality: int = 80) -> bytes:
+    """Encode a BGR frame as JPEG"""
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+@dataclass
+class EncodingSettings:
+    quality: int = 80
+    max_width: int = 640
+    fps: float = 0.0  # 0: as fast as credits allow
+
+    def apply(self, hint: EncodingHint):
+        """Take over the non-zero fields of a server hint"""
+        self.quality = hint.quality or self.quality
+        self.max_width = hint.max_width or self.max_width
+        self.fps = hint.fps or self.fps
+
+
+async def receive_results(websocket, classes, window: asyncio.Semaphore, settings: EncodingSettings):
+    """Print results, return the send credits they carry and apply encoding hints"""
+    async for data in websocket:
+        result = decode_result(data)
+        for _ in range(result.credits):
+            window.release()
+        if result.hint is not None:
+            settings.apply(result.hint)
+            print(f"encoding hint: quality {settings.quality}, max width {settings.max_width}, "
+                  f"{settings.fps:g} fps")
+        label = classes[result.label] if result.label is not None else "-"
+        rtt_ms = (time.time() - result.timestamp) * 1000
+        print(f"#{result.seq} {label} ({result.confidence:.1%}) "
+              f"server {result.latency_ms:.1f} ms, round trip {rtt_ms:.1f} ms, dropped {result.dropped}")
+
+
+async def stream_camera(url: str, camera_id: int, source, quality: int = 80, max_width: int = 640):
+    """
+    Send frames from `source` until it runs out, printing each result.
+
+    Frames are only captured when the server has granted a send credit, and
+    no faster than the server's fps hint, so the client sends at the rate
+    the server keeps up with and always sends the freshest frame.
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video source {source!r}")
+
+    settings = EncodingSettings(quality, max_width)
+    loop = asyncio.get_running_loop()
+    try:
+        async with connect(url) as websocket:
+            hello = decode_hello(await websocket.recv())
+            window = asyncio.Semaphore(hello.credits)
+            receiver = asyncio.create_task(receive_results(websocket, hello.classes, window, settings))
+            seq = 0
+            next_send = loop.time()
+            while not receiver.done():
+                await window.acquire()
+                if settings.fps > 0:
+                    await asyncio.sleep(max(0.0, next_send - loop.time()))
+                    next_send = max(next_send, loop.time()) + 1 / settings.fps
+                ret, frame = cap.read()
+                if not ret:
+                    window.release()
+                    break
+                captured_at = time.time()
+                if frame.shape[1] > settings.max_width:
+                    height = int(frame.shape[0] * settings.max_width / frame.shape[1])
+                    frame = cv2.resize(frame, (settings.max_width, height), interpolation=cv2.INTER_AREA)
+
+                data = encode_jpeg(frame, settings.quality)
+                await websocket.send(encode_frame(camera_id, seq, captured_at, data))
+                seq += 1
+
+            # Wait for the replies still in flight, then hang up
+            for _ in range(hello.credits):
+                await window.acquire()
+            receiver.cancel()
+    finally:
+        cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a camera to the posture server")
+    parser.add_argument("--url", default="ws://localhost:8765/frames")
+    parser.add_argument("--camera-id", type=int, default=0)
+    parser.add_argument("--source", default="0", help="Camera index or video file")
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    asyncio.run(stream_camera(args.url, args.camera_id, source, args.quality))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Reference edge client: runs MediaPipe on the device and sends keypoints.
+
+Instead of ~50 KB JPEG frames, each message carries the 33 x (x, y, z)
+pose keypoints (~270 bytes as float16), and the server skips decode and
+pose entirely. Run from the WebApp directory:
+
+    python -m client.keypoint_client --url ws://localhost:8765/keypoints --camera-id 1
+"""
+
+import argparse
+import asyncio
+import time
+
+import cv2
+import numpy as np
+from websockets.asyncio.client import connect
+
+from server.protocol import decode_hello, decode_result, encode_keypoints
+from utils.frame_utils import PROCESS_WIDTH, resize_for_processing
+from utils.keypoints_utils import get_pose_results, keypoints_from_results
+
+
+async def stream_keypoints(url: str, camera_id: int, source, half: bool = True):
+    """Extract keypoints from `source` frame by frame and print each result"""
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video source {source!r}")
+
+    dtype = np.float16 if half else np.float32
+    try:
+        async with connect(url) as websocket:
+            classes = decode_hello(await websocket.recv()).classes
+            seq = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                captured_at = time.time()
+
+                frame_rgb = cv2.cvtColor(resize_for_processing(frame, PROCESS_WIDTH), cv2.COLOR_BGR2RGB)
+                keypoints = keypoints_from_results(get_pose_results(frame_rgb))
+                if keypoints is None:
+                    continue  # nobody in view: nothing to classify
+
+                await websocket.send(encode_keypoints(camera_id, seq, captured_at, keypoints, dtype))
+                result = decode_result(await websocket.recv())
+                label = classes[result.label] if result.label is not None else "-"
+                print(f"#{result.seq} {label} ({result.confidence:.1%}) server {result.latency_ms:.1f} ms")
+                seq += 1
+    finally:
+        cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send on-device pose keypoints to the posture server")
+    parser.add_argument("--url", default="ws://localhost:8765/keypoints")
+    parser.add_argument("--camera-id", type=int, default=0)
+    parser.add_argument("--source", default="0", help="Camera index or video file")
+    parser.add_argument("--float32", action="store_true", help="Send float32 instead of float16")
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    asyncio.run(stream_keypoints(args.url, args.camera_id, source, half=not args.float32))
+
+
+if __name__ == "__main__":
+    main()
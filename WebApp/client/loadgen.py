@@ -0,0 +1,353 @@
+"""
+Load generator for the posture socket server.
+
+Replays a recorded video (frame mode) or a keypoint log (keypoint mode)
+from many simulated cameras at a fixed fps. It measures end-to-end
+latency percentiles, throughput and server-side drops, and writes a JSON
+report. Each camera follows the credit window like the reference
+clients: a tick without a credit is counted as skipped, not sent. Run
+from the WebApp directory:
+
+    python -m client.loadgen --url ws://localhost:8765 --cameras 50 --fps 15 \\
+        --source data/processed/dataset.csv --report bench.json
+
+With --stand-in, a local server process is started with a stub
+classifier (fixed per-call cost, no TensorFlow). The ingest path can then
+be benchmarked on any machine. Frame mode still runs MediaPipe in that
+server. Without --source, synthetic keypoints are sent.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import platform
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from client.camera_client import encode_jpeg
+from server.app import MAX_MESSAGE_SIZE
+from server.backpressure import DEFAULT_CREDITS
+from server.pipeline import ENCODER_PATH, PostureClassifier
+from server.protocol import decode_hello, decode_result, encode_frame, encode_keypoints
+
+KEYPOINT_LOG_EXTENSIONS = (".csv", ".npy", ".npz")
+DRAIN_TIMEOUT = 5.0
+PERCENTILES = (50, 90, 95, 99)
+
+
+# --- Stand-in server -------------------------------------------------------
+
+class StubModel:
+    """
+    Keras stand-in: a fixed random linear layer plus a fixed cost per call.
+
+    The per-call sleep models the model's fixed overhead, which is what
+    batching amortizes. The outputs depend on the input, so labels change
+    as the replayed keypoints do.
+    """
+
+    def __init__(self, n_classes: int, call_ms: float = 2.0, seed: int = 0):
+        self.call_ms = call_ms
+        self.weights = np.random.default_rng(seed).normal(size=(33 * 3, n_classes)).astype(np.float32)
+
+    def __call__(self, batch, training: bool = False) -> np.ndarray:
+        time.sleep(self.call_ms / 1000)
+        logits = np.asarray(batch, dtype=np.float32).reshape(len(batch), -1) @ self.weights
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def load_stub_classifier(encoder_path: str = ENCODER_PATH, call_ms: float = 2.0) -> PostureClassifier:
+    """Stub model with the real class table when the label encoder can be loaded"""
+    try:
+        with open(encoder_path, "rb") as f:
+            label_encoder = pickle.load(f)
+    except (OSError, ImportError, AttributeError, pickle.UnpicklingError):
+        label_encoder = types.SimpleNamespace(classes_=np.array(["class_0", "class_1", "class_2"]))
+    return PostureClassifier(StubModel(len(label_encoder.classes_), call_ms), label_encoder)
+
+
+def start_stand_in(call_ms: float, credits: int, threads: Optional[int] = None):
+    """Start a local server process with the stub classifier; returns (process, port)"""
+    from server.cluster import serve_worker
+
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=serve_worker, name="stand-in", daemon=True,
+        args=("stand-in", sender, load_stub_classifier, (ENCODER_PATH, call_ms), {"max_workers": threads}, credits),
+    )
+    process.start()
+    sender.close()
+    if not receiver.poll(120):
+        process.terminate()
+        raise RuntimeError("stand-in server did not start")
+    port, _ = receiver.recv()
+    return process, port
+
+
+# --- Replay sources --------------------------------------------------------
+
+def load_keypoint_log(path: str) -> np.ndarray:
+    """(n, 99) float32 keypoints from a dataset CSV (feature_* columns), .npy or .npz"""
+    if path.endswith(".csv"):
+        import pandas as pd
+
+        df = pd.read_csv(path)
+        columns = [c for c in df.columns if c.startswith("feature_")] or list(df.columns[:99])
+        keypoints = df[columns].to_numpy(dtype=np.float32)
+    elif path.endswith(".npz"):
+        with np.load(path) as data:
+            keypoints = np.asarray(data[data.files[0]], dtype=np.float32)
+    else:
+        keypoints = np.load(path, mmap_mode="r").astype(np.float32)
+    keypoints = keypoints.reshape(len(keypoints), -1)
+    if keypoints.shape[1] != 99:
+        raise ValueError(f"{path}: expected 99 values per row, got {keypoints.shape[1]}")
+    return keypoints
+
+
+def load_video_frames(path: str, max_frames: int = 300, max_width: int = 640, quality: int = 80) -> List[bytes]:
+    """First `max_frames` frames of a video, downscaled and JPEG encoded once up front"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video source {path!r}")
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame.shape[1] > max_width:
+                height = int(frame.shape[0] * max_width / frame.shape[1])
+                frame = cv2.resize(frame, (max_width, height), interpolation=cv2.INTER_AREA)
+            frames.append(encode_jpeg(frame, quality))
+    finally:
+        cap.release()
+    if not frames:
+        raise RuntimeError(f"{path}: no frames")
+    return frames
+
+
+def synthetic_keypoints(n: int = 300, seed: int = 0) -> np.ndarray:
+    """A slowly drifting random pose, for runs without recorded data"""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.2, 0.8, size=99)
+    drift = np.cumsum(rng.normal(scale=0.005, size=(n, 99)), axis=0)
+    return (base + drift).astype(np.float32)
+
+
+# --- Load generation -------------------------------------------------------
+
+@dataclass
+class CameraStats:
+    camera_id: int
+    sent: int = 0
+    replies: int = 0
+    skipped: int = 0          # ticks without a send credit
+    dropped: int = 0          # server-side drops (latest frame wins)
+    error: Optional[str] = None
+    latency_ms: List[float] = field(default_factory=list)
+    server_latency_ms: List[float] = field(default_factory=list)
+
+
+def _acknowledge(sent_at: Dict[int, float], seq: int) -> Optional[float]:
+    """
+    Pop the send time of `seq`, and forget older seqs still waiting.
+
+    Seqs go out in order and the server answers them in order, so anything
+    older than an acknowledged seq was dropped and will never get a reply.
+    """
+    for old in list(itertools.takewhile(lambda s: s < seq, sent_at)):
+        del sent_at[old]
+    return sent_at.pop(seq, None)
+
+
+async def _receive(websocket, stats: CameraStats, sent_at: Dict[int, float], window: asyncio.Semaphore):
+    async for data in websocket:
+        received = time.perf_counter()
+        result = decode_result(data)
+        for _ in range(result.credits):
+            window.release()
+        stats.replies += 1
+        stats.dropped = max(stats.dropped, result.dropped)
+        started = _acknowledge(sent_at, result.seq)
+        if started is not None:
+            stats.latency_ms.append((received - started) * 1000)
+            stats.server_latency_ms.append(result.latency_ms)
+
+
+async def run_camera(url: str, camera_id: int, items: Sequence, keypoint_mode: bool, fps: float,
+                     duration: float, offset: float = 0.0) -> CameraStats:
+    """Replay `items` in a loop as one camera for `duration` seconds"""
+    stats = CameraStats(camera_id)
+    loop = asyncio.get_running_loop()
+    sent_at: Dict[int, float] = {}
+    try:
+        async with connect(url, max_size=MAX_MESSAGE_SIZE) as websocket:
+            credits = decode_hello(await websocket.recv()).credits
+            window = asyncio.Semaphore(credits)
+            receiver = asyncio.create_task(_receive(websocket, stats, sent_at, window))
+
+            interval = 1 / fps if fps > 0 else 0.0
+            next_tick = loop.time() + offset
+            end = loop.time() + offset + duration
+            seq = 0
+            while loop.time() < end and not receiver.done():
+                if interval:
+                    await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                    next_tick += interval
+                    if window.locked():
+                        stats.skipped += 1
+                        continue
+                await window.acquire()
+
+                item = items[seq % len(items)]
+                if keypoint_mode:
+                    message = encode_keypoints(camera_id, seq, time.time(), item, np.float16)
+                else:
+                    message = encode_frame(camera_id, seq, time.time(), item)
+                sent_at[seq] = time.perf_counter()
+                await websocket.send(message)
+                stats.sent += 1
+                seq += 1
+
+            # Wait for the replies still in flight
+            async def drain():
+                for _ in range(credits):
+                    await window.acquire()
+            try:
+                await asyncio.wait_for(drain(), DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            receiver.cancel()
+    except (OSError, WebSocketException) as e:
+        stats.error = f"{type(e).__name__}: {e}"
+    return stats
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    array = np.asarray(values)
+    summary = {"mean": float(array.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(array, PERCENTILES)):
+        summary[f"p{p}"] = float(value)
+    summary["max"] = float(array.max())
+    return {key: round(value, 3) for key, value in summary.items()}
+
+
+def build_report(cameras: List[CameraStats], elapsed: float, config: dict) -> dict:
+    """Machine-readable summary of one run"""
+    replies = sum(c.replies for c in cameras)
+    return {
+        "config": config,
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "elapsed_s": round(elapsed, 3),
+        "sent": sum(c.sent for c in cameras),
+        "replies": replies,
+        "skipped_no_credit": sum(c.skipped for c in cameras),
+        "server_dropped": sum(c.dropped for c in cameras),
+        "throughput_fps": round(replies / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _summary([v for c in cameras for v in c.latency_ms]),
+        "server_latency_ms": _summary([v for c in cameras for v in c.server_latency_ms]),
+        "errors": {c.camera_id: c.error for c in cameras if c.error},
+        "per_camera": [
+            {"camera_id": c.camera_id, "sent": c.sent, "replies": c.replies, "skipped": c.skipped,
+             "dropped": c.dropped, "latency_ms": _summary(c.latency_ms)}
+            for c in cameras
+        ],
+    }
+
+
+async def run_load(url: str, items: Sequence, keypoint_mode: bool, cameras: int, fps: float,
+                   duration: float, first_camera_id: int = 1, ramp: float = 1.0) -> List[CameraStats]:
+    """
+    Run `cameras` simulated cameras concurrently.
+
+    Args:
+        ramp: Seconds over which camera start times are spread, so cameras
+            do not all send on the same tick
+    """
+    endpoint = url.rstrip("/") + ("/keypoints" if keypoint_mode else "/frames")
+    tasks = [
+        run_camera(endpoint, first_camera_id + i, items, keypoint_mode, fps, duration,
+                   offset=ramp * i / cameras)
+        for i in range(cameras)
+    ]
+    return list(await asyncio.gather(*tasks))
+
+
+def print_report(report: dict):
+    latency = report["latency_ms"]
+    print(f"{report['replies']} replies in {report['elapsed_s']:.1f} s ({report['throughput_fps']:.1f} fps), "
+          f"{report['server_dropped']} dropped by server, {report['skipped_no_credit']} skipped for credits")
+    if latency:
+        print("latency ms: " + ", ".join(f"{key} {value:.1f}" for key, value in latency.items()))
+    for camera_id, error in report["errors"].items():
+        print(f"camera {camera_id}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the posture socket server with simulated cameras")
+    parser.add_argument("--url", default="ws://localhost:8765", help="Server base URL")
+    parser.add_argument("--source", default=None,
+                        help="Video file (frame mode) or .csv/.npy/.npz keypoint log (keypoint mode)")
+    parser.add_argument("--cameras", type=int, default=10)
+    parser.add_argument("--fps", type=float, default=15.0, help="Per-camera send rate; 0 sends as fast as credits allow")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds each camera sends for")
+    parser.add_argument("--first-camera-id", type=int, default=1)
+    parser.add_argument("--max-frames", type=int, default=300, help="Video frames loaded for replay")
+    parser.add_argument("--report", default=None, help="Write the JSON report here")
+    parser.add_argument("--stand-in", action="store_true", help="Start a local server with a stub classifier")
+    parser.add_argument("--stub-call-ms", type=float, default=2.0, help="Stub classifier cost per call")
+    parser.add_argument("--credits", type=int, default=DEFAULT_CREDITS, help="Stand-in server send window")
+    args = parser.parse_args()
+
+    if args.source is None:
+        items, keypoint_mode = synthetic_keypoints(), True
+    elif args.source.lower().endswith(KEYPOINT_LOG_EXTENSIONS):
+        items, keypoint_mode = load_keypoint_log(args.source), True
+    else:
+        items, keypoint_mode = load_video_frames(args.source, args.max_frames), False
+
+    stand_in = None
+    url = args.url
+    if args.stand_in:
+        logging.basicConfig(level=logging.WARNING)
+        stand_in, port = start_stand_in(args.stub_call_ms, args.credits)
+        url = f"ws://127.0.0.1:{port}"
+
+    try:
+        started = time.perf_counter()
+        cameras = asyncio.run(run_load(url, items, keypoint_mode, args.cameras, args.fps, args.duration,
+                                       args.first_camera_id))
+        elapsed = time.perf_counter() - started
+    finally:
+        if stand_in is not None:
+            stand_in.terminate()
+            stand_in.join()
+
+    config = {key: value for key, value in vars(args).items() if key != "report"}
+    config.update(url=url, mode="keypoints" if keypoint_mode else "frames", items=len(items))
+    report = build_report(cameras, elapsed, config)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Reference dashboard client: prints posture changes and heartbeats.
+
+Run from the WebApp directory:
+
+    python -m client.subscribe_client --url "ws://localhost:8765/subscribe?camera=1,2"
+"""
+
+import argparse
+import asyncio
+import time
+
+from websockets.asyncio.client import connect
+
+from server.protocol import MSG_EVENT, decode_event, decode_heartbeat, decode_hello, message_type
+
+
+def _name(classes, label) -> str:
+    return classes[label] if label is not None else "-"
+
+
+async def watch(url: str):
+    """Print events from the server until the connection closes"""
+    async with connect(url) as websocket:
+        classes = decode_hello(await websocket.recv()).classes
+        async for data in websocket:
+            stamp = time.strftime("%H:%M:%S")
+            if message_type(data) == MSG_EVENT:
+                event = decode_event(data)
+                if not event.connected:
+                    print(f"{stamp} camera {event.camera_id}: disconnected")
+                else:
+                    print(f"{stamp} camera {event.camera_id}: {_name(classes, event.previous_label)} -> "
+                          f"{_name(classes, event.label)} ({event.confidence:.0%})")
+                continue
+
+            heartbeat = decode_heartbeat(data)
+            for stats in heartbeat.cameras:
+                fps = stats.frames / heartbeat.interval_s if heartbeat.interval_s else 0.0
+                print(f"{stamp} camera {stats.camera_id}: {_name(classes, stats.label)}, {fps:.1f} fps, "
+                      f"{stats.mean_latency_ms:.1f} ms, {stats.dropped} dropped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch posture events from the posture server")
+    parser.add_argument("--url", default="ws://localhost:8765/subscribe",
+                        help="Add ?camera=1,2 to filter cameras, &mode=frames for every prediction")
+    args = parser.parse_args()
+    try:
+        asyncio.run(watch(args.url))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
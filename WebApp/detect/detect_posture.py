@@ -1,10 +1,16 @@
 import cv2
 import numpy as np
 import tensorflow as tf
-from utils.keypoints_utils import extract_keypoints, get_pose_results
+from bpd_common.frame_dedup import FrameDeduplicator, PostureResult
+from bpd_common.landmark_filter import OneEuroFilter
+from utils.frame_utils import PROCESS_WIDTH, resize_for_display, resize_for_processing
+from utils.keypoints_utils import get_pose_results, keypoints_from_results
 from utils.visualization import draw_landmarks
 import pickle
 
+# Overlay layout below is laid out for this display size
+DISPLAY_SIZE = (1280, 720)
+
 def get_multiple_predictions(prediction, label_encoder, threshold=0.5):
     """Get all postures with confidence above threshold"""
     postures = []
@@ -41,7 +47,14 @@ def wrap_text(text, max_width, font_face, font_scale, thickness):
     
     return lines
 
-def main():
+def main(process_width=PROCESS_WIDTH, display_size=DISPLAY_SIZE):
+    """
+    Run live posture detection on the default webcam.
+
+    Args:
+        process_width: Width of the downscaled copy pose estimation runs on
+        display_size: (width, height) of the frame overlays are drawn on
+    """
     # Load model and label encoder
     model = tf.keras.models.load_model("models/best_model.resolved.h5")
     with open("models/label_encoder.resolved.pkl", "rb") as f:
@@ -79,29 +92,43 @@ def main():
     FONT_THICKNESS = 2
     MAX_TEXT_WIDTH = 400  # Maximum width for recommendations text
 
+    # Reuse the last result while the scene is static
+    dedup = FrameDeduplicator()
+    # Smooth keypoints over time so the predicted label does not flicker
+    smoother = OneEuroFilter()
+
+    cv2.namedWindow("Posture Detection", cv2.WINDOW_NORMAL)
+    cv2.resizeWindow("Posture Detection", 640, 480)
+
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
 
-        # Resize frame if needed
-        if frame.shape[1] < 1280:  # If width is less than 1280
-            frame = cv2.resize(frame, (1280, 720))
+        # Pose on a small copy, overlays at the fixed display size
+        process_frame = resize_for_processing(frame, process_width)
+        result = dedup.lookup(process_frame)
+        if result is None:
+            # Get pose results and keypoints
+            pose_results = get_pose_results(process_frame)
+            result = PostureResult(landmarks=pose_results.pose_landmarks,
+                                   keypoints=keypoints_from_results(pose_results))
+            if result.keypoints is None:
+                smoother.reset()
+            else:
+                result.keypoints = smoother(result.keypoints)
+                # Predict posture
+                keypoints = np.expand_dims(result.keypoints, axis=0)
+                keypoints = keypoints.reshape((1, 33, 3, 1))
+                result.prediction = model.predict(keypoints, verbose=0)
+            dedup.store(result)
 
-        # Get pose results and keypoints
-        pose_results = get_pose_results(frame)
-        keypoints = extract_keypoints(frame)
-        
-        frame = draw_landmarks(frame, pose_results)
-
-        if keypoints is not None:
-            # Predict posture
-            keypoints = np.expand_dims(keypoints, axis=0)
-            keypoints = keypoints.reshape((1, 33, 3, 1))
-            prediction = model.predict(keypoints, verbose=0)
-            
+        frame = resize_for_display(frame, display_size)
+        frame = draw_landmarks(frame, result.keypoints)
+
+        if result.prediction is not None:
             # Get multiple predictions above 50% threshold
-            postures = get_multiple_predictions(prediction, label_encoder, threshold=0.5)
+            postures = get_multiple_predictions(result.prediction, label_encoder, threshold=0.5)
 
             if postures:
                 # Display title for postures (left side)
@@ -164,9 +191,7 @@ def main():
                             (LEFT_MARGIN, TOP_MARGIN), 
                             cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
 
-        # Show frame in a named window with specific size
-        cv2.namedWindow("Posture Detection", cv2.WINDOW_NORMAL)
-        cv2.resizeWindow("Posture Detection", 640, 480)
+        # Show frame in the named window
         cv2.imshow("Posture Detection", frame)
         
         if cv2.waitKey(1) & 0xFF == ord("q"):
@@ -174,6 +199,7 @@ def main():
 
     cap.release()
     cv2.destroyAllWindows()
+    print(f"Frames: {dedup.frames}, skipped as duplicates: {dedup.skip_ratio:.1%}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+WebSocket frame-ingest server (CameraSocket flow).
+
+Camera clients connect to ws://host:port/frames, receive a hello message
+with the class table, then send binary frame messages and receive one
+binary result per frame (see server.protocol). Results to frame clients
+carry encoding hints (JPEG quality, max width, fps) whenever the server's
+view of the connection changes (see server.encoding). Edge clients that run
+MediaPipe themselves connect to ws://host:port/keypoints instead and send
+keypoints messages, which skip decode and pose on the server.
+
+Dashboards connect to ws://host:port/subscribe and receive a PostureEvent
+only when a camera's posture changes, plus periodic Heartbeat stats.
+Query parameters: camera=1,2 limits the cameras (default all), and
+mode=frames sends every prediction instead of changes only. Any other
+path is closed with 1008 (policy violation). Run from the
+WebApp directory:
+
+    python -m server.app --host 0.0.0.0 --port 8765
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Callable, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from server.batcher import MAX_BATCH_DELAY_MS, MAX_BATCH_SIZE
+from server.encoding import EncodingController
+from server.events import CONFIDENCE_BUCKET, HEARTBEAT_INTERVAL, MODE_CHANGES, MODES, EventHub
+from server.pipeline import ENCODER_PATH, MODEL_PATH, PostureClassifier
+from server.backpressure import DEFAULT_CREDITS, CreditLedger, InboxClosed, LatestFrameInbox
+from server.protocol import (EncodingHint, ProtocolError, decode_frame, decode_keypoints, encode_hello,
+                             encode_result)
+from server.service import CameraAlreadyConnected, PostureService, PredictionReply
+
+logger = logging.getLogger("posture.server")
+
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+PING_INTERVAL = 5.0  # keepalive pings double as the RTT measurement for encoding hints
+ENDPOINTS = ("frames", "keypoints", "subscribe")
+UNKNOWN_ENDPOINT = "unknown endpoint, use /frames, /keypoints or /subscribe"
+
+
+def encode_reply(reply: PredictionReply, credits: int, dropped: int, hint: Optional[EncodingHint] = None) -> bytes:
+    return encode_result(reply.camera_id, reply.seq, reply.timestamp, reply.prediction,
+                         reply.person, reply.latency_ms, credits, dropped, hint)
+
+
+async def process_inbox(handle, connection, inbox: LatestFrameInbox, events: EventHub,
+                        encoding: Optional[EncodingController] = None) -> int:
+    """Take messages from the inbox, process them and send the replies"""
+    ledger = CreditLedger(inbox)
+    processed = 0
+    while True:
+        try:
+            message = await inbox.get()
+        except InboxClosed:
+            return processed
+        reply = await handle(message)
+        hint = None
+        if encoding is not None:
+            hint = encoding.update(reply, len(inbox), inbox.dropped, connection.latency)
+            if hint is not None:
+                logger.info("camera %d: encoding hint %s (%s)", reply.camera_id, hint, encoding.reason)
+        await connection.send(encode_reply(reply, ledger.take(), inbox.dropped, hint))
+        events.publish(reply.camera_id, reply.seq, reply.timestamp, reply.prediction, reply.person,
+                       reply.latency_ms, inbox.dropped)
+        processed += 1
+
+
+def parse_endpoint(path: str) -> Optional[str]:
+    """Endpoint of a request path: one of ENDPOINTS, or None for anything else"""
+    endpoint = urlparse(path).path.rstrip("/").rsplit("/", 1)[-1]
+    return endpoint if endpoint in ENDPOINTS else None
+
+
+def parse_subscription(path: str) -> Tuple[Optional[Set[int]], str]:
+    """Camera filter and mode from a /subscribe?camera=1,2&mode=changes path"""
+    query = parse_qs(urlparse(path).query)
+    try:
+        cameras = {int(c) for value in query.get("camera", []) for c in value.split(",") if c}
+    except ValueError as e:
+        raise ProtocolError(f"bad camera id: {e}") from e
+    mode = query.get("mode", [MODE_CHANGES])[-1]
+    if mode not in MODES:
+        raise ProtocolError(f"unknown subscription mode {mode!r}")
+    return cameras or None, mode
+
+
+async def handle_subscriber(service: PostureService, connection):
+    """Stream posture events and heartbeats to one dashboard"""
+    try:
+        cameras, mode = parse_subscription(connection.request.path)
+    except ProtocolError as e:
+        await connection.close(code=1002, reason=str(e))
+        return
+
+    await connection.send(encode_hello(service.classes, 0))
+    subscription = service.events.subscribe(cameras, mode)
+    # Nothing is read from dashboards, so watch for the close separately
+    watcher = asyncio.create_task(connection.wait_closed())
+    watcher.add_done_callback(lambda _: service.events.unsubscribe(subscription))
+    logger.info("subscriber %s connected (%s, cameras %s)", connection.remote_address, mode,
+                sorted(cameras) if cameras else "all")
+    try:
+        while True:
+            await connection.send(await subscription.inbox.get())
+    except (InboxClosed, ConnectionClosed):
+        pass
+    finally:
+        watcher.cancel()
+        service.events.unsubscribe(subscription)
+        logger.info("subscriber %s disconnected", connection.remote_address)
+
+
+async def handle_connection(service: PostureService, connection, credits: int = DEFAULT_CREDITS):
+    """
+    Serve one camera.
+
+    This coroutine only reads: it decodes message headers and puts them in a
+    bounded latest-frame-wins inbox. A separate task processes the inbox and
+    sends replies, each returning send credits to the client.
+    """
+    endpoint = parse_endpoint(connection.request.path)
+    if endpoint is None:
+        await connection.close(code=1008, reason=UNKNOWN_ENDPOINT)
+        return
+    if endpoint == "subscribe":
+        await handle_subscriber(service, connection)
+        return
+    keypoint_mode = endpoint == "keypoints"
+    decode = decode_keypoints if keypoint_mode else decode_frame
+    handle = service.handle_keypoints if keypoint_mode else service.handle_frame
+
+    inbox = LatestFrameInbox(credits)
+    processor = None
+    camera_id = None
+    try:
+        await connection.send(encode_hello(service.classes, credits))
+        async for data in connection:
+            if isinstance(data, str):
+                continue  # text is reserved for control messages
+            message = decode(data)
+
+            # The first message binds the connection to its camera id
+            if camera_id is None:
+                service.open_camera(message.camera_id, keypoints=keypoint_mode)
+                camera_id = message.camera_id
+                encoding = None if keypoint_mode else EncodingController()
+                processor = asyncio.create_task(process_inbox(handle, connection, inbox, service.events, encoding))
+                logger.info("camera %d connected from %s (%s)", camera_id, connection.remote_address,
+                            "keypoints" if keypoint_mode else "frames")
+            elif message.camera_id != camera_id:
+                raise ProtocolError(f"camera id changed from {camera_id} to {message.camera_id}")
+
+            if processor.done():
+                break  # processing failed; the finally block reports it
+            inbox.put(message)
+    except ProtocolError as e:
+        await connection.close(code=1002, reason=str(e))
+    except CameraAlreadyConnected as e:
+        await connection.close(code=1008, reason=f"camera {e} already connected")
+    except ConnectionClosed:
+        pass
+    finally:
+        # Let the in-flight message finish so its pipeline is not closed under it
+        inbox.close(discard=True)
+        processed = 0
+        if processor is not None:
+            try:
+                processed = await processor
+            except ConnectionClosed:
+                pass
+            except ProtocolError as e:
+                await connection.close(code=1002, reason=str(e))
+            except Exception:
+                logger.exception("camera %s: processing failed", camera_id)
+                await connection.close(code=1011, reason="internal error")
+        if camera_id is not None:
+            service.close_camera(camera_id)
+            logger.info("camera %d disconnected: %d processed, %d dropped", camera_id, processed, inbox.dropped)
+
+
+async def run_server(service: PostureService, host: str, port: int, credits: int = DEFAULT_CREDITS,
+                     ready: Optional[Callable[[int], None]] = None):
+    """
+    Serve until cancelled.
+
+    Args:
+        port: Port to listen on; 0 picks a free one
+        ready: Called with the bound port once the server is listening
+    """
+    async def handler(connection):
+        await handle_connection(service, connection, credits)
+
+    try:
+        async with serve(handler, host, port, max_size=MAX_MESSAGE_SIZE, ping_interval=PING_INTERVAL) as server:
+            port = server.sockets[0].getsockname()[1]
+            logger.info("listening on ws://%s:%d", host, port)
+            if ready is not None:
+                ready(port)
+            await server.serve_forever()
+    finally:
+        logger.info("classifier batching: %s", service.batcher.stats())
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Posture detection WebSocket server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Threads for decode/pose/classify")
+    parser.add_argument("--credits", type=int, default=DEFAULT_CREDITS,
+                        help="Messages each client may have in flight")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE,
+                        help="Largest classifier batch across cameras")
+    parser.add_argument("--batch-delay-ms", type=float, default=MAX_BATCH_DELAY_MS,
+                        help="Longest a request waits for its batch to fill")
+    parser.add_argument("--confidence-bucket", type=float, default=CONFIDENCE_BUCKET,
+                        help="Confidence step that counts as a change for subscribers")
+    parser.add_argument("--heartbeat", type=float, default=HEARTBEAT_INTERVAL,
+                        help="Seconds between subscriber heartbeats")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--encoder", default=ENCODER_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    service = PostureService(PostureClassifier.load(args.model, args.encoder), max_workers=args.workers,
+                             max_batch_size=args.batch_size, max_batch_delay_ms=args.batch_delay_ms,
+                             confidence_bucket=args.confidence_bucket, heartbeat_interval=args.heartbeat)
+    try:
+        asyncio.run(run_server(service, args.host, args.port, args.credits))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Per-connection flow control for the socket server."""
+
+import asyncio
+from collections import deque
+from typing import Any, Optional
+
+# Messages a client may have in flight: one being processed, one queued
+DEFAULT_CREDITS = 2
+
+
+class InboxClosed(Exception):
+    """Raised by `LatestFrameInbox.get` once the inbox is closed and drained."""
+
+
+class LatestFrameInbox:
+    """
+    Bounded per-connection queue where the newest frame wins.
+
+    The reader task keeps pulling messages off the socket and puts them here;
+    the processing task takes them out. When inference falls behind and the
+    inbox is full, the oldest queued message is discarded instead of growing
+    the queue, so memory and latency per camera stay bounded. Clients that
+    honour the credit window never trigger a drop; the bound protects the
+    server from those that do not.
+
+    The bound is the full credit window rather than window - 1: a reply hands
+    its credit back before the processing task has taken the next message, so
+    a compliant client can briefly have a whole window queued.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CREDITS):
+        self.maxsize = max(1, maxsize)
+        self.dropped = 0
+        self._items: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> Optional[Any]:
+        """Queue `item`; returns the message it displaced, if any"""
+        # Hand straight to a waiting consumer so it does not count against the bound
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(item)
+            return None
+
+        displaced = None
+        if len(self._items) >= self.maxsize:
+            displaced = self._items.popleft()
+            self.dropped += 1
+        self._items.append(item)
+        return displaced
+
+    async def get(self) -> Any:
+        """Wait for the next message"""
+        if self._items:
+            return self._items.popleft()
+        if self._closed:
+            raise InboxClosed()
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            return await self._waiter
+        finally:
+            self._waiter = None
+
+    def close(self, discard: bool = False):
+        """
+        Stop accepting work; `get` raises once the queue is drained.
+
+        Args:
+            discard: Drop queued messages instead of letting them drain
+        """
+        self._closed = True
+        if discard:
+            self._items.clear()
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_exception(InboxClosed())
+
+
+class CreditLedger:
+    """
+    Tracks send credits returned to a client.
+
+    Every message the client sends costs one credit. Each reply hands back
+    the credit of the message it answers plus one for every message dropped
+    since the previous reply, so the client's window stays constant and it
+    naturally slows to the rate the server keeps up with.
+    """
+
+    def __init__(self, inbox: LatestFrameInbox):
+        self.inbox = inbox
+        self._reported_drops = 0
+
+    def take(self) -> int:
+        """Credits to attach to the next reply"""
+        new_drops = self.inbox.dropped - self._reported_drops
+        self._reported_drops = self.inbox.dropped
+        return 1 + new_drops
@@ -0,0 +1,136 @@
+"""Cross-camera dynamic batching in front of the posture classifier."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server.pipeline import PostureClassifier
+
+logger = logging.getLogger("posture.batcher")
+
+MAX_BATCH_SIZE = 64
+MAX_BATCH_DELAY_MS = 4.0
+
+
+@dataclass
+class _Request:
+    camera_id: int
+    seq: int
+    keypoints: np.ndarray
+    future: asyncio.Future
+
+
+class BatchClassifier:
+    """
+    Collects keypoints from every connection into one classifier call.
+
+    At batch size 1 the fixed cost of a model call dominates, so instead of
+    each connection calling the model on its own, requests go into a shared
+    queue. A single worker task takes the first waiting request, keeps
+    collecting until `max_batch_size` requests are in hand or
+    `max_delay_ms` has passed since the first one, then runs one forward
+    pass on the stacked batch in the executor. Each request's future is
+    resolved with its own row, so results go back to the connection and
+    sequence number that asked for them.
+
+    Under light load a batch closes after `max_delay_ms` at most. Under
+    heavy load batches fill before the deadline, and the worker already
+    has the next batch queued while the current one runs.
+    """
+
+    def __init__(self, classifier: PostureClassifier, executor: Executor,
+                 max_batch_size: int = MAX_BATCH_SIZE, max_delay_ms: float = MAX_BATCH_DELAY_MS):
+        self.classifier = classifier
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.samples = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.samples / self.batches if self.batches else 0.0
+
+    async def classify(self, camera_id: int, seq: int, keypoints: np.ndarray) -> np.ndarray:
+        """
+        Queue one set of (99,) keypoints and wait for its prediction.
+
+        Returns:
+            Class probabilities of shape (1, n_classes)
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(), name="posture-batcher")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Request(camera_id, seq, keypoints, future))
+        return await future
+
+    async def _collect(self) -> List[_Request]:
+        """Wait for one request, then gather more until the batch is full or due"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Connections that hung up while queued no longer need a result
+            batch = [request for request in batch if not request.future.done()]
+            if not batch:
+                continue
+
+            keypoints = np.stack([np.asarray(r.keypoints, dtype=np.float32).reshape(-1) for r in batch])
+            try:
+                probs = await loop.run_in_executor(self.executor, self.classifier.predict, keypoints)
+            except Exception as e:
+                logger.exception("batch of %d failed", len(batch))
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.samples += len(batch)
+            for request, row in zip(batch, probs):
+                if not request.future.done():
+                    request.future.set_result(row[np.newaxis])
+
+    def stats(self) -> Dict[str, object]:
+        """Batching counters for metrics"""
+        return {
+            "batches": self.batches,
+            "samples": self.samples,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+        }
+
+    async def close(self):
+        """Stop the worker; requests still queued are cancelled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            request.future.cancel()
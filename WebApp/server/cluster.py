@@ -0,0 +1,509 @@
+"""
+Multi-process socket server: a front process routes cameras to workers.
+
+One Python process cannot use every core, because MediaPipe and
+TensorFlow contend on the GIL. The front process accepts the client
+connections, sends the hello itself and reads the camera id from the
+first message. A consistent-hash ring then picks one of N worker
+processes for that camera. Each worker is a plain server.app server on a
+localhost port, with its own PostureService, pose trackers and batcher.
+After the first message, the front relays bytes in both directions
+without decoding them. It only peeks at replies for the credits they
+return.
+
+Consistent hashing keeps cameras sticky: a camera stays on the worker
+that holds its tracker state for as long as that worker is in the ring.
+When a worker is added or removed, only the cameras whose arc of the
+ring changed owner move, about 1/N of them. Their new worker starts
+tracking from scratch. A worker that dies is taken out of the ring and
+replaced.
+
+Dashboards connecting to /subscribe are fanned in from every worker: each
+worker sends events and heartbeats for its own cameras. When a camera
+moves, its old worker reports it disconnected and the new one reports its
+first prediction. Run from the WebApp directory:
+
+    python -m server.cluster --host 0.0.0.0 --port 8765 --processes 4
+
+On POSIX, SIGUSR1 adds a worker and SIGUSR2 removes the newest one.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed, WebSocketException
+
+from server.app import MAX_MESSAGE_SIZE, UNKNOWN_ENDPOINT, parse_endpoint, parse_subscription, run_server
+from server.backpressure import DEFAULT_CREDITS
+from server.batcher import MAX_BATCH_DELAY_MS, MAX_BATCH_SIZE
+from server.hashring import HashRing
+from server.pipeline import ENCODER_PATH, MODEL_PATH, PostureClassifier
+from server.protocol import ProtocolError, decode_frame, decode_keypoints, decode_result, encode_hello, encode_result
+from server.service import PostureService
+
+logger = logging.getLogger("posture.cluster")
+
+WORKER_START_TIMEOUT = 120.0  # loading TensorFlow takes a while
+DRAIN_TIMEOUT = 5.0
+WATCH_INTERVAL = 1.0
+
+# Worker close codes that are about the client's messages, not the worker
+CLIENT_ERROR_CODES = (1002, 1008, 1011)
+
+
+def serve_worker(name: str, conn, loader: Callable, loader_args: Sequence, service_kwargs: dict, credits: int):
+    """
+    Worker process entry point: a server.app server on a free localhost port.
+
+    Sends (port, classes) through `conn` once listening. Also used by the
+    benchmark client to start its stand-in server.
+    """
+    # Ctrl+C is handled by the front, which stops workers with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s %(levelname)s [{name}] %(message)s")
+
+    service = PostureService(loader(*loader_args), **service_kwargs)
+
+    def ready(port: int):
+        conn.send((port, service.classes))
+        conn.close()
+
+    async def serve_until_terminated():
+        try:
+            # Cancel the server on SIGTERM so its cleanup runs; not available on Windows
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+        await run_server(service, "127.0.0.1", 0, credits, ready)
+
+    try:
+        asyncio.run(serve_until_terminated())
+    except asyncio.CancelledError:
+        pass
+    finally:
+        service.shutdown()
+
+
+@dataclass
+class Worker:
+    name: str
+    process: multiprocessing.process.BaseProcess
+    port: int
+
+    def url(self, path: str) -> str:
+        return f"ws://127.0.0.1:{self.port}{path}"
+
+
+class _Upstream:
+    """One relayed connection from the front to a worker."""
+
+    def __init__(self, worker: Worker, connection):
+        self.worker = worker
+        self.connection = connection
+        self.in_flight = 0  # messages sent whose credit has not come back yet
+        self.retiring = False
+        self.task: Optional[asyncio.Task] = None
+
+
+class CameraProxy:
+    """
+    Relays one camera connection to the worker that owns the camera.
+
+    When the camera moves, new messages go to the new worker right away,
+    while the old connection stays open until the replies still in flight
+    on it have come back. If a worker goes away with messages in flight,
+    their credits are refunded with an empty reply so the client's send
+    window does not shrink.
+    """
+
+    def __init__(self, client, camera_id: int, path: str, on_worker_lost: Callable[[str], None]):
+        self.client = client
+        self.camera_id = camera_id
+        self.path = path
+        self.on_worker_lost = on_worker_lost
+        self.upstream: Optional[_Upstream] = None
+        self.links: List[_Upstream] = []
+        self.closed = False
+        self._last_seq = 0
+        self._dropped = 0
+
+    @property
+    def worker(self) -> Optional[str]:
+        return self.upstream.worker.name if self.upstream is not None else None
+
+    async def attach(self, worker: Worker) -> Optional[_Upstream]:
+        """Send new messages to `worker`; returns the link being retired, if any"""
+        if self.worker == worker.name:
+            return None
+        connection = await connect(worker.url(self.path), max_size=MAX_MESSAGE_SIZE)
+        await connection.recv()  # the worker's hello: the client already has the front's
+
+        link = _Upstream(worker, connection)
+        link.task = asyncio.create_task(self._relay(link))
+        self.links.append(link)
+        previous, self.upstream = self.upstream, link
+        if previous is not None:
+            previous.retiring = True
+            if previous.in_flight <= 0:
+                await previous.connection.close()
+        return previous
+
+    async def send(self, data):
+        link = self.upstream
+        link.in_flight += 1
+        try:
+            await link.connection.send(data)
+        except ConnectionClosed:
+            # The relay refunds everything in flight when it ends; if it
+            # already has, this message is on us
+            if link.task.done():
+                link.in_flight -= 1
+                await self._refund(1)
+
+    async def _relay(self, link: _Upstream):
+        """Forward replies from one worker connection to the client"""
+        try:
+            async for data in link.connection:
+                result = decode_result(data)
+                link.in_flight -= result.credits
+                self._last_seq, self._dropped = result.seq, result.dropped
+                await self.client.send(data)
+                if link.retiring and link.in_flight <= 0:
+                    break
+        except ConnectionClosed:
+            pass
+        finally:
+            await link.connection.close()
+            self.links.remove(link)
+            lost, link.in_flight = max(0, link.in_flight), 0
+
+        if self.closed:
+            return
+        if lost:
+            await self._refund(lost)
+        if link is self.upstream:
+            code = link.connection.close_code
+            if code in CLIENT_ERROR_CODES:
+                await self.client.close(code=code, reason=link.connection.close_reason or "")
+            else:
+                self.on_worker_lost(link.worker.name)
+
+    async def _refund(self, credits: int):
+        self._dropped += credits
+        try:
+            await self.client.send(encode_result(self.camera_id, self._last_seq, time.time(), None, False, 0.0,
+                                                 credits, self._dropped))
+        except ConnectionClosed:
+            pass
+
+    async def close(self):
+        self.closed = True
+        links = list(self.links)
+        for link in links:
+            await link.connection.close()
+        await asyncio.gather(*(link.task for link in links), return_exceptions=True)
+
+
+class SubscriberProxy:
+    """Fans events from every worker in to one dashboard connection."""
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+        self.links: Dict[str, asyncio.Task] = {}
+
+    async def attach(self, worker: Worker):
+        if worker.name in self.links:
+            return
+        connection = await connect(worker.url(self.path), max_size=MAX_MESSAGE_SIZE)
+        await connection.recv()  # the worker's hello
+        self.links[worker.name] = asyncio.create_task(self._relay(worker.name, connection))
+
+    async def _relay(self, name: str, connection):
+        try:
+            async for data in connection:
+                await self.client.send(data)
+        except ConnectionClosed:
+            pass
+        finally:
+            await connection.close()
+            self.links.pop(name, None)
+
+    async def close(self):
+        tasks = list(self.links.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Cluster:
+    """
+    Front process state: worker processes, the hash ring and live cameras.
+
+    Args:
+        loader: Picklable callable that builds the PostureClassifier in a worker
+        loader_args: Arguments for `loader`
+        processes: Number of worker processes
+        credits: Messages each client may have in flight
+        service_kwargs: Extra PostureService arguments for every worker
+    """
+
+    def __init__(self, loader: Callable = PostureClassifier.load, loader_args: Sequence = (),
+                 processes: Optional[int] = None, credits: int = DEFAULT_CREDITS,
+                 service_kwargs: Optional[dict] = None):
+        self.loader = loader
+        self.loader_args = tuple(loader_args)
+        self.processes = processes or os.cpu_count()
+        self.credits = credits
+        self.service_kwargs = dict(service_kwargs or {})
+        self.ring = HashRing()
+        self.workers: Dict[str, Worker] = {}
+        self.cameras: Dict[int, CameraProxy] = {}
+        self.subscribers: Set[SubscriberProxy] = set()
+        self.classes: List[str] = []
+        # TensorFlow and MediaPipe do not survive fork
+        self._context = multiprocessing.get_context("spawn")
+        self._names = itertools.count()
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the worker processes (in parallel) and the health watcher"""
+        await asyncio.gather(*(self.add_worker() for _ in range(self.processes)))
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def _spawn(self) -> Worker:
+        name = f"worker-{next(self._names)}"
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=serve_worker, name=name, daemon=True,
+            args=(name, sender, self.loader, self.loader_args, self.service_kwargs, self.credits),
+        )
+        process.start()
+        sender.close()
+
+        loop = asyncio.get_running_loop()
+        try:
+            if not await loop.run_in_executor(None, receiver.poll, WORKER_START_TIMEOUT):
+                raise RuntimeError(f"{name} did not start within {WORKER_START_TIMEOUT:.0f} s")
+            port, classes = receiver.recv()
+        except (EOFError, RuntimeError):
+            process.terminate()
+            raise RuntimeError(f"{name} failed to start (exit code {process.exitcode})")
+        finally:
+            receiver.close()
+
+        self.classes = classes
+        logger.info("%s started (pid %d, port %d)", name, process.pid, port)
+        return Worker(name, process, port)
+
+    def _stop(self, worker: Worker):
+        worker.process.terminate()
+        worker.process.join(DRAIN_TIMEOUT)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+    async def add_worker(self) -> str:
+        """Start one more worker and move the cameras it now owns to it"""
+        worker = await self._spawn()
+        async with self._lock:
+            self.workers[worker.name] = worker
+            self.ring.add(worker.name)
+            await self._rebalance()
+            for subscriber in self.subscribers:
+                await self._attach_subscriber(subscriber, worker)
+        return worker.name
+
+    async def remove_worker(self, name: str):
+        """Move a worker's cameras to the others, then stop it"""
+        async with self._lock:
+            worker = self.workers.pop(name, None)
+            if worker is None:
+                return
+            self.ring.remove(name)
+            retired = await self._rebalance()
+
+        # Let replies still in flight on the old connections come back first
+        if retired:
+            await asyncio.wait([link.task for link in retired], timeout=DRAIN_TIMEOUT)
+        await asyncio.get_running_loop().run_in_executor(None, self._stop, worker)
+        logger.info("%s stopped", name)
+
+    async def _rebalance(self) -> List[_Upstream]:
+        """Re-attach every camera whose owner changed; returns the retired links"""
+        retired = []
+        for proxy in list(self.cameras.values()):
+            target = self.ring.node_for(proxy.camera_id)
+            if target is None or target == proxy.worker:
+                continue
+            try:
+                previous = await proxy.attach(self.workers[target])
+            except (OSError, WebSocketException):
+                logger.exception("camera %d: cannot attach to %s", proxy.camera_id, target)
+                continue
+            if previous is not None:
+                retired.append(previous)
+        if retired:
+            logger.info("rebalanced %d of %d cameras over %d workers", len(retired), len(self.cameras), len(self.ring))
+        return retired
+
+    def _worker_lost(self, name: str):
+        if name in self.workers:
+            asyncio.create_task(self._replace(name))
+
+    async def _replace(self, name: str):
+        if name not in self.workers:
+            return
+        logger.warning("%s went away; replacing it", name)
+        await self.remove_worker(name)
+        await self.add_worker()
+
+    async def _watch(self):
+        """Replace workers that died while no camera was connected to them"""
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            for worker in list(self.workers.values()):
+                if not worker.process.is_alive():
+                    logger.warning("%s exited with code %s", worker.name, worker.process.exitcode)
+                    await self._replace(worker.name)
+
+    async def _attach_subscriber(self, subscriber: SubscriberProxy, worker: Worker):
+        try:
+            await subscriber.attach(worker)
+        except (OSError, WebSocketException):
+            logger.exception("subscriber: cannot attach to %s", worker.name)
+
+    async def handle_subscriber(self, connection):
+        """Relay events from all workers to one dashboard until it hangs up"""
+        try:
+            parse_subscription(connection.request.path)
+        except ProtocolError as e:
+            await connection.close(code=1002, reason=str(e))
+            return
+
+        subscriber = SubscriberProxy(connection, connection.request.path)
+        try:
+            await connection.send(encode_hello(self.classes, 0))
+            async with self._lock:
+                for worker in self.workers.values():
+                    await self._attach_subscriber(subscriber, worker)
+                self.subscribers.add(subscriber)
+            await connection.wait_closed()
+        finally:
+            self.subscribers.discard(subscriber)
+            await subscriber.close()
+
+    async def handle_connection(self, connection):
+        """Serve one client: hello, route on the first message, then relay"""
+        path = connection.request.path
+        endpoint = parse_endpoint(path)
+        if endpoint is None:
+            await connection.close(code=1008, reason=UNKNOWN_ENDPOINT)
+            return
+        if endpoint == "subscribe":
+            await self.handle_subscriber(connection)
+            return
+        decode = decode_keypoints if endpoint == "keypoints" else decode_frame
+        proxy = None
+        try:
+            await connection.send(encode_hello(self.classes, self.credits))
+            async for data in connection:
+                if isinstance(data, str):
+                    continue  # text is reserved for control messages
+                if proxy is None:
+                    camera_id = decode(data).camera_id
+                    if camera_id in self.cameras:
+                        await connection.close(code=1008, reason=f"camera {camera_id} already connected")
+                        return
+                    proxy = CameraProxy(connection, camera_id, path, self._worker_lost)
+                    self.cameras[camera_id] = proxy
+                    async with self._lock:
+                        owner = self.ring.node_for(camera_id)
+                        if owner is None:
+                            await connection.close(code=1011, reason="no worker available")
+                            return
+                        await proxy.attach(self.workers[owner])
+                    logger.info("camera %d connected from %s -> %s", camera_id, connection.remote_address, owner)
+                await proxy.send(data)
+        except ProtocolError as e:
+            await connection.close(code=1002, reason=str(e))
+        except (OSError, WebSocketException) as e:
+            if not isinstance(e, ConnectionClosed):
+                logger.exception("camera %s: cannot reach its worker", proxy and proxy.camera_id)
+                await connection.close(code=1011, reason="worker unavailable")
+        finally:
+            if proxy is not None:
+                self.cameras.pop(proxy.camera_id, None)
+                await proxy.close()
+                logger.info("camera %d disconnected", proxy.camera_id)
+
+    async def close(self):
+        """Disconnect cameras and stop every worker"""
+        if self._watcher is not None:
+            self._watcher.cancel()
+        for proxy in list(self.cameras.values()):
+            await proxy.close()
+        for subscriber in list(self.subscribers):
+            await subscriber.close()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, self._stop, worker) for worker in self.workers.values()))
+        self.workers.clear()
+
+
+async def run_cluster(cluster: Cluster, host: str, port: int):
+    await cluster.start()
+
+    def scale_down():
+        if len(cluster.ring) > 1:
+            asyncio.create_task(cluster.remove_worker(cluster.ring.nodes[-1]))
+
+    loop = asyncio.get_running_loop()
+    if hasattr(signal, "SIGUSR1"):
+        loop.add_signal_handler(signal.SIGUSR1, lambda: asyncio.create_task(cluster.add_worker()))
+        loop.add_signal_handler(signal.SIGUSR2, scale_down)
+
+    try:
+        async with serve(cluster.handle_connection, host, port, max_size=MAX_MESSAGE_SIZE) as server:
+            logger.info("listening on ws://%s:%d with %d workers", host, port, len(cluster.workers))
+            await server.serve_forever()
+    finally:
+        await cluster.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process posture detection WebSocket server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=2, help="Threads per worker for decode/pose/classify")
+    parser.add_argument("--credits", type=int, default=DEFAULT_CREDITS,
+                        help="Messages each client may have in flight")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--batch-delay-ms", type=float, default=MAX_BATCH_DELAY_MS)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--encoder", default=ENCODER_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [front] %(message)s")
+    cluster = Cluster(PostureClassifier.load, (args.model, args.encoder), args.processes, args.credits,
+                      {"max_workers": args.threads, "max_batch_size": args.batch_size,
+                       "max_batch_delay_ms": args.batch_delay_ms})
+    try:
+        asyncio.run(run_cluster(cluster, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Per-connection encoding hints for clients that send video frames."""
+
+import time
+from typing import Optional, Sequence
+
+from server.protocol import EncodingHint
+from server.service import PredictionReply
+from utils.frame_utils import PROCESS_WIDTH
+
+# Encoding levels, best first: (JPEG quality, max width, fps)
+ENCODING_LADDER = (
+    EncodingHint(85, 640, 30.0),
+    EncodingHint(75, 640, 20.0),
+    EncodingHint(65, 480, 15.0),
+    EncodingHint(55, 360, 10.0),
+    EncodingHint(45, 320, 5.0),
+)
+
+RTT_BUDGET_MS = 150.0
+DECODE_BUDGET_MS = 10.0
+QUEUE_BUDGET = 0.5       # mean frames waiting in the inbox when a reply goes out
+WINDOW_S = 2.0
+MIN_WINDOW_REPLIES = 5
+RECOVER_WINDOWS = 3
+
+
+class EncodingController:
+    """
+    Chooses JPEG quality, resolution and frame rate for one camera connection.
+
+    Replies are grouped into windows of `window_s` seconds. At the end of a
+    window the connection steps one level down ENCODING_LADDER if any of
+    these held during the window:
+
+    - frames were dropped, or frames sat waiting in the inbox: the server
+      cannot keep up with this camera at its current rate and size
+    - the WebSocket ping RTT is over budget: the link is congested, so
+      smaller frames help
+    - decoding takes too long: the frames are too large
+
+    After `recover_windows` healthy windows in a row it steps one level back
+    up. The max width never exceeds PROCESS_WIDTH, since the server
+    downscales to that before pose anyway. A client that sends wider frames
+    is told so on its first reply instead of after a whole window.
+
+    A hint is only returned when it differs from the last one sent.
+    """
+
+    def __init__(self, ladder: Sequence[EncodingHint] = ENCODING_LADDER, rtt_budget_ms: float = RTT_BUDGET_MS,
+                 decode_budget_ms: float = DECODE_BUDGET_MS, queue_budget: float = QUEUE_BUDGET,
+                 window_s: float = WINDOW_S, recover_windows: int = RECOVER_WINDOWS,
+                 max_width: int = PROCESS_WIDTH):
+        self.ladder = list(ladder)
+        self.rtt_budget_ms = rtt_budget_ms
+        self.decode_budget_ms = decode_budget_ms
+        self.queue_budget = queue_budget
+        self.window_s = window_s
+        self.recover_windows = recover_windows
+        self.max_width = max_width
+        self.level = 0
+        self.current: Optional[EncodingHint] = None
+        self.reason = ""  # why the level last changed, for logging
+        self._healthy = 0
+        self._start_window(None, 0)
+
+    def _start_window(self, now: Optional[float], dropped: int):
+        self._window_start = now
+        self._dropped_at_start = dropped
+        self._replies = 0
+        self._decode_sum = 0.0
+        self._depth_sum = 0
+
+    def hint(self) -> EncodingHint:
+        """Settings for the current level"""
+        level = self.ladder[self.level]
+        return EncodingHint(level.quality, min(level.max_width, self.max_width), level.fps)
+
+    def _emit(self) -> Optional[EncodingHint]:
+        hint = self.hint()
+        if hint == self.current:
+            return None
+        self.current = hint
+        return hint
+
+    def _congestion(self, dropped: int, rtt_ms: float) -> str:
+        if dropped > self._dropped_at_start:
+            return f"{dropped - self._dropped_at_start} frames dropped"
+        if self._depth_sum / self._replies > self.queue_budget:
+            return f"queue depth {self._depth_sum / self._replies:.1f}"
+        if rtt_ms > self.rtt_budget_ms:
+            return f"rtt {rtt_ms:.0f} ms"
+        if self._decode_sum / self._replies > self.decode_budget_ms:
+            return f"decode {self._decode_sum / self._replies:.1f} ms"
+        return ""
+
+    def update(self, reply: PredictionReply, queue_depth: int, dropped: int, rtt_s: float = 0.0,
+               now: Optional[float] = None) -> Optional[EncodingHint]:
+        """
+        Account for one reply; returns a new hint to send with it, if any.
+
+        Args:
+            queue_depth: Messages waiting in the connection's inbox
+            dropped: Frames dropped on the connection so far
+            rtt_s: Latest WebSocket ping round trip, 0 if not measured yet
+        """
+        now = time.monotonic() if now is None else now
+        if self._window_start is None:
+            self._start_window(now, dropped)
+        self._replies += 1
+        self._decode_sum += reply.decode_ms
+        self._depth_sum += queue_depth
+
+        if self.current is None and reply.frame_width > self.max_width:
+            self.reason = f"frames {reply.frame_width} px wide"
+            return self._emit()
+        if now - self._window_start < self.window_s or self._replies < MIN_WINDOW_REPLIES:
+            return None
+
+        reason = self._congestion(dropped, rtt_s * 1000)
+        if reason:
+            self._healthy = 0
+            if self.level < len(self.ladder) - 1:
+                self.level += 1
+                self.reason = reason
+        else:
+            self._healthy += 1
+            if self._healthy >= self.recover_windows and self.level > 0:
+                self.level -= 1
+                self._healthy = 0
+                self.reason = "recovered"
+        self._start_window(now, dropped)
+        return self._emit()
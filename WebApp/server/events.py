@@ -0,0 +1,215 @@
+"""Change-only posture events and heartbeats for dashboard subscribers."""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from server.backpressure import LatestFrameInbox
+from server.protocol import CameraStatsMessage, encode_event, encode_heartbeat
+
+MODE_CHANGES = "changes"  # an event when the label or confidence bucket changes
+MODE_FRAMES = "frames"    # an event for every prediction
+MODES = (MODE_CHANGES, MODE_FRAMES)
+
+CONFIDENCE_BUCKET = 0.1
+HEARTBEAT_INTERVAL = 10.0
+SUBSCRIBER_QUEUE = 256
+
+
+class ChangeDetector:
+    """
+    Decides which predictions are worth an event.
+
+    An event fires when the top label changes (including to and from "no
+    person") or when the confidence moves into another `bucket_width`
+    bucket. A bucket change only counts once the confidence has moved at
+    least half a bucket from the last reported value, so a confidence that
+    hovers on a bucket edge does not flap.
+    """
+
+    def __init__(self, bucket_width: float = CONFIDENCE_BUCKET):
+        self.bucket_width = bucket_width
+        self.label: Optional[int] = None
+        self.confidence = 0.0
+        self._started = False
+
+    def bucket(self, confidence: float) -> int:
+        # The epsilon keeps 0.7 / 0.1 = 6.999... in bucket 7
+        return int(confidence / self.bucket_width + 1e-6)
+
+    def update(self, label: Optional[int], confidence: float) -> bool:
+        """Feed one prediction; True if it should be reported"""
+        changed = (
+            not self._started
+            or label != self.label
+            or (self.bucket(confidence) != self.bucket(self.confidence)
+                and abs(confidence - self.confidence) >= self.bucket_width / 2)
+        )
+        if changed:
+            self.label, self.confidence = label, confidence
+            self._started = True
+        return changed
+
+
+class _CameraState:
+    """Change detector, latest prediction and heartbeat counters for one camera."""
+
+    def __init__(self, camera_id: int, n_classes: int, bucket_width: float):
+        self.camera_id = camera_id
+        self.detector = ChangeDetector(bucket_width)
+        self.seq = 0
+        self.timestamp = 0.0
+        self.label: Optional[int] = None
+        self.confidence = 0.0
+        self.person = False
+        self.probabilities: Optional[np.ndarray] = None
+        self.label_counts = np.zeros(n_classes, dtype=np.uint32)
+        self.dropped_total = 0
+        self._dropped_reported = 0
+        self._clear_window()
+
+    def _clear_window(self):
+        self.frames = 0
+        self.person_frames = 0
+        self.latency_sum = 0.0
+        self.label_counts[:] = 0
+
+    def event(self, previous_label: Optional[int] = None, connected: bool = True) -> bytes:
+        return encode_event(self.camera_id, self.seq, self.timestamp, self.label, previous_label,
+                            self.confidence, self.person, connected, self.probabilities)
+
+    def take_stats(self) -> CameraStatsMessage:
+        """Stats for the interval since the last call, then start a new one"""
+        stats = CameraStatsMessage(
+            self.camera_id, self.frames, self.person_frames, self.dropped_total - self._dropped_reported,
+            self.latency_sum / self.frames if self.frames else 0.0,
+            self.label, self.confidence, self.label_counts.copy(),
+        )
+        self._dropped_reported = self.dropped_total
+        self._clear_window()
+        return stats
+
+
+class Subscription:
+    """One dashboard connection: which cameras it watches and its outgoing queue."""
+
+    def __init__(self, cameras: Optional[Set[int]], mode: str):
+        self.cameras = cameras
+        self.mode = mode
+        # A dashboard that cannot keep up loses the oldest events, not the server's memory
+        self.inbox = LatestFrameInbox(SUBSCRIBER_QUEUE)
+
+    def wants(self, camera_id: int) -> bool:
+        return self.cameras is None or camera_id in self.cameras
+
+
+class EventHub:
+    """
+    Turns the per-frame prediction stream into events for subscribers.
+
+    Every reply the server produces is published here. The hub keeps each
+    camera's latest prediction and interval counters. It sends a subscriber
+    an event only when the camera's posture changes, or for every
+    prediction in MODE_FRAMES. Every `heartbeat_interval` seconds it also
+    sends a heartbeat with per-camera stats. A dashboard watching a stable
+    room gets a few events per minute instead of one per frame.
+    """
+
+    def __init__(self, classes: List[str], bucket_width: float = CONFIDENCE_BUCKET,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.n_classes = len(classes)
+        self.bucket_width = bucket_width
+        self.heartbeat_interval = heartbeat_interval
+        self.cameras: Dict[int, _CameraState] = {}
+        self.subscribers: Set[Subscription] = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def subscribe(self, cameras: Optional[Set[int]] = None, mode: str = MODE_CHANGES) -> Subscription:
+        """
+        Register a subscriber; it first receives the current state of its cameras.
+
+        Args:
+            cameras: Camera ids to watch, or None for all
+            mode: MODE_CHANGES or MODE_FRAMES
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown subscription mode {mode!r}")
+        subscription = Subscription(cameras, mode)
+        for state in self.cameras.values():
+            if subscription.wants(state.camera_id):
+                subscription.inbox.put(state.event())
+        self.subscribers.add(subscription)
+        if self._heartbeat is None or self._heartbeat.done():
+            for state in self.cameras.values():
+                state.take_stats()  # start the first interval now
+            self._heartbeat = asyncio.create_task(self._send_heartbeats(), name="posture-heartbeat")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+        subscription.inbox.close(discard=True)
+
+    def publish(self, camera_id: int, seq: int, timestamp: float, prediction: Optional[np.ndarray],
+                person: bool, latency_ms: float, dropped: int = 0):
+        """
+        Record one prediction and notify the subscribers that want it.
+
+        Args:
+            dropped: Frames dropped on the camera's connection so far
+        """
+        state = self.cameras.get(camera_id)
+        if state is None:
+            state = self.cameras[camera_id] = _CameraState(camera_id, self.n_classes, self.bucket_width)
+
+        label, confidence = None, 0.0
+        if prediction is not None:
+            probs = np.asarray(prediction).reshape(-1)
+            label = int(np.argmax(probs))
+            confidence = float(probs[label])
+            state.label_counts[label] += 1
+        previous_label = state.label
+        state.seq, state.timestamp, state.person = seq, timestamp, person
+        state.label, state.confidence, state.probabilities = label, confidence, prediction
+        state.frames += 1
+        state.person_frames += person
+        state.latency_sum += latency_ms
+        state.dropped_total = dropped
+
+        changed = state.detector.update(label, confidence)
+        data = None
+        for subscription in self.subscribers:
+            if subscription.wants(camera_id) and (changed or subscription.mode == MODE_FRAMES):
+                data = data or state.event(previous_label)
+                subscription.inbox.put(data)
+
+    def camera_closed(self, camera_id: int):
+        """Forget a camera and tell its subscribers it went away"""
+        state = self.cameras.pop(camera_id, None)
+        if state is None:
+            return
+        data = None
+        for subscription in self.subscribers:
+            if subscription.wants(camera_id):
+                data = data or state.event(state.label, connected=False)
+                subscription.inbox.put(data)
+
+    async def _send_heartbeats(self):
+        while self.subscribers:
+            await asyncio.sleep(self.heartbeat_interval)
+            stats = [state.take_stats() for state in self.cameras.values()]
+            now = time.time()
+            for subscription in list(self.subscribers):
+                cameras = [s for s in stats if subscription.wants(s.camera_id)]
+                subscription.inbox.put(encode_heartbeat(now, self.heartbeat_interval, cameras))
+
+    async def close(self):
+        for subscription in list(self.subscribers):
+            self.unsubscribe(subscription)
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
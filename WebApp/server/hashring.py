@@ -0,0 +1,64 @@
+"""Consistent-hash ring mapping camera ids to worker processes."""
+
+import bisect
+import hashlib
+from typing import Dict, Hashable, Iterable, List, Optional
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hashing with virtual nodes.
+
+    Every node is placed on the ring `replicas` times; a key belongs to the
+    first node point clockwise of its own hash. Adding or removing a node
+    therefore only moves the keys in the arcs that node gains or loses,
+    about 1/N of them, and every other camera stays on the worker that
+    holds its tracker state.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            # A collision between virtual nodes is astronomically unlikely; first one wins
+            if point not in self._owners:
+                self._owners[point] = node
+                bisect.insort(self._points, point)
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        self._points = [p for p in self._points if self._owners[p] != node]
+        self._owners = {p: self._owners[p] for p in self._points}
+
+    def node_for(self, key: Hashable) -> Optional[str]:
+        """Node that owns `key`, or None if the ring is empty"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._owners[self._points[index]]
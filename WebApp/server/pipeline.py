@@ -0,0 +1,174 @@
+"""Pose + classifier pipeline shared by the socket server connections."""
+
+import pickle
+import threading
+import time
+from typing import List, Optional
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from bpd_common.frame_dedup import FrameDeduplicator, PostureResult
+from bpd_common.landmark_filter import OneEuroFilter
+from server.protocol import ProtocolError
+from utils.frame_utils import PROCESS_WIDTH, resize_for_processing
+from utils.keypoints_utils import keypoints_from_results
+
+MODEL_PATH = "models/best_model.resolved.h5"
+ENCODER_PATH = "models/label_encoder.resolved.pkl"
+
+mp_pose = mp.solutions.pose
+
+
+def decode_image(data) -> Optional[np.ndarray]:
+    """
+    Decode a JPEG/PNG payload into a BGR frame.
+
+    Args:
+        data: Encoded image as bytes, bytearray or memoryview
+
+    Returns:
+        Decoded frame, or None if the payload is not a valid image
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    if buffer.size == 0:
+        return None
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+
+class PostureClassifier:
+    """Keras posture model plus its label encoder, shared by all cameras."""
+
+    def __init__(self, model, label_encoder):
+        self.model = model
+        self.label_encoder = label_encoder
+        self.classes: List[str] = [str(c) for c in label_encoder.classes_]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, model_path: str = MODEL_PATH, encoder_path: str = ENCODER_PATH) -> "PostureClassifier":
+        """Load the model and label encoder from disk; a .npz model is a distilled NumpyMLP"""
+        if model_path.endswith(".npz"):
+            from bpd_common.numpy_mlp import NumpyMLP
+
+            model = NumpyMLP.load(model_path)
+        else:
+            import tensorflow as tf
+
+            model = tf.keras.models.load_model(model_path)
+        with open(encoder_path, "rb") as f:
+            label_encoder = pickle.load(f)
+        return cls(model, label_encoder)
+
+    def predict(self, keypoints: np.ndarray) -> np.ndarray:
+        """
+        Classify a batch of keypoints.
+
+        Args:
+            keypoints: Array of shape (n, 99)
+
+        Returns:
+            Class probabilities of shape (n, n_classes)
+        """
+        batch = np.asarray(keypoints, dtype=np.float32).reshape((-1, 33, 3, 1))
+        with self._lock:
+            return np.asarray(self.model(batch, training=False))
+
+
+class KeypointPipeline:
+    """
+    Per-camera state for edge clients that send keypoints instead of frames.
+
+    Decode and pose already happened on the device, so only smoothing runs
+    here; the service's BatchClassifier classifies the smoothed keypoints.
+    """
+
+    def __init__(self, camera_id: int):
+        self.camera_id = camera_id
+        self.smoother = OneEuroFilter()
+        self.frames = 0
+
+    def smooth(self, keypoints: np.ndarray, timestamp: Optional[float] = None) -> PostureResult:
+        """
+        Pre-classifier stage: smooth one set of (99,) keypoints.
+
+        Raises:
+            ProtocolError: if a value is NaN or infinite; it would stay in the
+                smoother's state and reach every row of a classifier batch
+        """
+        keypoints = np.asarray(keypoints, dtype=np.float32)
+        if not np.isfinite(keypoints).all():
+            raise ProtocolError("keypoint values must be finite")
+        self.frames += 1
+        return PostureResult(keypoints=self.smoother(keypoints, timestamp))
+
+    def finish(self, result: PostureResult):
+        """Called with the result once the classifier has filled in its prediction"""
+
+    def close(self):
+        pass
+
+
+class CameraPipeline(KeypointPipeline):
+    """
+    Per-camera pipeline state for clients that send video frames.
+
+    MediaPipe Pose in video mode tracks the person between frames, so every
+    camera needs its own estimator; classification is left to the service's
+    BatchClassifier.
+    """
+
+    def __init__(self, camera_id: int, process_width: int = PROCESS_WIDTH):
+        super().__init__(camera_id)
+        self.process_width = process_width
+        self.pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5)
+        self.dedup = FrameDeduplicator()
+        # Measurements of the last frame, for the connection's encoding controller
+        self.decode_ms = 0.0
+        self.frame_width = 0
+
+    def extract(self, frame: np.ndarray, timestamp: Optional[float] = None) -> PostureResult:
+        """Pose stage: downscale, estimate pose and smooth the keypoints"""
+        process_frame = resize_for_processing(frame, self.process_width)
+        process_rgb = cv2.cvtColor(process_frame, cv2.COLOR_BGR2RGB)
+        process_rgb.flags.writeable = False
+        results = self.pose.process(process_rgb)
+
+        result = PostureResult(landmarks=results.pose_landmarks, keypoints=keypoints_from_results(results))
+        if result.keypoints is None:
+            self.smoother.reset()
+        else:
+            result.keypoints = self.smoother(result.keypoints, timestamp)
+        return result
+
+    def analyze(self, data, timestamp: Optional[float] = None) -> Optional[PostureResult]:
+        """
+        Pre-classifier stage: decode an encoded frame and run pose on it.
+
+        A frame that matches the previous one returns the cached result,
+        prediction included. Otherwise the prediction is left for the caller
+        to fill in, after which the result must be passed to `finish`.
+
+        Returns:
+            PostureResult, or None if the payload could not be decoded
+        """
+        started = time.perf_counter()
+        frame = decode_image(data)
+        self.decode_ms = (time.perf_counter() - started) * 1000
+        if frame is None:
+            return None
+        self.frames += 1
+        self.frame_width = frame.shape[1]
+
+        result = self.dedup.lookup(frame)
+        if result is None:
+            result = self.extract(frame, timestamp)
+        return result
+
+    def finish(self, result: PostureResult):
+        self.dedup.store(result)
+
+    def close(self):
+        self.pose.close()
+
@@ -0,0 +1,439 @@
+"""
+Wire protocol between camera clients and the posture server.
+
+Messages are FlatBuffers defined in server/schema/posture.fbs: every
+WebSocket message is a `Message` whose `payload` union holds a Frame,
+Keypoints, Prediction or Hello table, or for dashboard subscribers a
+PostureEvent or Heartbeat table. The generated accessors under
+server/schema/BPD read fields in place, and vectors (image bytes,
+keypoints, probabilities) come back as `np.frombuffer` views over the
+received buffer, so nothing on the hot path is parsed or copied.
+
+The C++ CameraSocket client generates its accessors from the same schema.
+"""
+
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional
+
+import flatbuffers
+import numpy as np
+from flatbuffers import encode, number_types
+
+from server.schema.BPD.Posture import Frame, Heartbeat, Hello, Keypoints, Message, PostureEvent, Prediction
+from server.schema.BPD.Posture.Encoding import Encoding
+from server.schema.BPD.Posture.Payload import Payload
+
+PROTOCOL_VERSION = 2
+FILE_IDENTIFIER = b"BPDM"
+
+# Message types (members of the Payload union)
+MSG_FRAME = Payload.Frame
+MSG_KEYPOINTS = Payload.Keypoints
+MSG_RESULT = Payload.Prediction
+MSG_HELLO = Payload.Hello
+MSG_EVENT = Payload.PostureEvent
+MSG_HEARTBEAT = Payload.Heartbeat
+
+# Frame encodings
+ENCODING_JPEG = Encoding.JPEG
+ENCODING_PNG = Encoding.PNG
+
+NUM_KEYPOINT_VALUES = 33 * 3
+
+
+class ProtocolError(ValueError):
+    """Raised when a message is malformed."""
+
+
+@dataclass
+class FrameMessage:
+    camera_id: int
+    seq: int
+    timestamp: float
+    encoding: int
+    payload: np.ndarray  # uint8 view of the encoded image
+
+
+@dataclass
+class KeypointsMessage:
+    camera_id: int
+    seq: int
+    timestamp: float
+    keypoints: np.ndarray  # float32 or float16 view of the 99 keypoint values
+
+
+@dataclass
+class EncodingHint:
+    """How the server would like a frame client to encode from now on."""
+
+    quality: int    # JPEG quality, 1-100
+    max_width: int  # frames wider than this are downscaled first
+    fps: float      # upper bound on the send rate
+
+
+@dataclass
+class ResultMessage:
+    camera_id: int
+    seq: int
+    timestamp: float
+    label: Optional[int]
+    confidence: float
+    latency_ms: float
+    person: bool
+    probabilities: np.ndarray
+    credits: int = 1
+    dropped: int = 0
+    hint: Optional[EncodingHint] = None  # set only when the server's hint changes
+
+
+@dataclass
+class HelloMessage:
+    classes: List[str]
+    credits: int  # initial send window
+
+
+@dataclass
+class EventMessage:
+    camera_id: int
+    seq: int
+    timestamp: float
+    label: Optional[int]
+    previous_label: Optional[int]
+    confidence: float
+    person: bool
+    connected: bool
+    probabilities: np.ndarray
+
+
+@dataclass
+class CameraStatsMessage:
+    camera_id: int
+    frames: int
+    person_frames: int
+    dropped: int
+    mean_latency_ms: float
+    label: Optional[int]
+    confidence: float
+    label_counts: np.ndarray  # predictions per class in the interval
+
+
+@dataclass
+class HeartbeatMessage:
+    timestamp: float
+    interval_s: float
+    cameras: List[CameraStatsMessage]
+
+
+def _label(value: Optional[int]) -> int:
+    return -1 if value is None else value
+
+
+def _optional_label(value: int) -> Optional[int]:
+    return None if value < 0 else value
+
+
+def _finish(builder: flatbuffers.Builder, payload_type: int, payload: int) -> bytes:
+    Message.Start(builder)
+    Message.AddPayloadType(builder, payload_type)
+    Message.AddPayload(builder, payload)
+    builder.Finish(Message.End(builder), file_identifier=FILE_IDENTIFIER)
+    return bytes(builder.Output())
+
+
+@contextmanager
+def _reading():
+    """
+    Turn errors from the generated accessors into ProtocolError.
+
+    Accessors read offsets straight from the buffer, so a truncated or
+    forged message fails inside them with struct.error, IndexError,
+    ValueError (np.frombuffer past the end) or TypeError.
+    """
+    try:
+        yield
+    except ProtocolError:
+        raise
+    except (struct.error, IndexError, ValueError, TypeError) as e:
+        raise ProtocolError(f"corrupt message: {e}") from e
+
+
+def _open(data, expected: Optional[int] = None):
+    """Check the identifier and return (payload type, payload table)"""
+    if len(data) < 8 or not Message.Message.MessageBufferHasIdentifier(data, 0):
+        raise ProtocolError("not a posture protocol message")
+    with _reading():
+        message = Message.Message.GetRootAs(data, 0)
+        payload_type, table = message.PayloadType(), message.Payload()
+    if table is None:
+        raise ProtocolError("message has no payload")
+    if expected is not None and payload_type != expected:
+        raise ProtocolError(f"expected message type {expected}, got {payload_type}")
+    return payload_type, table
+
+
+def _as_array(values, dtype) -> np.ndarray:
+    # Generated *AsNumpy accessors return 0 for absent vectors
+    return values if isinstance(values, np.ndarray) else np.zeros(0, dtype=dtype)
+
+
+def _string(table, offset: int) -> bytes:
+    """
+    Table.String with a bounds check.
+
+    The generated string accessors slice the buffer, which silently returns
+    fewer bytes when a truncated message ends inside the string.
+    """
+    uoffset = number_types.UOffsetTFlags
+    offset += encode.Get(uoffset.packer_type, table.Bytes, offset)
+    length = encode.Get(uoffset.packer_type, table.Bytes, offset)
+    start = offset + uoffset.bytewidth
+    if start + length >= len(table.Bytes):  # strings end with a zero byte
+        raise ProtocolError("string runs past the end of the message")
+    return bytes(table.Bytes[start:start + length])
+
+
+def message_type(data) -> int:
+    """Payload type of a received message (one of the MSG_* constants)"""
+    return _open(data)[0]
+
+
+def encode_frame(camera_id: int, seq: int, timestamp: float, payload: bytes,
+                 encoding: int = ENCODING_JPEG) -> bytes:
+    """Build a frame message from an already encoded image"""
+    builder = flatbuffers.Builder(len(payload) + 64)
+    data = builder.CreateByteVector(payload)
+    Frame.Start(builder)
+    Frame.AddCameraId(builder, camera_id)
+    Frame.AddSeq(builder, seq)
+    Frame.AddCaptureTs(builder, timestamp)
+    Frame.AddEncoding(builder, encoding)
+    Frame.AddData(builder, data)
+    return _finish(builder, MSG_FRAME, Frame.End(builder))
+
+
+def decode_frame(data) -> FrameMessage:
+    """Parse a frame message; the payload is a zero-copy view into `data`"""
+    _, table = _open(data, MSG_FRAME)
+    with _reading():
+        frame = Frame.Frame()
+        frame.Init(table.Bytes, table.Pos)
+        if frame.Encoding() not in (ENCODING_JPEG, ENCODING_PNG):
+            raise ProtocolError(f"unknown encoding {frame.Encoding()}")
+        return FrameMessage(frame.CameraId(), frame.Seq(), frame.CaptureTs(), frame.Encoding(),
+                            _as_array(frame.DataAsNumpy(), np.uint8))
+
+
+def encode_keypoints(camera_id: int, seq: int, timestamp: float, keypoints: np.ndarray,
+                     dtype=np.float32) -> bytes:
+    """
+    Build a keypoints message from 33x3 pose keypoints.
+
+    Args:
+        dtype: np.float32, or np.float16 to halve the payload (~200 bytes)
+    """
+    half = np.dtype(dtype) == np.float16
+    values = np.asarray(keypoints, dtype="<f2" if half else "<f4").reshape(-1)
+    if values.size != NUM_KEYPOINT_VALUES:
+        raise ValueError(f"expected {NUM_KEYPOINT_VALUES} keypoint values, got {values.size}")
+    builder = flatbuffers.Builder(512)
+    # FlatBuffers has no half type: float16 travels as its raw ushort bits
+    vector = builder.CreateNumpyVector(values.view("<u2") if half else values)
+    Keypoints.Start(builder)
+    Keypoints.AddCameraId(builder, camera_id)
+    Keypoints.AddSeq(builder, seq)
+    Keypoints.AddCaptureTs(builder, timestamp)
+    if half:
+        Keypoints.AddValuesF16(builder, vector)
+    else:
+        Keypoints.AddValues(builder, vector)
+    return _finish(builder, MSG_KEYPOINTS, Keypoints.End(builder))
+
+
+def decode_keypoints(data) -> KeypointsMessage:
+    """Parse a keypoints message; values are a zero-copy view into `data`"""
+    _, table = _open(data, MSG_KEYPOINTS)
+    with _reading():
+        message = Keypoints.Keypoints()
+        message.Init(table.Bytes, table.Pos)
+        if message.ValuesF16IsNone():
+            values = _as_array(message.ValuesAsNumpy(), np.float32)
+        else:
+            values = _as_array(message.ValuesF16AsNumpy(), np.uint16).view("<f2")
+        if values.size != NUM_KEYPOINT_VALUES:
+            raise ProtocolError(f"expected {NUM_KEYPOINT_VALUES} keypoint values, got {values.size}")
+        return KeypointsMessage(message.CameraId(), message.Seq(), message.CaptureTs(), values)
+
+
+def encode_result(camera_id: int, seq: int, timestamp: float, prediction: Optional[np.ndarray],
+                  person: bool, latency_ms: float, credits: int = 1, dropped: int = 0,
+                  hint: Optional[EncodingHint] = None) -> bytes:
+    """
+    Build a prediction message.
+
+    Args:
+        prediction: Class probabilities, or None if nothing was classified
+        credits: Send credits handed back to the client with this reply
+        dropped: Frames dropped on the connection so far
+        hint: New encoding settings for the client, if they changed
+    """
+    builder = flatbuffers.Builder(128)
+    label, confidence, probabilities = -1, 0.0, None
+    if prediction is not None:
+        probs = np.asarray(prediction, dtype="<f4").reshape(-1)
+        label = int(np.argmax(probs))
+        confidence = float(probs[label])
+        probabilities = builder.CreateNumpyVector(probs)
+
+    Prediction.Start(builder)
+    Prediction.AddCameraId(builder, camera_id)
+    Prediction.AddSeq(builder, seq)
+    Prediction.AddCaptureTs(builder, timestamp)
+    Prediction.AddLabel(builder, label)
+    Prediction.AddConfidence(builder, confidence)
+    Prediction.AddLatencyMs(builder, latency_ms)
+    Prediction.AddPerson(builder, person)
+    if probabilities is not None:
+        Prediction.AddProbabilities(builder, probabilities)
+    Prediction.AddCredits(builder, credits)
+    Prediction.AddDropped(builder, dropped)
+    if hint is not None:
+        Prediction.AddHintQuality(builder, min(100, max(1, int(hint.quality))))
+        Prediction.AddHintMaxWidth(builder, min(0xFFFF, max(1, int(hint.max_width))))
+        Prediction.AddHintFps(builder, hint.fps)
+    return _finish(builder, MSG_RESULT, Prediction.End(builder))
+
+
+def decode_result(data) -> ResultMessage:
+    """Parse a prediction message; probabilities are a view into `data`"""
+    _, table = _open(data, MSG_RESULT)
+    with _reading():
+        message = Prediction.Prediction()
+        message.Init(table.Bytes, table.Pos)
+        label = message.Label()
+        hint = None
+        if message.HintQuality() or message.HintMaxWidth() or message.HintFps():
+            hint = EncodingHint(message.HintQuality(), message.HintMaxWidth(), message.HintFps())
+        return ResultMessage(message.CameraId(), message.Seq(), message.CaptureTs(),
+                             None if label < 0 else label, message.Confidence(), message.LatencyMs(),
+                             message.Person(), _as_array(message.ProbabilitiesAsNumpy(), np.float32),
+                             message.Credits(), message.Dropped(), hint)
+
+
+def encode_hello(classes: List[str], credits: int = 1) -> bytes:
+    """Class table and initial send window, sent right after a client connects"""
+    builder = flatbuffers.Builder(256)
+    names = [builder.CreateString(name) for name in classes]
+    Hello.StartClassesVector(builder, len(names))
+    for name in reversed(names):
+        builder.PrependUOffsetTRelative(name)
+    vector = builder.EndVector()
+    Hello.Start(builder)
+    Hello.AddProtocolVersion(builder, PROTOCOL_VERSION)
+    Hello.AddClasses(builder, vector)
+    Hello.AddCredits(builder, credits)
+    return _finish(builder, MSG_HELLO, Hello.End(builder))
+
+
+def decode_hello(data) -> HelloMessage:
+    """Class table and send window from a hello message"""
+    _, table = _open(data, MSG_HELLO)
+    with _reading():
+        message = Hello.Hello()
+        message.Init(table.Bytes, table.Pos)
+        if message.ProtocolVersion() != PROTOCOL_VERSION:
+            raise ProtocolError(f"unsupported protocol version {message.ProtocolVersion()}")
+        vector = table.Offset(6)  # Hello.classes, the vtable slot the generated Classes() reads
+        classes = [_string(table, table.Vector(vector) + i * 4).decode("utf-8")
+                   for i in range(message.ClassesLength())]
+        return HelloMessage(classes, max(1, message.Credits()))
+
+
+def encode_event(camera_id: int, seq: int, timestamp: float, label: Optional[int], previous_label: Optional[int],
+                 confidence: float, person: bool, connected: bool = True,
+                 probabilities: Optional[np.ndarray] = None) -> bytes:
+    """Build a posture event for subscribers"""
+    builder = flatbuffers.Builder(128)
+    vector = None
+    if probabilities is not None:
+        vector = builder.CreateNumpyVector(np.asarray(probabilities, dtype="<f4").reshape(-1))
+    PostureEvent.Start(builder)
+    PostureEvent.AddCameraId(builder, camera_id)
+    PostureEvent.AddSeq(builder, seq)
+    PostureEvent.AddCaptureTs(builder, timestamp)
+    PostureEvent.AddLabel(builder, _label(label))
+    PostureEvent.AddPreviousLabel(builder, _label(previous_label))
+    PostureEvent.AddConfidence(builder, confidence)
+    PostureEvent.AddPerson(builder, person)
+    PostureEvent.AddConnected(builder, connected)
+    if vector is not None:
+        PostureEvent.AddProbabilities(builder, vector)
+    return _finish(builder, MSG_EVENT, PostureEvent.End(builder))
+
+
+def decode_event(data) -> EventMessage:
+    """Parse a posture event; probabilities are a view into `data`"""
+    _, table = _open(data, MSG_EVENT)
+    with _reading():
+        message = PostureEvent.PostureEvent()
+        message.Init(table.Bytes, table.Pos)
+        return EventMessage(message.CameraId(), message.Seq(), message.CaptureTs(),
+                            _optional_label(message.Label()), _optional_label(message.PreviousLabel()),
+                            message.Confidence(), message.Person(), message.Connected(),
+                            _as_array(message.ProbabilitiesAsNumpy(), np.float32))
+
+
+def encode_heartbeat(timestamp: float, interval_s: float, cameras: List[CameraStatsMessage]) -> bytes:
+    """Build a heartbeat carrying per-camera stats for one interval"""
+    builder = flatbuffers.Builder(64 + 64 * len(cameras))
+    n_classes = len(cameras[0].label_counts) if cameras else 0
+    columns = [
+        np.array([c.camera_id for c in cameras], dtype="<u4"),
+        np.array([c.frames for c in cameras], dtype="<u4"),
+        np.array([c.person_frames for c in cameras], dtype="<u4"),
+        np.array([c.dropped for c in cameras], dtype="<u4"),
+        np.array([c.mean_latency_ms for c in cameras], dtype="<f4"),
+        np.array([_label(c.label) for c in cameras], dtype="<i2"),
+        np.array([c.confidence for c in cameras], dtype="<f4"),
+        np.array([c.label_counts for c in cameras], dtype="<u4").reshape(len(cameras) * n_classes),
+    ]
+    vectors = [builder.CreateNumpyVector(column) for column in columns]
+
+    Heartbeat.Start(builder)
+    Heartbeat.AddTimestamp(builder, timestamp)
+    Heartbeat.AddIntervalS(builder, interval_s)
+    for add, vector in zip((Heartbeat.AddCameraIds, Heartbeat.AddFrames, Heartbeat.AddPersonFrames,
+                            Heartbeat.AddDropped, Heartbeat.AddMeanLatencyMs, Heartbeat.AddLabels,
+                            Heartbeat.AddConfidences, Heartbeat.AddLabelCounts), vectors):
+        add(builder, vector)
+    return _finish(builder, MSG_HEARTBEAT, Heartbeat.End(builder))
+
+
+def decode_heartbeat(data) -> HeartbeatMessage:
+    """Parse a heartbeat into one CameraStatsMessage per camera"""
+    _, table = _open(data, MSG_HEARTBEAT)
+    with _reading():
+        message = Heartbeat.Heartbeat()
+        message.Init(table.Bytes, table.Pos)
+        camera_ids = _as_array(message.CameraIdsAsNumpy(), np.uint32)
+        frames = _as_array(message.FramesAsNumpy(), np.uint32)
+        person_frames = _as_array(message.PersonFramesAsNumpy(), np.uint32)
+        dropped = _as_array(message.DroppedAsNumpy(), np.uint32)
+        latency = _as_array(message.MeanLatencyMsAsNumpy(), np.float32)
+        labels = _as_array(message.LabelsAsNumpy(), np.int16)
+        confidences = _as_array(message.ConfidencesAsNumpy(), np.float32)
+        counts = _as_array(message.LabelCountsAsNumpy(), np.uint32)
+
+        n = camera_ids.size
+        if any(column.size != n for column in (frames, person_frames, dropped, latency, labels, confidences)):
+            raise ProtocolError("heartbeat columns have different lengths")
+        if n and counts.size % n:
+            raise ProtocolError("heartbeat label_counts is not cameras x classes")
+        counts = counts.reshape(n, -1) if n else counts
+        cameras = [
+            CameraStatsMessage(int(camera_ids[i]), int(frames[i]), int(person_frames[i]), int(dropped[i]),
+                               float(latency[i]), _optional_label(int(labels[i])), float(confidences[i]), counts[i])
+            for i in range(n)
+        ]
+        return HeartbeatMessage(message.Timestamp(), message.IntervalS(), cameras)
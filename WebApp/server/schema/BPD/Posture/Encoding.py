@@ -0,0 +1,7 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+class Encoding(object):
+    JPEG = 1
+    PNG = 2
@@ -0,0 +1,132 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Frame(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Frame()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsFrame(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def FrameBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Frame
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Frame
+    def CameraId(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Frame
+    def Seq(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Frame
+    def CaptureTs(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float64Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Frame
+    def Encoding(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint8Flags, o + self._tab.Pos)
+        return 1
+
+    # Frame
+    def Data(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint8Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 1))
+        return 0
+
+    # Frame
+    def DataAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint8Flags, o)
+        return 0
+
+    # Frame
+    def DataLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Frame
+    def DataIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        return o == 0
+
+def FrameStart(builder):
+    builder.StartObject(5)
+
+def Start(builder):
+    FrameStart(builder)
+
+def FrameAddCameraId(builder, cameraId):
+    builder.PrependUint32Slot(0, cameraId, 0)
+
+def AddCameraId(builder, cameraId):
+    FrameAddCameraId(builder, cameraId)
+
+def FrameAddSeq(builder, seq):
+    builder.PrependUint32Slot(1, seq, 0)
+
+def AddSeq(builder, seq):
+    FrameAddSeq(builder, seq)
+
+def FrameAddCaptureTs(builder, captureTs):
+    builder.PrependFloat64Slot(2, captureTs, 0.0)
+
+def AddCaptureTs(builder, captureTs):
+    FrameAddCaptureTs(builder, captureTs)
+
+def FrameAddEncoding(builder, encoding):
+    builder.PrependUint8Slot(3, encoding, 1)
+
+def AddEncoding(builder, encoding):
+    FrameAddEncoding(builder, encoding)
+
+def FrameAddData(builder, data):
+    builder.PrependUOffsetTRelativeSlot(4, flatbuffers.number_types.UOffsetTFlags.py_type(data), 0)
+
+def AddData(builder, data):
+    FrameAddData(builder, data)
+
+def FrameStartDataVector(builder, numElems):
+    return builder.StartVector(1, numElems, 1)
+
+def StartDataVector(builder, numElems):
+    return FrameStartDataVector(builder, numElems)
+
+def FrameEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return FrameEnd(builder)
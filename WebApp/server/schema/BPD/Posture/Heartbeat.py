@@ -0,0 +1,379 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Heartbeat(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Heartbeat()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsHeartbeat(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def HeartbeatBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Heartbeat
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Heartbeat
+    def Timestamp(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float64Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Heartbeat
+    def IntervalS(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Heartbeat
+    def CameraIds(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def CameraIdsAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint32Flags, o)
+        return 0
+
+    # Heartbeat
+    def CameraIdsLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def CameraIdsIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        return o == 0
+
+    # Heartbeat
+    def Frames(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def FramesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint32Flags, o)
+        return 0
+
+    # Heartbeat
+    def FramesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def FramesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        return o == 0
+
+    # Heartbeat
+    def PersonFrames(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def PersonFramesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint32Flags, o)
+        return 0
+
+    # Heartbeat
+    def PersonFramesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def PersonFramesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        return o == 0
+
+    # Heartbeat
+    def Dropped(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def DroppedAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint32Flags, o)
+        return 0
+
+    # Heartbeat
+    def DroppedLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def DroppedIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        return o == 0
+
+    # Heartbeat
+    def MeanLatencyMs(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def MeanLatencyMsAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Float32Flags, o)
+        return 0
+
+    # Heartbeat
+    def MeanLatencyMsLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def MeanLatencyMsIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        return o == 0
+
+    # Heartbeat
+    def Labels(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Int16Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 2))
+        return 0
+
+    # Heartbeat
+    def LabelsAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Int16Flags, o)
+        return 0
+
+    # Heartbeat
+    def LabelsLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def LabelsIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        return o == 0
+
+    # Heartbeat
+    def Confidences(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def ConfidencesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Float32Flags, o)
+        return 0
+
+    # Heartbeat
+    def ConfidencesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def ConfidencesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        return o == 0
+
+    # Heartbeat
+    def LabelCounts(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(22))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Heartbeat
+    def LabelCountsAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(22))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint32Flags, o)
+        return 0
+
+    # Heartbeat
+    def LabelCountsLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(22))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Heartbeat
+    def LabelCountsIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(22))
+        return o == 0
+
+def HeartbeatStart(builder):
+    builder.StartObject(10)
+
+def Start(builder):
+    HeartbeatStart(builder)
+
+def HeartbeatAddTimestamp(builder, timestamp):
+    builder.PrependFloat64Slot(0, timestamp, 0.0)
+
+def AddTimestamp(builder, timestamp):
+    HeartbeatAddTimestamp(builder, timestamp)
+
+def HeartbeatAddIntervalS(builder, intervalS):
+    builder.PrependFloat32Slot(1, intervalS, 0.0)
+
+def AddIntervalS(builder, intervalS):
+    HeartbeatAddIntervalS(builder, intervalS)
+
+def HeartbeatAddCameraIds(builder, cameraIds):
+    builder.PrependUOffsetTRelativeSlot(2, flatbuffers.number_types.UOffsetTFlags.py_type(cameraIds), 0)
+
+def AddCameraIds(builder, cameraIds):
+    HeartbeatAddCameraIds(builder, cameraIds)
+
+def HeartbeatStartCameraIdsVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartCameraIdsVector(builder, numElems):
+    return HeartbeatStartCameraIdsVector(builder, numElems)
+
+def HeartbeatAddFrames(builder, frames):
+    builder.PrependUOffsetTRelativeSlot(3, flatbuffers.number_types.UOffsetTFlags.py_type(frames), 0)
+
+def AddFrames(builder, frames):
+    HeartbeatAddFrames(builder, frames)
+
+def HeartbeatStartFramesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartFramesVector(builder, numElems):
+    return HeartbeatStartFramesVector(builder, numElems)
+
+def HeartbeatAddPersonFrames(builder, personFrames):
+    builder.PrependUOffsetTRelativeSlot(4, flatbuffers.number_types.UOffsetTFlags.py_type(personFrames), 0)
+
+def AddPersonFrames(builder, personFrames):
+    HeartbeatAddPersonFrames(builder, personFrames)
+
+def HeartbeatStartPersonFramesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartPersonFramesVector(builder, numElems):
+    return HeartbeatStartPersonFramesVector(builder, numElems)
+
+def HeartbeatAddDropped(builder, dropped):
+    builder.PrependUOffsetTRelativeSlot(5, flatbuffers.number_types.UOffsetTFlags.py_type(dropped), 0)
+
+def AddDropped(builder, dropped):
+    HeartbeatAddDropped(builder, dropped)
+
+def HeartbeatStartDroppedVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartDroppedVector(builder, numElems):
+    return HeartbeatStartDroppedVector(builder, numElems)
+
+def HeartbeatAddMeanLatencyMs(builder, meanLatencyMs):
+    builder.PrependUOffsetTRelativeSlot(6, flatbuffers.number_types.UOffsetTFlags.py_type(meanLatencyMs), 0)
+
+def AddMeanLatencyMs(builder, meanLatencyMs):
+    HeartbeatAddMeanLatencyMs(builder, meanLatencyMs)
+
+def HeartbeatStartMeanLatencyMsVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartMeanLatencyMsVector(builder, numElems):
+    return HeartbeatStartMeanLatencyMsVector(builder, numElems)
+
+def HeartbeatAddLabels(builder, labels):
+    builder.PrependUOffsetTRelativeSlot(7, flatbuffers.number_types.UOffsetTFlags.py_type(labels), 0)
+
+def AddLabels(builder, labels):
+    HeartbeatAddLabels(builder, labels)
+
+def HeartbeatStartLabelsVector(builder, numElems):
+    return builder.StartVector(2, numElems, 2)
+
+def StartLabelsVector(builder, numElems):
+    return HeartbeatStartLabelsVector(builder, numElems)
+
+def HeartbeatAddConfidences(builder, confidences):
+    builder.PrependUOffsetTRelativeSlot(8, flatbuffers.number_types.UOffsetTFlags.py_type(confidences), 0)
+
+def AddConfidences(builder, confidences):
+    HeartbeatAddConfidences(builder, confidences)
+
+def HeartbeatStartConfidencesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartConfidencesVector(builder, numElems):
+    return HeartbeatStartConfidencesVector(builder, numElems)
+
+def HeartbeatAddLabelCounts(builder, labelCounts):
+    builder.PrependUOffsetTRelativeSlot(9, flatbuffers.number_types.UOffsetTFlags.py_type(labelCounts), 0)
+
+def AddLabelCounts(builder, labelCounts):
+    HeartbeatAddLabelCounts(builder, labelCounts)
+
+def HeartbeatStartLabelCountsVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartLabelCountsVector(builder, numElems):
+    return HeartbeatStartLabelCountsVector(builder, numElems)
+
+def HeartbeatEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return HeartbeatEnd(builder)
@@ -0,0 +1,99 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Hello(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Hello()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsHello(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def HelloBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Hello
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Hello
+    def ProtocolVersion(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint16Flags, o + self._tab.Pos)
+        return 0
+
+    # Hello
+    def Classes(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.String(a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return ""
+
+    # Hello
+    def ClassesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Hello
+    def ClassesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        return o == 0
+
+    # Hello
+    def Credits(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint16Flags, o + self._tab.Pos)
+        return 0
+
+def HelloStart(builder):
+    builder.StartObject(3)
+
+def Start(builder):
+    HelloStart(builder)
+
+def HelloAddProtocolVersion(builder, protocolVersion):
+    builder.PrependUint16Slot(0, protocolVersion, 0)
+
+def AddProtocolVersion(builder, protocolVersion):
+    HelloAddProtocolVersion(builder, protocolVersion)
+
+def HelloAddClasses(builder, classes):
+    builder.PrependUOffsetTRelativeSlot(1, flatbuffers.number_types.UOffsetTFlags.py_type(classes), 0)
+
+def AddClasses(builder, classes):
+    HelloAddClasses(builder, classes)
+
+def HelloStartClassesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartClassesVector(builder, numElems):
+    return HelloStartClassesVector(builder, numElems)
+
+def HelloAddCredits(builder, credits):
+    builder.PrependUint16Slot(2, credits, 0)
+
+def AddCredits(builder, credits):
+    HelloAddCredits(builder, credits)
+
+def HelloEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return HelloEnd(builder)
@@ -0,0 +1,158 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Keypoints(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Keypoints()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsKeypoints(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def KeypointsBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Keypoints
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Keypoints
+    def CameraId(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Keypoints
+    def Seq(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Keypoints
+    def CaptureTs(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float64Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Keypoints
+    def Values(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Keypoints
+    def ValuesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Float32Flags, o)
+        return 0
+
+    # Keypoints
+    def ValuesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Keypoints
+    def ValuesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        return o == 0
+
+    # Keypoints
+    def ValuesF16(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Uint16Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 2))
+        return 0
+
+    # Keypoints
+    def ValuesF16AsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Uint16Flags, o)
+        return 0
+
+    # Keypoints
+    def ValuesF16Length(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Keypoints
+    def ValuesF16IsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        return o == 0
+
+def KeypointsStart(builder):
+    builder.StartObject(5)
+
+def Start(builder):
+    KeypointsStart(builder)
+
+def KeypointsAddCameraId(builder, cameraId):
+    builder.PrependUint32Slot(0, cameraId, 0)
+
+def AddCameraId(builder, cameraId):
+    KeypointsAddCameraId(builder, cameraId)
+
+def KeypointsAddSeq(builder, seq):
+    builder.PrependUint32Slot(1, seq, 0)
+
+def AddSeq(builder, seq):
+    KeypointsAddSeq(builder, seq)
+
+def KeypointsAddCaptureTs(builder, captureTs):
+    builder.PrependFloat64Slot(2, captureTs, 0.0)
+
+def AddCaptureTs(builder, captureTs):
+    KeypointsAddCaptureTs(builder, captureTs)
+
+def KeypointsAddValues(builder, values):
+    builder.PrependUOffsetTRelativeSlot(3, flatbuffers.number_types.UOffsetTFlags.py_type(values), 0)
+
+def AddValues(builder, values):
+    KeypointsAddValues(builder, values)
+
+def KeypointsStartValuesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartValuesVector(builder, numElems):
+    return KeypointsStartValuesVector(builder, numElems)
+
+def KeypointsAddValuesF16(builder, valuesF16):
+    builder.PrependUOffsetTRelativeSlot(4, flatbuffers.number_types.UOffsetTFlags.py_type(valuesF16), 0)
+
+def AddValuesF16(builder, valuesF16):
+    KeypointsAddValuesF16(builder, valuesF16)
+
+def KeypointsStartValuesF16Vector(builder, numElems):
+    return builder.StartVector(2, numElems, 2)
+
+def StartValuesF16Vector(builder, numElems):
+    return KeypointsStartValuesF16Vector(builder, numElems)
+
+def KeypointsEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return KeypointsEnd(builder)
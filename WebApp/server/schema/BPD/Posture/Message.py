@@ -0,0 +1,70 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Message(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Message()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsMessage(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def MessageBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Message
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Message
+    def PayloadType(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint8Flags, o + self._tab.Pos)
+        return 0
+
+    # Message
+    def Payload(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            from flatbuffers.table import Table
+            obj = Table(bytearray(), 0)
+            self._tab.Union(obj, o)
+            return obj
+        return None
+
+def MessageStart(builder):
+    builder.StartObject(2)
+
+def Start(builder):
+    MessageStart(builder)
+
+def MessageAddPayloadType(builder, payloadType):
+    builder.PrependUint8Slot(0, payloadType, 0)
+
+def AddPayloadType(builder, payloadType):
+    MessageAddPayloadType(builder, payloadType)
+
+def MessageAddPayload(builder, payload):
+    builder.PrependUOffsetTRelativeSlot(1, flatbuffers.number_types.UOffsetTFlags.py_type(payload), 0)
+
+def AddPayload(builder, payload):
+    MessageAddPayload(builder, payload)
+
+def MessageEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return MessageEnd(builder)
@@ -0,0 +1,12 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+class Payload(object):
+    NONE = 0
+    Frame = 1
+    Keypoints = 2
+    Prediction = 3
+    Hello = 4
+    PostureEvent = 5
+    Heartbeat = 6
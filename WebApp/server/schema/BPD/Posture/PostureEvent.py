@@ -0,0 +1,184 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class PostureEvent(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = PostureEvent()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsPostureEvent(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def PostureEventBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # PostureEvent
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # PostureEvent
+    def CameraId(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # PostureEvent
+    def Seq(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # PostureEvent
+    def CaptureTs(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float64Flags, o + self._tab.Pos)
+        return 0.0
+
+    # PostureEvent
+    def Label(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Int16Flags, o + self._tab.Pos)
+        return -1
+
+    # PostureEvent
+    def PreviousLabel(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Int16Flags, o + self._tab.Pos)
+        return -1
+
+    # PostureEvent
+    def Confidence(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, o + self._tab.Pos)
+        return 0.0
+
+    # PostureEvent
+    def Person(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        if o != 0:
+            return bool(self._tab.Get(flatbuffers.number_types.BoolFlags, o + self._tab.Pos))
+        return False
+
+    # PostureEvent
+    def Connected(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            return bool(self._tab.Get(flatbuffers.number_types.BoolFlags, o + self._tab.Pos))
+        return True
+
+    # PostureEvent
+    def Probabilities(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # PostureEvent
+    def ProbabilitiesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Float32Flags, o)
+        return 0
+
+    # PostureEvent
+    def ProbabilitiesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # PostureEvent
+    def ProbabilitiesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        return o == 0
+
+def PostureEventStart(builder):
+    builder.StartObject(9)
+
+def Start(builder):
+    PostureEventStart(builder)
+
+def PostureEventAddCameraId(builder, cameraId):
+    builder.PrependUint32Slot(0, cameraId, 0)
+
+def AddCameraId(builder, cameraId):
+    PostureEventAddCameraId(builder, cameraId)
+
+def PostureEventAddSeq(builder, seq):
+    builder.PrependUint32Slot(1, seq, 0)
+
+def AddSeq(builder, seq):
+    PostureEventAddSeq(builder, seq)
+
+def PostureEventAddCaptureTs(builder, captureTs):
+    builder.PrependFloat64Slot(2, captureTs, 0.0)
+
+def AddCaptureTs(builder, captureTs):
+    PostureEventAddCaptureTs(builder, captureTs)
+
+def PostureEventAddLabel(builder, label):
+    builder.PrependInt16Slot(3, label, -1)
+
+def AddLabel(builder, label):
+    PostureEventAddLabel(builder, label)
+
+def PostureEventAddPreviousLabel(builder, previousLabel):
+    builder.PrependInt16Slot(4, previousLabel, -1)
+
+def AddPreviousLabel(builder, previousLabel):
+    PostureEventAddPreviousLabel(builder, previousLabel)
+
+def PostureEventAddConfidence(builder, confidence):
+    builder.PrependFloat32Slot(5, confidence, 0.0)
+
+def AddConfidence(builder, confidence):
+    PostureEventAddConfidence(builder, confidence)
+
+def PostureEventAddPerson(builder, person):
+    builder.PrependBoolSlot(6, person, 0)
+
+def AddPerson(builder, person):
+    PostureEventAddPerson(builder, person)
+
+def PostureEventAddConnected(builder, connected):
+    builder.PrependBoolSlot(7, connected, 1)
+
+def AddConnected(builder, connected):
+    PostureEventAddConnected(builder, connected)
+
+def PostureEventAddProbabilities(builder, probabilities):
+    builder.PrependUOffsetTRelativeSlot(8, flatbuffers.number_types.UOffsetTFlags.py_type(probabilities), 0)
+
+def AddProbabilities(builder, probabilities):
+    PostureEventAddProbabilities(builder, probabilities)
+
+def PostureEventStartProbabilitiesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartProbabilitiesVector(builder, numElems):
+    return PostureEventStartProbabilitiesVector(builder, numElems)
+
+def PostureEventEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return PostureEventEnd(builder)
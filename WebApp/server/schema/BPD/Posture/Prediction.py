@@ -0,0 +1,236 @@
+# automatically generated by the FlatBuffers compiler, do not modify
+
+# namespace: Posture
+
+import flatbuffers
+from flatbuffers.compat import import_numpy
+np = import_numpy()
+
+class Prediction(object):
+    __slots__ = ['_tab']
+
+    @classmethod
+    def GetRootAs(cls, buf, offset=0):
+        n = flatbuffers.encode.Get(flatbuffers.packer.uoffset, buf, offset)
+        x = Prediction()
+        x.Init(buf, n + offset)
+        return x
+
+    @classmethod
+    def GetRootAsPrediction(cls, buf, offset=0):
+        """This method is deprecated. Please switch to GetRootAs."""
+        return cls.GetRootAs(buf, offset)
+    @classmethod
+    def PredictionBufferHasIdentifier(cls, buf, offset, size_prefixed=False):
+        return flatbuffers.util.BufferHasIdentifier(buf, offset, b"\x42\x50\x44\x4D", size_prefixed=size_prefixed)
+
+    # Prediction
+    def Init(self, buf, pos):
+        self._tab = flatbuffers.table.Table(buf, pos)
+
+    # Prediction
+    def CameraId(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(4))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def Seq(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(6))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def CaptureTs(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(8))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float64Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Prediction
+    def Label(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(10))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Int16Flags, o + self._tab.Pos)
+        return -1
+
+    # Prediction
+    def Confidence(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(12))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Prediction
+    def LatencyMs(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(14))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, o + self._tab.Pos)
+        return 0.0
+
+    # Prediction
+    def Person(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(16))
+        if o != 0:
+            return bool(self._tab.Get(flatbuffers.number_types.BoolFlags, o + self._tab.Pos))
+        return False
+
+    # Prediction
+    def Probabilities(self, j):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            a = self._tab.Vector(o)
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, a + flatbuffers.number_types.UOffsetTFlags.py_type(j * 4))
+        return 0
+
+    # Prediction
+    def ProbabilitiesAsNumpy(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            return self._tab.GetVectorAsNumpy(flatbuffers.number_types.Float32Flags, o)
+        return 0
+
+    # Prediction
+    def ProbabilitiesLength(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        if o != 0:
+            return self._tab.VectorLen(o)
+        return 0
+
+    # Prediction
+    def ProbabilitiesIsNone(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(18))
+        return o == 0
+
+    # Prediction
+    def Credits(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(20))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint16Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def Dropped(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(22))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint32Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def HintQuality(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(24))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint8Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def HintMaxWidth(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(26))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Uint16Flags, o + self._tab.Pos)
+        return 0
+
+    # Prediction
+    def HintFps(self):
+        o = flatbuffers.number_types.UOffsetTFlags.py_type(self._tab.Offset(28))
+        if o != 0:
+            return self._tab.Get(flatbuffers.number_types.Float32Flags, o + self._tab.Pos)
+        return 0.0
+
+def PredictionStart(builder):
+    builder.StartObject(13)
+
+def Start(builder):
+    PredictionStart(builder)
+
+def PredictionAddCameraId(builder, cameraId):
+    builder.PrependUint32Slot(0, cameraId, 0)
+
+def AddCameraId(builder, cameraId):
+    PredictionAddCameraId(builder, cameraId)
+
+def PredictionAddSeq(builder, seq):
+    builder.PrependUint32Slot(1, seq, 0)
+
+def AddSeq(builder, seq):
+    PredictionAddSeq(builder, seq)
+
+def PredictionAddCaptureTs(builder, captureTs):
+    builder.PrependFloat64Slot(2, captureTs, 0.0)
+
+def AddCaptureTs(builder, captureTs):
+    PredictionAddCaptureTs(builder, captureTs)
+
+def PredictionAddLabel(builder, label):
+    builder.PrependInt16Slot(3, label, -1)
+
+def AddLabel(builder, label):
+    PredictionAddLabel(builder, label)
+
+def PredictionAddConfidence(builder, confidence):
+    builder.PrependFloat32Slot(4, confidence, 0.0)
+
+def AddConfidence(builder, confidence):
+    PredictionAddConfidence(builder, confidence)
+
+def PredictionAddLatencyMs(builder, latencyMs):
+    builder.PrependFloat32Slot(5, latencyMs, 0.0)
+
+def AddLatencyMs(builder, latencyMs):
+    PredictionAddLatencyMs(builder, latencyMs)
+
+def PredictionAddPerson(builder, person):
+    builder.PrependBoolSlot(6, person, 0)
+
+def AddPerson(builder, person):
+    PredictionAddPerson(builder, person)
+
+def PredictionAddProbabilities(builder, probabilities):
+    builder.PrependUOffsetTRelativeSlot(7, flatbuffers.number_types.UOffsetTFlags.py_type(probabilities), 0)
+
+def AddProbabilities(builder, probabilities):
+    PredictionAddProbabilities(builder, probabilities)
+
+def PredictionStartProbabilitiesVector(builder, numElems):
+    return builder.StartVector(4, numElems, 4)
+
+def StartProbabilitiesVector(builder, numElems):
+    return PredictionStartProbabilitiesVector(builder, numElems)
+
+def PredictionAddCredits(builder, credits):
+    builder.PrependUint16Slot(8, credits, 0)
+
+def AddCredits(builder, credits):
+    PredictionAddCredits(builder, credits)
+
+def PredictionAddDropped(builder, dropped):
+    builder.PrependUint32Slot(9, dropped, 0)
+
+def AddDropped(builder, dropped):
+    PredictionAddDropped(builder, dropped)
+
+def PredictionAddHintQuality(builder, hintQuality):
+    builder.PrependUint8Slot(10, hintQuality, 0)
+
+def AddHintQuality(builder, hintQuality):
+    PredictionAddHintQuality(builder, hintQuality)
+
+def PredictionAddHintMaxWidth(builder, hintMaxWidth):
+    builder.PrependUint16Slot(11, hintMaxWidth, 0)
+
+def AddHintMaxWidth(builder, hintMaxWidth):
+    PredictionAddHintMaxWidth(builder, hintMaxWidth)
+
+def PredictionAddHintFps(builder, hintFps):
+    builder.PrependFloat32Slot(12, hintFps, 0.0)
+
+def AddHintFps(builder, hintFps):
+    PredictionAddHintFps(builder, hintFps)
+
+def PredictionEnd(builder):
+    return builder.EndObject()
+
+def End(builder):
+    return PredictionEnd(builder)
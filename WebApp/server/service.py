@@ -0,0 +1,123 @@
+"""Asyncio front of the posture pipeline: owns camera sessions and the executor."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from server.batcher import MAX_BATCH_DELAY_MS, MAX_BATCH_SIZE, BatchClassifier
+from server.events import CONFIDENCE_BUCKET, HEARTBEAT_INTERVAL, EventHub
+from server.pipeline import CameraPipeline, KeypointPipeline, PostureClassifier
+from server.protocol import FrameMessage, KeypointsMessage
+
+
+class CameraAlreadyConnected(Exception):
+    """Raised when a second connection claims a camera id that is in use."""
+
+
+@dataclass
+class PredictionReply:
+    """What the service produced for one message, before it is encoded."""
+
+    camera_id: int
+    seq: int
+    timestamp: float
+    prediction: Optional[np.ndarray]
+    person: bool
+    latency_ms: float
+    decode_ms: float = 0.0  # frame messages only
+    frame_width: int = 0
+
+
+class PostureService:
+    """
+    Runs decode + pose + classification for many cameras.
+
+    All CPU work happens in a thread pool so the event loop only moves bytes.
+    OpenCV and MediaPipe release the GIL while they work, so several cameras
+    are processed in parallel. Each camera has its own CameraPipeline, which
+    is only ever used by one task at a time. Classification is not done per
+    camera: keypoints from all connections go through one BatchClassifier.
+    Replies are also published to an EventHub for dashboard subscribers.
+    """
+
+    def __init__(self, classifier: PostureClassifier, max_workers: Optional[int] = None,
+                 max_batch_size: int = MAX_BATCH_SIZE, max_batch_delay_ms: float = MAX_BATCH_DELAY_MS,
+                 confidence_bucket: float = CONFIDENCE_BUCKET, heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.classifier = classifier
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                           thread_name_prefix="posture")
+        self.batcher = BatchClassifier(classifier, self.executor, max_batch_size, max_batch_delay_ms)
+        self.events = EventHub(self.classes, confidence_bucket, heartbeat_interval)
+        self.sessions: Dict[int, KeypointPipeline] = {}
+
+    @property
+    def classes(self):
+        return self.classifier.classes
+
+    def open_camera(self, camera_id: int, keypoints: bool = False) -> KeypointPipeline:
+        """
+        Create the pipeline state for a newly connected camera.
+
+        Args:
+            keypoints: True for edge clients that send keypoints instead of frames
+        """
+        if camera_id in self.sessions:
+            raise CameraAlreadyConnected(camera_id)
+        if keypoints:
+            session = KeypointPipeline(camera_id)
+        else:
+            session = CameraPipeline(camera_id)
+        self.sessions[camera_id] = session
+        return session
+
+    def close_camera(self, camera_id: int):
+        """Drop a camera's pipeline state"""
+        session = self.sessions.pop(camera_id, None)
+        if session is not None:
+            self.executor.submit(session.close)
+        self.events.camera_closed(camera_id)
+
+    async def handle_frame(self, message: FrameMessage) -> PredictionReply:
+        """Decode, run pose and classify one frame message"""
+        received_at = time.monotonic()
+        session = self.sessions[message.camera_id]
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, session.analyze, message.payload, message.timestamp)
+
+        if result is not None and result.prediction is None:
+            if result.keypoints is not None:
+                result.prediction = await self.batcher.classify(message.camera_id, message.seq, result.keypoints)
+            session.finish(result)
+
+        prediction = result.prediction if result is not None else None
+        person = result is not None and result.keypoints is not None
+        latency_ms = (time.monotonic() - received_at) * 1000
+        return PredictionReply(message.camera_id, message.seq, message.timestamp, prediction, person, latency_ms,
+                               session.decode_ms, session.frame_width)
+
+    async def handle_keypoints(self, message: KeypointsMessage) -> PredictionReply:
+        """Classify one keypoints message"""
+        received_at = time.monotonic()
+        session = self.sessions[message.camera_id]
+        # Smoothing is a few vector ops: cheaper inline than a thread hop
+        result = session.smooth(message.keypoints, message.timestamp)
+        result.prediction = await self.batcher.classify(message.camera_id, message.seq, result.keypoints)
+        session.finish(result)
+
+        latency_ms = (time.monotonic() - received_at) * 1000
+        return PredictionReply(message.camera_id, message.seq, message.timestamp, result.prediction, True, latency_ms)
+
+    async def close(self):
+        """Stop the batch and heartbeat workers; call before leaving the event loop"""
+        await self.events.close()
+        await self.batcher.close()
+
+    def shutdown(self):
+        for camera_id in list(self.sessions):
+            self.close_camera(camera_id)
+        self.executor.shutdown(wait=True)
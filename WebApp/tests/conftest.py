@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the WebApp packages (server, utils, training) the way `python -m` does from the WebApp directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
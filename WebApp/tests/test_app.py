@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from server.app import handle_connection, parse_endpoint
+
+
+@pytest.mark.parametrize("path, endpoint", [
+    ("/frames", "frames"),
+    ("/keypoints/", "keypoints"),
+    ("/subscribe?camera=1,2", "subscribe"),
+    ("/posture/frames", "frames"),  # behind a reverse proxy prefix
+    ("/", None),
+    ("/frame", None),
+    ("/myframes", None),
+    ("/keypoints/extra", None),
+])
+def test_parse_endpoint(path, endpoint):
+    assert parse_endpoint(path) == endpoint
+
+
+def test_unknown_endpoint_is_closed_with_policy_violation():
+    async def main():
+        # The service is never reached for a rejected path
+        async with serve(lambda connection: handle_connection(None, connection), "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            async with connect(f"ws://127.0.0.1:{port}/camera") as connection:
+                with pytest.raises(ConnectionClosed) as closed:
+                    await asyncio.wait_for(connection.recv(), 5.0)
+        assert closed.value.rcvd.code == 1008
+
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from utils.augmentation import MIRROR_PERMUTATION, KeypointAugmenter, augment_arrays, mirror
+
+SITTING_LEFT, SITTING_RIGHT, GOOD_SITTING = 3, 4, 0
+
+
+def poses(n, seed=0):
+    return np.random.default_rng(seed).uniform(0.2, 0.8, (n, 99)).astype(np.float32)
+
+
+def mirror_only(**kwargs):
+    return KeypointAugmenter(mirror_prob=1.0, max_rotation_deg=0, scale_range=0, max_shift=0, noise_std=0,
+                             **kwargs)
+
+
+def test_mirror_swaps_left_and_right_landmarks():
+    points = poses(2).reshape(-1, 33, 3)
+    mirrored = mirror(points, np.array([True, False]))
+    np.testing.assert_allclose(mirrored[0, :, 0], 1 - points[0, MIRROR_PERMUTATION, 0], atol=1e-6)
+    np.testing.assert_array_equal(mirrored[1], points[1])
+
+
+def test_mirrored_rows_swap_their_labels():
+    augmenter = mirror_only(mirror_labels={SITTING_LEFT: SITTING_RIGHT, SITTING_RIGHT: SITTING_LEFT})
+    labels = np.array([SITTING_LEFT, SITTING_RIGHT, GOOD_SITTING])
+    _, augmented = augmenter(poses(3), labels)
+    np.testing.assert_array_equal(augmented, [SITTING_RIGHT, SITTING_LEFT, GOOD_SITTING])
+    np.testing.assert_array_equal(labels, [SITTING_LEFT, SITTING_RIGHT, GOOD_SITTING])
+
+
+def test_default_augmenter_does_not_mirror():
+    labels = np.array([SITTING_LEFT, SITTING_RIGHT])
+    keypoints, augmented = augment_arrays(poses(2), labels, copies=20)
+    np.testing.assert_array_equal(augmented, np.tile(labels, 21))
+    # x stays near the originals; a mirror would move it to 1 - x
+    np.testing.assert_allclose(keypoints[2:].reshape(20, 2, 99)[..., 0::3].mean(axis=0),
+                               poses(2)[:, 0::3], atol=0.1)
+
+
+def test_mirroring_labelled_rows_without_a_label_map_is_an_error():
+    with pytest.raises(ValueError):
+        mirror_only()(poses(2), np.array([SITTING_LEFT, SITTING_RIGHT]))
+    mirror_only()(poses(2))  # unlabelled rows are fine
+
+
+def test_seeded_calls_do_not_depend_on_call_order():
+    augmenter = KeypointAugmenter(mirror_prob=0.5, mirror_labels={}, seed=0)
+    batches = [poses(8, seed) for seed in range(3)]
+    forward = [augmenter(batch, seed=-seed)[0] for seed, batch in enumerate(batches)]
+    backward = [augmenter(batch, seed=-seed)[0] for seed, batch in reversed(list(enumerate(batches)))][::-1]
+    for a, b in zip(forward, backward):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.batch_extract import CHECKPOINT_NAME, STATUS_NO_POSE, STATUS_OK, _Checkpointer, load_checkpoint
+from utils.dataset_loader import KeypointDataset
+from utils.dataset_writer import KeypointDatasetWriter
+
+
+def rows(n, start=0):
+    return [np.full(99, start + i, dtype=np.float32) for i in range(n)]
+
+
+@pytest.mark.parametrize("format", ["npy", "h5"])
+def test_rows_written_after_the_last_commit_are_dropped_on_resume(tmp_path, format):
+    dataset_dir = str(tmp_path)
+    writer = KeypointDatasetWriter(dataset_dir, chunk_size=4, format=format)
+    checkpointer = _Checkpointer(writer, dataset_dir, *load_checkpoint(dataset_dir))
+    for i, keypoints in enumerate(rows(3)):
+        checkpointer.add(f"good/{i}.png", keypoints, STATUS_OK)
+    checkpointer.add("good/empty.png", None, STATUS_NO_POSE)
+    checkpointer.commit()
+
+    # Crash inside the next commit: rows reach the dataset, the checkpoint only part of a line
+    for i, keypoints in enumerate(rows(5, start=3), 3):
+        checkpointer.add(f"good/{i}.png", keypoints, STATUS_OK)
+    writer.append_batch(np.stack(checkpointer.keypoints), checkpointer.labels)
+    writer.flush()
+    checkpointer.file.write("good/3.png\tok\ngood/4.p")
+    checkpointer.file.close()
+    writer.close()
+
+    lines, committed_rows = load_checkpoint(dataset_dir)
+    assert [line.split("\t")[0] for line in lines] == ["good/0.png", "good/1.png", "good/2.png", "good/empty.png"]
+    assert committed_rows == 3
+
+    writer = KeypointDatasetWriter(dataset_dir, chunk_size=4, format=format)
+    checkpointer = _Checkpointer(writer, dataset_dir, lines, committed_rows)
+    for i, keypoints in enumerate(rows(5, start=3), 3):
+        checkpointer.add(f"good/{i}.png", keypoints, STATUS_OK)
+    checkpointer.close()
+    writer.close()
+
+    with KeypointDataset(dataset_dir) as dataset:
+        keypoints, _ = dataset.to_arrays()
+    np.testing.assert_array_equal(keypoints[:, 0], np.arange(8))
+    lines, committed_rows = load_checkpoint(dataset_dir)
+    assert len(lines) == 9 and committed_rows == 8
+    with open(os.path.join(dataset_dir, CHECKPOINT_NAME)) as f:
+        assert "good/4.p\n" not in f.read()
@@ -0,0 +1,97 @@
+"""Cluster routing against real worker processes with the benchmark's stub classifier."""
+
+import asyncio
+
+import numpy as np
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+
+from client.loadgen import load_stub_classifier
+from server.app import MAX_MESSAGE_SIZE
+from server.cluster import Cluster
+from server.pipeline import ENCODER_PATH
+from server.protocol import decode_hello, decode_result, encode_keypoints
+
+CAMERAS = range(8)
+TIMEOUT = 10.0
+
+
+async def open_camera(port: int, camera_id: int):
+    connection = await connect(f"ws://127.0.0.1:{port}/keypoints", max_size=MAX_MESSAGE_SIZE)
+    decode_hello(await connection.recv())
+    return connection
+
+
+async def round_trip(connection, camera_id: int, seq: int):
+    keypoints = np.random.default_rng(seq).random(99, dtype=np.float32)
+    await connection.send(encode_keypoints(camera_id, seq, float(seq), keypoints))
+    return decode_result(await asyncio.wait_for(connection.recv(), TIMEOUT))
+
+
+async def wait_for(condition):
+    for _ in range(int(TIMEOUT / 0.05)):
+        if condition():
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError("condition not reached")
+
+
+def run_cluster(scenario, call_ms: float = 0.0):
+    async def main():
+        cluster = Cluster(load_stub_classifier, (ENCODER_PATH, call_ms), processes=2, credits=2)
+        await cluster.start()
+        try:
+            async with serve(cluster.handle_connection, "127.0.0.1", 0, max_size=MAX_MESSAGE_SIZE) as server:
+                await scenario(cluster, server.sockets[0].getsockname()[1])
+        finally:
+            await cluster.close()
+
+    asyncio.run(main())
+
+
+def test_cameras_stick_to_their_ring_owner_and_move_when_it_leaves():
+    async def scenario(cluster, port):
+        clients = {camera_id: await open_camera(port, camera_id) for camera_id in CAMERAS}
+        for seq in range(3):
+            for camera_id, connection in clients.items():
+                result = await round_trip(connection, camera_id, seq)
+                assert (result.camera_id, result.seq, result.person) == (camera_id, seq, True)
+                assert cluster.cameras[camera_id].worker == cluster.ring.node_for(camera_id)
+
+        before = {camera_id: cluster.cameras[camera_id].worker for camera_id in CAMERAS}
+        assert len(set(before.values())) == 2
+        leaving = before[0]
+        await cluster.remove_worker(leaving)
+
+        after = {camera_id: cluster.cameras[camera_id].worker for camera_id in CAMERAS}
+        assert leaving not in after.values()
+        # Cameras of the remaining worker did not move
+        assert all(after[c] == before[c] for c in CAMERAS if before[c] != leaving)
+        for camera_id, connection in clients.items():
+            result = await round_trip(connection, camera_id, 10)
+            assert (result.camera_id, result.seq) == (camera_id, 10)
+        for connection in clients.values():
+            await connection.close()
+
+    run_cluster(scenario)
+
+
+def test_credits_in_flight_are_refunded_when_a_worker_dies():
+    async def scenario(cluster, port):
+        connection = await open_camera(port, 0)
+        await round_trip(connection, 0, 0)
+        worker = cluster.workers[cluster.cameras[0].worker]
+
+        # The stub model takes 2 s per call, so this message is still in flight
+        await connection.send(encode_keypoints(0, 1, 1.0, np.zeros(99, dtype=np.float32)))
+        await wait_for(lambda: cluster.cameras[0].upstream.in_flight == 1)
+        worker.process.kill()
+
+        refund = decode_result(await asyncio.wait_for(connection.recv(), TIMEOUT))
+        assert refund.credits == 1 and refund.label is None and not refund.person
+        assert refund.dropped >= 1
+        # The dead worker is replaced
+        await wait_for(lambda: worker.name not in cluster.workers and len(cluster.workers) == 2)
+        await connection.close()
+
+    run_cluster(scenario, call_ms=2000.0)
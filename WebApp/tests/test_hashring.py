@@ -0,0 +1,37 @@
+from server.hashring import HashRing
+
+KEYS = range(10000)
+
+
+def owners(ring):
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+def test_same_key_maps_to_the_same_node():
+    ring = HashRing(["worker-0", "worker-1", "worker-2"])
+    assert owners(ring) == owners(HashRing(["worker-2", "worker-0", "worker-1"]))
+    assert all(ring.node_for(key) == ring.node_for(key) for key in range(100))
+
+
+def test_empty_ring_has_no_owner():
+    assert HashRing().node_for(1) is None
+
+
+def test_adding_a_node_moves_about_one_in_n_keys():
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+    before = owners(ring)
+    ring.add("worker-4")
+    after = owners(ring)
+    moved = [key for key in KEYS if before[key] != after[key]]
+    # Keys only move to the new node, and about 1/5 of them do
+    assert all(after[key] == "worker-4" for key in moved)
+    assert 0.12 < len(moved) / len(KEYS) < 0.28
+
+
+def test_removing_a_node_only_moves_its_own_keys():
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+    before = owners(ring)
+    ring.remove("worker-1")
+    after = owners(ring)
+    assert "worker-1" not in after.values()
+    assert all(after[key] == before[key] for key in KEYS if before[key] != "worker-1")
@@ -0,0 +1,32 @@
+import numpy as np
+
+from utils.image_shards import ShardReader, ShardWriter
+
+
+def frame(value):
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+def test_indexed_samples_of_an_open_shard_survive_a_crash(tmp_path):
+    shards = ShardWriter(str(tmp_path), format="png", max_shard_samples=3)
+    keys = [shards.write(frame(i * 10), i) for i in range(5)]
+
+    # No close(): the second shard is still open, as after a crash
+    with ShardReader(str(tmp_path)) as reader:
+        assert reader.keys == keys
+        for i, key in enumerate(keys):
+            image, label = reader.get(key)
+            np.testing.assert_array_equal(image, frame(i * 10))
+            assert label == str(i)
+    shards.close()
+
+
+def test_flush_every_batches_index_lines(tmp_path):
+    shards = ShardWriter(str(tmp_path), format="png", flush_every=2)
+    shards.write(frame(0), 0)
+    with ShardReader(str(tmp_path)) as reader:
+        assert len(reader) == 0
+    shards.write(frame(1), 1)
+    with ShardReader(str(tmp_path)) as reader:
+        assert len(reader) == 2
+    shards.close()
@@ -0,0 +1,11 @@
+from client.loadgen import _acknowledge
+
+
+def test_acknowledge_forgets_seqs_the_server_dropped():
+    sent_at = {seq: float(seq) for seq in range(6)}
+    assert _acknowledge(sent_at, 0) == 0.0
+    # 1 and 2 were dropped server-side: only 3 is answered
+    assert _acknowledge(sent_at, 3) == 3.0
+    assert list(sent_at) == [4, 5]
+    assert _acknowledge(sent_at, 2) is None
+    assert list(sent_at) == [4, 5]
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from server.pipeline import KeypointPipeline
+from server.protocol import ProtocolError, decode_keypoints, encode_keypoints
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float16])
+@pytest.mark.parametrize("bad", [np.nan, np.inf, -np.inf])
+def test_non_finite_keypoints_are_rejected_before_smoothing(dtype, bad):
+    keypoints = np.linspace(0, 1, 99, dtype=np.float32)
+    keypoints[40] = bad
+    message = decode_keypoints(encode_keypoints(1, 2, 3.0, keypoints, dtype=dtype))
+    pipeline = KeypointPipeline(message.camera_id)
+    with pytest.raises(ProtocolError):
+        pipeline.smooth(message.keypoints, message.timestamp)
+    # The bad frame left no state behind
+    assert pipeline.frames == 0
+    result = pipeline.smooth(np.zeros(99, dtype=np.float32), 4.0)
+    assert np.isfinite(result.keypoints).all()
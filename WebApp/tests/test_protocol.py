@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from server.protocol import (ENCODING_PNG, CameraStatsMessage, EncodingHint, ProtocolError, decode_event,
+                             decode_frame, decode_heartbeat, decode_hello, decode_keypoints, decode_result,
+                             encode_event, encode_frame, encode_heartbeat, encode_hello, encode_keypoints,
+                             encode_result)
+
+KEYPOINTS = np.linspace(0, 1, 99, dtype=np.float32)
+
+MESSAGES = [
+    pytest.param(decode_frame, encode_frame(1, 2, 3.0, b"\xff\xd8" + bytes(200)), id="frame"),
+    pytest.param(decode_keypoints, encode_keypoints(1, 2, 3.0, KEYPOINTS), id="keypoints"),
+    pytest.param(decode_keypoints, encode_keypoints(1, 2, 3.0, KEYPOINTS, dtype=np.float16), id="keypoints-f16"),
+    pytest.param(decode_result, encode_result(1, 2, 3.0, np.full(5, 0.2, dtype=np.float32), True, 4.0),
+                 id="result"),
+    pytest.param(decode_hello, encode_hello(["good_sitting", "sitting_left"], credits=4), id="hello"),
+    pytest.param(decode_event, encode_event(1, 2, 3.0, 0, None, 0.9, True, probabilities=np.full(5, 0.2)),
+                 id="event"),
+    pytest.param(decode_heartbeat, encode_heartbeat(3.0, 5.0, [
+        CameraStatsMessage(1, 10, 8, 0, 2.5, 1, 0.8, np.arange(5)),
+        CameraStatsMessage(2, 12, 12, 1, 3.5, None, 0.0, np.arange(5)),
+    ]), id="heartbeat"),
+]
+
+
+def test_frame_round_trip():
+    image = b"\x89PNG" + bytes(range(200))
+    message = decode_frame(encode_frame(7, 42, 1234.5, image, ENCODING_PNG))
+    assert (message.camera_id, message.seq, message.timestamp, message.encoding) == (7, 42, 1234.5, ENCODING_PNG)
+    assert message.payload.tobytes() == image
+
+
+@pytest.mark.parametrize("dtype, tolerance", [(np.float32, 0), (np.float16, 1e-3)])
+def test_keypoints_round_trip(dtype, tolerance):
+    message = decode_keypoints(encode_keypoints(7, 42, 1234.5, KEYPOINTS.reshape(33, 3), dtype=dtype))
+    assert (message.camera_id, message.seq, message.timestamp) == (7, 42, 1234.5)
+    assert message.keypoints.dtype == dtype
+    np.testing.assert_allclose(message.keypoints, KEYPOINTS, atol=tolerance)
+
+
+def test_result_round_trip():
+    probabilities = np.array([0.1, 0.6, 0.1, 0.1, 0.1], dtype=np.float32)
+    message = decode_result(encode_result(7, 42, 1234.5, probabilities, True, 4.5, credits=3, dropped=9,
+                                          hint=EncodingHint(quality=60, max_width=480, fps=10.0)))
+    assert (message.camera_id, message.seq, message.timestamp) == (7, 42, 1234.5)
+    assert (message.label, message.person, message.credits, message.dropped) == (1, True, 3, 9)
+    assert message.confidence == pytest.approx(0.6) and message.latency_ms == pytest.approx(4.5)
+    np.testing.assert_array_equal(message.probabilities, probabilities)
+    assert message.hint == EncodingHint(60, 480, 10.0)
+
+
+def test_result_without_prediction_or_hint():
+    message = decode_result(encode_result(7, 42, 1234.5, None, False, 1.0))
+    assert message.label is None and message.person is False and message.hint is None
+    assert message.probabilities.size == 0
+
+
+def test_hello_round_trip():
+    message = decode_hello(encode_hello(["good_sitting", "sitting_left"], credits=4))
+    assert message.classes == ["good_sitting", "sitting_left"] and message.credits == 4
+
+
+def test_event_round_trip():
+    message = decode_event(encode_event(7, 42, 1234.5, 2, None, 0.75, True, connected=False,
+                                        probabilities=np.full(5, 0.2)))
+    assert (message.camera_id, message.seq, message.timestamp) == (7, 42, 1234.5)
+    assert (message.label, message.previous_label, message.person, message.connected) == (2, None, True, False)
+    assert message.confidence == pytest.approx(0.75)
+    np.testing.assert_allclose(message.probabilities, np.full(5, 0.2))
+
+
+def test_heartbeat_round_trip():
+    cameras = [
+        CameraStatsMessage(1, 10, 8, 0, 2.5, 1, 0.75, np.arange(5)),
+        CameraStatsMessage(2, 12, 12, 1, 3.5, None, 0.0, np.arange(5, 10)),
+    ]
+    message = decode_heartbeat(encode_heartbeat(1234.5, 5.0, cameras))
+    assert (message.timestamp, message.interval_s) == (1234.5, 5.0)
+    assert len(message.cameras) == len(cameras)
+    for decoded, sent in zip(message.cameras, cameras):
+        assert (decoded.camera_id, decoded.frames, decoded.person_frames, decoded.dropped, decoded.label) == \
+            (sent.camera_id, sent.frames, sent.person_frames, sent.dropped, sent.label)
+        assert decoded.mean_latency_ms == pytest.approx(sent.mean_latency_ms)
+        assert decoded.confidence == pytest.approx(sent.confidence)
+        np.testing.assert_array_equal(decoded.label_counts, sent.label_counts)
+
+
+@pytest.mark.parametrize("decode, data", MESSAGES)
+def test_truncated_messages_raise_protocol_error(decode, data):
+    # Only the last few bytes may be alignment padding that a decode does not need
+    for end in range(len(data) - 3):
+        with pytest.raises(ProtocolError):
+            decode(data[:end])
+
+
+@pytest.mark.parametrize("decode, data", MESSAGES)
+def test_corrupted_messages_raise_only_protocol_error(decode, data):
+    # A changed byte may still leave a valid message; anything else must be a ProtocolError
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        corrupt = bytearray(data)
+        # Keep the file identifier so corruption reaches the accessors
+        for position in rng.integers(0, len(corrupt), size=rng.integers(1, 4)):
+            if not 4 <= position < 8:
+                corrupt[position] = rng.integers(0, 256)
+        try:
+            decode(bytes(corrupt))
+        except ProtocolError:
+            pass
+
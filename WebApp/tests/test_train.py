@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from training.train import cache_key, mirror_label_map, resolve_classes
+from utils.augmentation import KeypointAugmenter
+
+# Capture order, as the dataset numbers its classes
+CAPTURED = ["sitting_right", "good_sitting", "sitting_left", "sitting_forward", "sitting_leanback"]
+
+
+def test_mirror_label_map_pairs_left_and_right_model_labels():
+    classes, _ = resolve_classes(SimpleNamespace(classes=CAPTURED))
+    left, right = classes.index("sitting_left"), classes.index("sitting_right")
+    assert mirror_label_map(classes) == {left: right, right: left}
+    assert mirror_label_map(["good_sitting", "sitting_forward"]) == {}
+
+
+def test_mirrored_sitting_left_row_is_labelled_sitting_right():
+    classes, lookup = resolve_classes(SimpleNamespace(classes=CAPTURED))
+    augmenter = KeypointAugmenter(mirror_prob=1.0, max_rotation_deg=0, scale_range=0, max_shift=0, noise_std=0,
+                                  mirror_labels=mirror_label_map(classes))
+    dataset_labels = np.array([CAPTURED.index(name) for name in ("sitting_left", "sitting_right", "good_sitting")])
+    keypoints = np.random.default_rng(0).uniform(0.2, 0.8, (3, 99)).astype(np.float32)
+    _, labels = augmenter(keypoints, lookup[dataset_labels])
+    assert [classes[i] for i in labels] == ["sitting_right", "sitting_left", "good_sitting"]
+
+
+def test_cache_key_changes_with_the_dataset_not_only_its_size():
+    manifest = {"format": "npy", "rows": 100, "updated": "2024-01-01T00:00:00", "chunks": [{"rows": 100}]}
+    lookup = np.arange(5)
+    key = cache_key(SimpleNamespace(path="data/a", manifest=manifest), lookup, 0, 0.2)
+    assert key == cache_key(SimpleNamespace(path="data/a", manifest=dict(manifest)), lookup, 0, 0.2)
+    assert key != cache_key(SimpleNamespace(path="data/b", manifest=manifest), lookup, 0, 0.2)
+    rewritten = dict(manifest, updated="2024-02-01T00:00:00")
+    assert key != cache_key(SimpleNamespace(path="data/a", manifest=rewritten), lookup, 0, 0.2)
+    assert key != cache_key(SimpleNamespace(path="data/a", manifest=manifest), lookup[::-1], 0, 0.2)
+    assert key != cache_key(SimpleNamespace(path="data/a", manifest=manifest), lookup, 1, 0.2)
@@ -0,0 +1,224 @@
+"""
+Distill the posture classifier into a tiny dense network.
+
+The teacher (the production CNN) labels every row of a keypoint dataset
+with its class probabilities. A small ReLU MLP is trained on a mix of
+the teacher's temperature-softened outputs and the dataset labels. The
+student is written twice:
+
+- <out>.h5: a Keras model with the same (33, 3, 1) input, which loads
+  anywhere the teacher does
+- <out>.npz: the same weights for bpd_common.numpy_mlp.NumpyMLP, which
+  load_model_and_encoder and PostureClassifier.load pick for .npz paths
+  and which needs no TensorFlow at all
+
+The student shares the teacher's label encoder. The report compares the
+two on held-out rows: label agreement, accuracy and CPU latency. Run from
+the WebApp directory:
+
+    python -m training.distill data/processed/dedup --hidden 64 32 --out models/student
+"""
+
+import argparse
+import json
+import pickle
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bpd_common.numpy_mlp import NumpyMLP
+from server.batcher import MAX_BATCH_SIZE
+from server.pipeline import ENCODER_PATH, MODEL_PATH
+from training.models import INPUT_SHAPE, to_model_input
+from utils.dataset_loader import KeypointDataset
+
+TEMPERATURE = 3.0
+ALPHA = 0.7  # weight of the teacher's soft targets against the dataset labels
+TEACHER_BATCH = 4096
+
+
+def soften(probabilities: np.ndarray, temperature: float) -> np.ndarray:
+    """softmax(log(p) / T): the teacher's outputs at temperature T"""
+    logits = np.log(np.clip(probabilities, 1e-8, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+def label_lookup(dataset: KeypointDataset, classes: Sequence[str]) -> Optional[np.ndarray]:
+    """Dataset label -> teacher class index, or None if the dataset labels cannot be mapped"""
+    if dataset.classes:
+        if not set(dataset.classes) <= set(classes):
+            return None
+        return np.array([list(classes).index(name) for name in dataset.classes], dtype=np.int32)
+    if len(dataset) and dataset.labels.max() < len(classes):
+        return np.arange(len(classes), dtype=np.int32)  # integer labels from the same encoder
+    return None
+
+
+def teacher_outputs(teacher, dataset: KeypointDataset) -> np.ndarray:
+    """Teacher class probabilities for every row, in row order"""
+    outputs = []
+    for keypoints, _ in dataset.batches(TEACHER_BATCH):
+        outputs.append(np.asarray(teacher(to_model_input(keypoints), training=False), dtype=np.float32))
+    return np.concatenate(outputs)
+
+
+def build_student(n_classes: int, hidden: Sequence[int]):
+    """Keras MLP over the flattened (33, 3, 1) input; returns (logits model, probabilities model)"""
+    import tensorflow as tf
+
+    layers = tf.keras.layers
+    inputs = tf.keras.Input(shape=INPUT_SHAPE)
+    x = layers.Flatten()(inputs)
+    for units in hidden:
+        x = layers.Dense(units, activation="relu")(x)
+    logits = layers.Dense(n_classes)(x)
+    return tf.keras.Model(inputs, logits), tf.keras.Model(inputs, layers.Softmax()(logits))
+
+
+def distillation_loss(n_classes: int, temperature: float, alpha: float) -> Callable:
+    """
+    Loss over targets [soft (n_classes) | one-hot (n_classes)] and student logits.
+
+    The soft term is scaled by T^2 so its gradients keep their size as T changes.
+    """
+    import tensorflow as tf
+
+    def loss(targets, logits):
+        soft = tf.keras.losses.categorical_crossentropy(targets[:, :n_classes], tf.nn.softmax(logits / temperature))
+        hard = tf.keras.losses.categorical_crossentropy(targets[:, n_classes:], tf.nn.softmax(logits))
+        return alpha * temperature ** 2 * soft + (1 - alpha) * hard
+
+    return loss
+
+
+def student_to_numpy(model) -> NumpyMLP:
+    import tensorflow as tf
+
+    dense = [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+    return NumpyMLP([layer.get_weights()[0] for layer in dense], [layer.get_weights()[1] for layer in dense])
+
+
+def median_ms(function: Callable, x: np.ndarray, repeats: int = 200) -> float:
+    for _ in range(10):
+        function(x)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function(x)
+        samples.append(time.perf_counter() - started)
+    return round(float(np.median(samples)) * 1000, 4)
+
+
+def distill(dataset_path: str, out: str, teacher_path: str = MODEL_PATH, encoder_path: str = ENCODER_PATH,
+            hidden: Sequence[int] = (64, 32), temperature: float = TEMPERATURE, alpha: float = ALPHA,
+            epochs: int = 30, batch_size: int = 256, val_fraction: float = 0.2, seed: int = 0) -> Dict:
+    """
+    Train the student and write <out>.h5, <out>.npz and the <out>.json report.
+
+    Returns:
+        The report
+    """
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    teacher = tf.keras.models.load_model(teacher_path)
+    with open(encoder_path, "rb") as f:
+        classes: List[str] = [str(c) for c in pickle.load(f).classes_]
+    n_classes = len(classes)
+
+    with KeypointDataset(dataset_path) as dataset:
+        started = time.perf_counter()
+        teacher_probs = teacher_outputs(teacher, dataset)
+        teacher_seconds = time.perf_counter() - started
+        lookup = label_lookup(dataset, classes)
+        if lookup is None:
+            # Labels unusable with this encoder: learn from the teacher alone
+            labels, alpha = teacher_probs.argmax(axis=1), 1.0
+        else:
+            labels = lookup[dataset.labels]
+        targets = np.concatenate([soften(teacher_probs, temperature),
+                                  np.eye(n_classes, dtype=np.float32)[labels]], axis=1)
+        train_indices, val_indices = dataset.split(val_fraction, seed=seed)
+
+        def training_batches():
+            # Shuffled by index permutation each epoch; rows of a batch are read in order
+            rng = np.random.default_rng(seed)
+            while True:
+                shuffled = rng.permutation(train_indices)
+                for start in range(0, len(shuffled), batch_size):
+                    batch = np.sort(shuffled[start:start + batch_size])
+                    keypoints, _ = dataset.take(batch)
+                    yield to_model_input(keypoints), targets[batch]
+
+        logits_model, student = build_student(n_classes, hidden)
+        logits_model.compile(optimizer=tf.keras.optimizers.Adam(1e-3),
+                             loss=distillation_loss(n_classes, temperature, alpha))
+        val_keypoints, _ = dataset.take(val_indices)
+        val_inputs = to_model_input(val_keypoints)
+        steps = -(-len(train_indices) // batch_size)
+        logits_model.fit(training_batches(), steps_per_epoch=steps, epochs=epochs, verbose=2,
+                         validation_data=(val_inputs, targets[val_indices]))
+
+    student.save(out + ".h5")
+    numpy_student = student_to_numpy(student)
+    numpy_student.save(out + ".npz")
+
+    teacher_val = teacher_probs[val_indices].argmax(axis=1)
+    student_val = numpy_student.predict(val_inputs).argmax(axis=1)
+    val_labels = labels[val_indices] if lookup is not None else None
+    one = val_inputs[:1]
+    batch = val_inputs[:MAX_BATCH_SIZE]
+    report = {
+        "dataset": dataset_path,
+        "teacher": teacher_path,
+        "student": out + ".npz",
+        "encoder": encoder_path,
+        "hidden": list(hidden),
+        "temperature": temperature,
+        "alpha": alpha,
+        "val_rows": int(len(val_indices)),
+        "agreement": round(float((student_val == teacher_val).mean()), 4),
+        "teacher_accuracy": round(float((teacher_val == val_labels).mean()), 4) if val_labels is not None else None,
+        "student_accuracy": round(float((student_val == val_labels).mean()), 4) if val_labels is not None else None,
+        "teacher_params": int(teacher.count_params()),
+        "student_params": numpy_student.count_params(),
+        "student_bytes": int(sum(w.nbytes for w in numpy_student.weights + numpy_student.biases)),
+        "teacher_labelling_seconds": round(teacher_seconds, 1),
+        # Same call the server makes (model(batch, training=False)) for one frame and one batch
+        "latency_ms": {
+            "teacher_keras_1": median_ms(lambda x: teacher(x, training=False), one),
+            "student_keras_1": median_ms(lambda x: student(x, training=False), one),
+            "student_numpy_1": median_ms(numpy_student, one),
+            f"teacher_keras_{len(batch)}": median_ms(lambda x: teacher(x, training=False), batch),
+            f"student_numpy_{len(batch)}": median_ms(numpy_student, batch),
+        },
+    }
+    with open(out + ".json", "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the posture classifier into a small MLP")
+    parser.add_argument("dataset", help="Dataset directory")
+    parser.add_argument("--teacher", default=MODEL_PATH)
+    parser.add_argument("--encoder", default=ENCODER_PATH, help="The teacher's label encoder, shared by the student")
+    parser.add_argument("--out", default="models/student", help="Output path without extension")
+    parser.add_argument("--hidden", type=int, nargs="*", default=[64, 32], help="Hidden layer sizes")
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE)
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="Weight of soft targets vs dataset labels")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = distill(args.dataset, args.out, args.teacher, args.encoder, args.hidden, args.temperature, args.alpha,
+                     args.epochs, args.batch_size, seed=args.seed)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Posture classifier architectures."""
+
+from typing import Sequence
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+INPUT_SHAPE = (NUM_LANDMARKS, 3, 1)  # what OwnCamera and PostureClassifier feed the model
+
+
+def to_model_input(keypoints: np.ndarray) -> np.ndarray:
+    """Reshape (n, 99) keypoints to the (n, 33, 3, 1) model input"""
+    return np.asarray(keypoints, dtype=np.float32).reshape((-1,) + INPUT_SHAPE)
+
+
+def build_model(n_classes: int, conv_filters: Sequence[int] = (32, 64), dense_units: Sequence[int] = (128,),
+                dropout: float = 0.3, learning_rate: float = 1e-3):
+    """
+    Compiled Keras classifier over (33, 3, 1) keypoints.
+
+    Each conv block is a 3x3 convolution over landmarks x coordinates, then
+    pooling along the landmark axis. With no conv_filters the model is a
+    plain MLP over the flattened keypoints.
+
+    Args:
+        n_classes: Number of posture classes
+        conv_filters: Filters per conv block
+        dense_units: Units per hidden dense layer
+        dropout: Dropout after each dense layer
+        learning_rate: Adam learning rate
+    """
+    import tensorflow as tf
+
+    layers = tf.keras.layers
+    inputs = tf.keras.Input(shape=INPUT_SHAPE)
+    x = inputs
+    for filters in conv_filters:
+        x = layers.Conv2D(filters, (3, 3), padding="same", activation="relu")(x)
+        x = layers.BatchNormalization()(x)
+        x = layers.MaxPooling2D(pool_size=(2, 1))(x)
+    x = layers.Flatten()(x)
+    for units in dense_units:
+        x = layers.Dense(units, activation="relu")(x)
+        if dropout:
+            x = layers.Dropout(dropout)(x)
+    outputs = layers.Dense(n_classes, activation="softmax")(x)
+
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    return model
@@ -0,0 +1,224 @@
+"""
+Latency-aware architecture search for the posture classifier.
+
+Candidates from SEARCH_SPACE are trained in a process pool. Each is then
+timed on CPU through the production inference path, PostureClassifier.predict:
+once per frame (batch of 1, as a single camera sees it) and in batches of
+MAX_BATCH_SIZE, as the server's BatchClassifier runs it. Timing runs one
+candidate at a time after training, so the pool does not distort it. The
+report lists every candidate and marks the Pareto front of validation
+accuracy against per-frame latency. Run from the WebApp directory:
+
+    python -m training.search data/processed/dedup --processes 4 --epochs 20 --out search/
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from server.batcher import MAX_BATCH_SIZE
+from training.models import build_model
+from training.train import make_dataset, resolve_classes, save_label_encoder
+from utils.dataset_loader import KeypointDataset
+
+LATENCY_REPEATS = 200
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """One architecture to try; the fields are build_model arguments"""
+
+    name: str
+    conv_filters: Tuple[int, ...] = ()
+    dense_units: Tuple[int, ...] = (64,)
+    dropout: float = 0.3
+
+
+SEARCH_SPACE = (
+    Candidate("mlp-32", (), (32,)),
+    Candidate("mlp-64", (), (64,)),
+    Candidate("mlp-128-64", (), (128, 64)),
+    Candidate("mlp-256-128", (), (256, 128)),
+    Candidate("cnn-16-d64", (16,), (64,)),
+    Candidate("cnn-32-d128", (32,), (128,)),
+    Candidate("cnn-32-64-d128", (32, 64), (128,)),
+    Candidate("cnn-64-128-d256", (64, 128), (256,)),
+)
+
+
+@dataclass
+class CandidateResult:
+    candidate: Candidate
+    val_accuracy: float
+    epochs: int
+    train_seconds: float
+    params: int
+    model_path: str
+    single_ms: float = 0.0      # median latency of one frame
+    batch_ms: float = 0.0       # median latency of one MAX_BATCH_SIZE batch
+    per_sample_ms: float = 0.0  # batch_ms / MAX_BATCH_SIZE
+    pareto: bool = False
+
+
+def _init_worker(threads: int):
+    # Must run before TensorFlow creates its thread pools
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+
+def train_candidate(candidate: Candidate, dataset_path: str, out_dir: str, epochs: int, batch_size: int,
+                    val_fraction: float, seed: int, encoder_path: Optional[str] = None) -> CandidateResult:
+    """Train one candidate with early stopping; saves <out_dir>/<name>.h5"""
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    started = time.perf_counter()
+    model_path = os.path.join(out_dir, f"{candidate.name}.h5")
+    with KeypointDataset(dataset_path) as dataset:
+        classes, lookup = resolve_classes(dataset, encoder_path)
+        train_indices, val_indices = dataset.split(val_fraction, seed=seed)
+        train_data = make_dataset(dataset, train_indices, lookup, batch_size, True, seed=seed)
+        val_data = make_dataset(dataset, val_indices, lookup, batch_size, False)
+        model = build_model(len(classes), candidate.conv_filters, candidate.dense_units, candidate.dropout)
+        history = model.fit(train_data, validation_data=val_data, epochs=epochs, verbose=0, callbacks=[
+            tf.keras.callbacks.EarlyStopping(monitor="val_accuracy", patience=5, restore_best_weights=True),
+        ])
+    model.save(model_path)
+    return CandidateResult(
+        candidate=candidate,
+        val_accuracy=float(max(history.history["val_accuracy"])),
+        epochs=len(history.history["loss"]),
+        train_seconds=round(time.perf_counter() - started, 1),
+        params=int(model.count_params()),
+        model_path=model_path,
+    )
+
+
+def measure_latency(model_path: str, classes: Sequence[str], repeats: int = LATENCY_REPEATS,
+                    batch_size: int = MAX_BATCH_SIZE) -> Tuple[float, float]:
+    """
+    Median CPU latency of PostureClassifier.predict, in ms.
+
+    Returns:
+        (one frame, one batch of `batch_size` frames)
+    """
+    import tensorflow as tf
+
+    from server.pipeline import PostureClassifier
+
+    classifier = PostureClassifier(tf.keras.models.load_model(model_path), SimpleNamespace(classes_=list(classes)))
+    rng = np.random.default_rng(0)
+    timings = []
+    for rows in (1, batch_size):
+        keypoints = rng.random((rows, 99), dtype=np.float32)
+        for _ in range(10):  # warm up graph tracing and allocations
+            classifier.predict(keypoints)
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            classifier.predict(keypoints)
+            samples.append(time.perf_counter() - started)
+        timings.append(float(np.median(samples)) * 1000)
+    return timings[0], timings[1]
+
+
+def pareto_front(results: Sequence[CandidateResult]) -> List[CandidateResult]:
+    """Results no other result beats on both accuracy and per-frame latency"""
+    front = []
+    for result in results:
+        dominated = any(
+            other.val_accuracy >= result.val_accuracy and other.single_ms <= result.single_ms
+            and (other.val_accuracy > result.val_accuracy or other.single_ms < result.single_ms)
+            for other in results
+        )
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda result: result.single_ms)
+
+
+def search(dataset_path: str, out_dir: str, candidates: Sequence[Candidate] = SEARCH_SPACE,
+           processes: Optional[int] = None, threads: int = 1, epochs: int = 20, batch_size: int = 256,
+           val_fraction: float = 0.2, seed: int = 0, encoder_path: Optional[str] = None) -> List[CandidateResult]:
+    """
+    Train every candidate, time it, and mark the Pareto front.
+
+    Args:
+        processes: Candidates trained at once; CPU count // threads by default
+        threads: TensorFlow threads per training process, and for timing
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    with KeypointDataset(dataset_path) as dataset:
+        classes, _ = resolve_classes(dataset, encoder_path)
+    save_label_encoder(classes, os.path.join(out_dir, "label_encoder.pkl"))
+
+    processes = processes or max(1, (os.cpu_count() or 1) // threads)
+    context = get_context("spawn")
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker,
+                             initargs=(threads,)) as pool:
+        futures = [pool.submit(train_candidate, candidate, dataset_path, out_dir, epochs, batch_size,
+                               val_fraction, seed, encoder_path) for candidate in candidates]
+        results = []
+        for future in futures:
+            result = future.result()
+            print(f"trained {result.candidate.name}: val_accuracy {result.val_accuracy:.4f}, "
+                  f"{result.epochs} epochs, {result.train_seconds}s")
+            results.append(result)
+
+    # A fresh single process, so timings see an idle machine and the same thread count
+    with ProcessPoolExecutor(1, mp_context=context, initializer=_init_worker, initargs=(threads,)) as pool:
+        for result in results:
+            single_ms, batch_ms = pool.submit(measure_latency, result.model_path, classes).result()
+            result.single_ms = round(single_ms, 3)
+            result.batch_ms = round(batch_ms, 3)
+            result.per_sample_ms = round(batch_ms / MAX_BATCH_SIZE, 4)
+
+    for result in pareto_front(results):
+        result.pareto = True
+    return results
+
+
+def format_results(results: Sequence[CandidateResult]) -> str:
+    lines = [f"{'':2}{'candidate':<20}{'val_acc':>9}{'params':>10}{'1 frame ms':>12}"
+             f"{f'batch {MAX_BATCH_SIZE} ms':>14}{'per frame ms':>14}"]
+    for result in sorted(results, key=lambda result: result.single_ms):
+        lines.append(f"{'*' if result.pareto else '':2}{result.candidate.name:<20}{result.val_accuracy:>9.4f}"
+                     f"{result.params:>10}{result.single_ms:>12.3f}{result.batch_ms:>14.3f}"
+                     f"{result.per_sample_ms:>14.4f}")
+    lines.append("* Pareto front: no other candidate is both more accurate and faster per frame")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search classifier architectures for accuracy vs CPU latency")
+    parser.add_argument("dataset", help="Dataset directory")
+    parser.add_argument("--out", default="search", help="Directory for candidate models and the report")
+    parser.add_argument("--processes", type=int, default=None, help="Candidates trained in parallel")
+    parser.add_argument("--threads", type=int, default=1, help="TensorFlow threads per process")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--val-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encoder", default=None,
+                        help="Existing label encoder, for datasets with integer labels and no class names")
+    args = parser.parse_args()
+
+    results = search(args.dataset, args.out, processes=args.processes, threads=args.threads, epochs=args.epochs,
+                     batch_size=args.batch_size, val_fraction=args.val_fraction, seed=args.seed,
+                     encoder_path=args.encoder)
+    print(format_results(results))
+    with open(os.path.join(args.out, "report.json"), "w") as f:
+        json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Train the posture classifier from a binary keypoint dataset.
+
+Rows stream from the dataset's memory-mapped chunks into a tf.data
+pipeline. They are reshaped to the (33, 3, 1) model input once and cached,
+in memory or in a cache file for datasets larger than RAM. Then they are
+shuffled through a buffer, optionally augmented, batched and prefetched.
+The model and a matching label encoder land next to each other, ready for
+load_model_and_encoder / PostureClassifier.load. Run from the WebApp
+directory:
+
+    python -m training.train data/processed/dataset --epochs 50 --augment
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from training.models import INPUT_SHAPE, build_model
+from utils.augmentation import KeypointAugmenter
+from utils.dataset_loader import KeypointDataset
+
+MODEL_OUT = "models/best_model.trained.h5"
+ENCODER_OUT = "models/label_encoder.trained.pkl"
+READ_CHUNK = 8192
+SHUFFLE_BUFFER = 65536
+MIRROR_PROB = 0.5
+
+
+def resolve_classes(dataset: KeypointDataset, encoder_path: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Class names in LabelEncoder order, and a lookup from dataset label to model label.
+
+    LabelEncoder keeps its classes sorted, while the dataset numbers class
+    names in the order they were first captured, so labels are remapped.
+    Datasets converted from an integer-labelled CSV carry no names; their
+    labels are indices into an existing encoder, given by `encoder_path`.
+    """
+    if dataset.classes:
+        classes = sorted(dataset.classes)
+        lookup = np.array([classes.index(name) for name in dataset.classes], dtype=np.int32)
+        return classes, lookup
+    if encoder_path is None:
+        raise ValueError(f"{dataset.path} has no class names; pass the label encoder its labels came from")
+    with open(encoder_path, "rb") as f:
+        classes = [str(c) for c in pickle.load(f).classes_]
+    if len(dataset) and dataset.labels.max() >= len(classes):
+        raise ValueError(f"{dataset.path} has labels beyond the {len(classes)} classes of {encoder_path}")
+    return classes, np.arange(len(classes), dtype=np.int32)
+
+
+def mirror_label_map(classes: Sequence[str]) -> Dict[int, int]:
+    """
+    Model label -> model label under a horizontal mirror, for KeypointAugmenter.
+
+    Every X_left class is paired with X_right (both directions); classes
+    without a counterpart are left out and keep their label.
+    """
+    index = {name: i for i, name in enumerate(classes)}
+    labels = {}
+    for name, i in index.items():
+        if name.endswith("_left") and name[:-len("_left")] + "_right" in index:
+            j = index[name[:-len("_left")] + "_right"]
+            labels[i], labels[j] = j, i
+    return labels
+
+
+def cache_key(dataset: KeypointDataset, lookup: np.ndarray, seed: int, val_fraction: float) -> str:
+    """
+    Name for the tf.data cache files of one dataset split.
+
+    Hashes everything the cached rows depend on: the dataset's location and
+    manifest (chunk list, row count and write stamp, so a rewritten dataset
+    gets a new key), the label lookup and the split.
+    """
+    identity = json.dumps({
+        "path": os.path.abspath(dataset.path),
+        "manifest": dataset.manifest,
+        "lookup": np.asarray(lookup).tolist(),
+        "seed": seed,
+        "val_fraction": val_fraction,
+    }, sort_keys=True)
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def save_label_encoder(classes: Sequence[str], path: str):
+    """Pickle a fitted sklearn LabelEncoder, the format the apps load"""
+    from sklearn.preprocessing import LabelEncoder
+
+    encoder = LabelEncoder()
+    encoder.fit(list(classes))
+    with open(path, "wb") as f:
+        pickle.dump(encoder, f)
+
+
+def make_dataset(dataset: KeypointDataset, indices: np.ndarray, lookup: np.ndarray, batch_size: int,
+                 training: bool, cache: str = "", shuffle_buffer: int = SHUFFLE_BUFFER,
+                 augmenter: Optional[KeypointAugmenter] = None, seed: Optional[int] = None):
+    """
+    tf.data pipeline over dataset rows `indices`.
+
+    Rows are read in index order, in READ_CHUNK blocks, so the memory maps
+    are walked sequentially; randomness comes from the shuffle buffer.
+
+    Args:
+        cache: Cache file prefix, or "" to cache in memory
+        training: Shuffle and augment
+    """
+    import tensorflow as tf
+
+    indices = np.sort(indices)
+
+    def read():
+        for keypoints, labels in dataset.batches(READ_CHUNK, indices=indices):
+            yield keypoints.reshape((-1,) + INPUT_SHAPE), lookup[labels]
+
+    data = tf.data.Dataset.from_generator(read, output_signature=(
+        tf.TensorSpec(shape=(None,) + INPUT_SHAPE, dtype=tf.float32),
+        tf.TensorSpec(shape=(None,), dtype=tf.int32),
+    ))
+    data = data.unbatch().cache(cache)
+    if training:
+        data = data.shuffle(min(shuffle_buffer, len(indices)), seed=seed, reshuffle_each_iteration=True)
+    data = data.batch(batch_size)
+    if training and augmenter is not None:
+        # Each batch carries its own augmentation seed, drawn in batch order, so the
+        # parallel map is repeatable whichever batch its workers reach first
+        seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True)
+        data = tf.data.Dataset.zip((data, seeds))
+
+        def augment_batch(batch, batch_seed):
+            keypoints, labels = batch
+            keypoints, labels = tf.numpy_function(augmenter, [keypoints, labels, batch_seed],
+                                                  (tf.float32, tf.int32))
+            keypoints.set_shape((None,) + INPUT_SHAPE)
+            labels.set_shape((None,))
+            return keypoints, labels
+
+        data = data.map(augment_batch, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+    return data.prefetch(tf.data.AUTOTUNE)
+
+
+def train(dataset_path: str, model_out: str = MODEL_OUT, encoder_out: str = ENCODER_OUT,
+          encoder_path: Optional[str] = None, epochs: int = 50, batch_size: int = 256, val_fraction: float = 0.2,
+          seed: int = 0, augment: bool = False, cache_dir: Optional[str] = None, patience: int = 8,
+          deterministic: bool = False) -> dict:
+    """
+    Train, keep the best epoch by validation accuracy and write model + encoder.
+
+    Returns:
+        The training summary that is also written to <model_out>.json
+    """
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    if deterministic:
+        tf.config.experimental.enable_op_determinism()
+
+    started = time.time()
+    with KeypointDataset(dataset_path) as dataset:
+        classes, lookup = resolve_classes(dataset, encoder_path)
+        train_indices, val_indices = dataset.split(val_fraction, seed=seed)
+        train_cache = val_cache = ""
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            key = cache_key(dataset, lookup, seed, val_fraction)
+            train_cache = os.path.join(cache_dir, f"train_{key}")
+            val_cache = os.path.join(cache_dir, f"val_{key}")
+        augmenter = None
+        if augment:
+            # Mirror only when the left/right classes can swap with it
+            mirror_labels = mirror_label_map(classes)
+            augmenter = KeypointAugmenter(mirror_prob=MIRROR_PROB if mirror_labels else 0.0,
+                                          mirror_labels=mirror_labels, seed=seed)
+        train_data = make_dataset(dataset, train_indices, lookup, batch_size, True, train_cache,
+                                  augmenter=augmenter, seed=seed)
+        val_data = make_dataset(dataset, val_indices, lookup, batch_size, False, val_cache)
+
+        os.makedirs(os.path.dirname(model_out) or ".", exist_ok=True)
+        model = build_model(len(classes))
+        history = model.fit(train_data, validation_data=val_data, epochs=epochs, verbose=2, callbacks=[
+            tf.keras.callbacks.ModelCheckpoint(model_out, monitor="val_accuracy", save_best_only=True),
+            tf.keras.callbacks.EarlyStopping(monitor="val_accuracy", patience=patience, restore_best_weights=True),
+        ])
+        save_label_encoder(classes, encoder_out)
+
+        summary = {
+            "dataset": os.path.abspath(dataset_path),
+            "rows": len(dataset),
+            "train_rows": len(train_indices),
+            "val_rows": len(val_indices),
+            "classes": classes,
+            "seed": seed,
+            "epochs_run": len(history.history["loss"]),
+            "batch_size": batch_size,
+            "augment": augment,
+            "best_val_accuracy": float(max(history.history["val_accuracy"])),
+            "model": model_out,
+            "encoder": encoder_out,
+            "seconds": round(time.time() - started, 1),
+        }
+    with open(os.path.splitext(model_out)[0] + ".json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the posture classifier from a keypoint dataset")
+    parser.add_argument("dataset", help="Dataset directory (see utils.dataset_loader to convert a CSV)")
+    parser.add_argument("--model-out", default=MODEL_OUT)
+    parser.add_argument("--encoder-out", default=ENCODER_OUT)
+    parser.add_argument("--encoder", default=None,
+                        help="Existing label encoder, for datasets with integer labels and no class names")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--val-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--augment", action="store_true",
+                        help="Augment training batches (rotate, scale, ...; mirroring swaps *_left/*_right labels)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Cache preprocessed rows on disk instead of in memory, for large datasets")
+    parser.add_argument("--patience", type=int, default=8, help="Epochs without improvement before stopping")
+    parser.add_argument("--deterministic", action="store_true", help="Bit-for-bit repeatable runs (slower)")
+    args = parser.parse_args()
+
+    summary = train(args.dataset, args.model_out, args.encoder_out, args.encoder, args.epochs, args.batch_size,
+                    args.val_fraction, args.seed, args.augment, args.cache_dir, args.patience, args.deterministic)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
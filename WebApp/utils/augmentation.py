@@ -0,0 +1,210 @@
+"""
+Batched augmentation of MediaPipe Pose keypoints.
+
+Every transform works on a whole (N, 33, 3) array of normalized (x, y, z)
+landmarks at once; flattened (N, 99) rows as written by save_to_csv and
+KeypointDatasetWriter are accepted too. Offline, `augment_arrays` grows a
+dataset by a number of augmented copies; while training, `augmented_batches`
+wraps any (keypoints, labels) batch iterator, e.g. KeypointDataset.batches.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# MediaPipe Pose landmark pairs that trade places under a horizontal mirror
+LEFT_RIGHT_PAIRS = (
+    (1, 4), (2, 5), (3, 6),        # eyes
+    (7, 8), (9, 10),               # ears, mouth
+    (11, 12), (13, 14), (15, 16),  # shoulders, elbows, wrists
+    (17, 18), (19, 20), (21, 22),  # pinkies, index fingers, thumbs
+    (23, 24), (25, 26), (27, 28),  # hips, knees, ankles
+    (29, 30), (31, 32),            # heels, foot index
+)
+
+LEFT_HIP, RIGHT_HIP = 23, 24
+
+
+def _mirror_permutation() -> np.ndarray:
+    permutation = np.arange(NUM_LANDMARKS)
+    for left, right in LEFT_RIGHT_PAIRS:
+        permutation[left], permutation[right] = right, left
+    return permutation
+
+
+MIRROR_PERMUTATION = _mirror_permutation()
+
+
+def as_landmarks(keypoints: np.ndarray) -> np.ndarray:
+    """View (N, 99) or (N, 33, 3) keypoints as (N, 33, 3) float32"""
+    return np.asarray(keypoints, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+
+
+def hip_center(points: np.ndarray) -> np.ndarray:
+    """(N, 1, 3) midpoint of the hips, the pivot for rotation and scaling"""
+    return (points[:, LEFT_HIP:LEFT_HIP + 1] + points[:, RIGHT_HIP:RIGHT_HIP + 1]) / 2
+
+
+def mirror(points: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Flip poses horizontally: x -> 1 - x, and left/right landmarks swap indices.
+
+    Args:
+        points: (N, 33, 3) landmarks
+        mask: (N,) booleans selecting the poses to flip; all by default
+    """
+    flipped = points[:, MIRROR_PERMUTATION]
+    flipped[..., 0] = 1.0 - flipped[..., 0]
+    if mask is None:
+        return flipped
+    return np.where(mask[:, None, None], flipped, points)
+
+
+def rotate(points: np.ndarray, angles: np.ndarray, aspect: float = 1.0) -> np.ndarray:
+    """
+    Rotate poses in the image plane about the hip center.
+
+    Args:
+        angles: (N,) angles in radians
+        aspect: Frame width / height; x and y are normalized separately, so
+            they are rescaled to pixel proportions before rotating
+    """
+    center = hip_center(points)
+    x = (points[..., 0] - center[..., 0]) * aspect
+    y = points[..., 1] - center[..., 1]
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    rotated = points.copy()
+    rotated[..., 0] = (x * cos - y * sin) / aspect + center[..., 0]
+    rotated[..., 1] = x * sin + y * cos + center[..., 1]
+    return rotated
+
+
+def scale(points: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Scale poses about the hip center by (N,) factors, as if closer to or further from the camera"""
+    center = hip_center(points)
+    return (points - center) * factors[:, None, None].astype(np.float32) + center
+
+
+def translate(points: np.ndarray, shifts: np.ndarray) -> np.ndarray:
+    """Shift poses by (N, 2) offsets in normalized x, y"""
+    moved = points.copy()
+    moved[..., :2] += shifts[:, None, :].astype(np.float32)
+    return moved
+
+
+def jitter(points: np.ndarray, std: float, rng: np.random.Generator) -> np.ndarray:
+    """Add independent Gaussian noise to every landmark coordinate"""
+    return points + rng.standard_normal(points.shape, dtype=np.float32) * np.float32(std)
+
+
+class KeypointAugmenter:
+    """
+    Random pose augmentation applied to whole batches.
+
+    Each call draws one set of parameters per pose and applies, in order:
+    mirroring, rotation, scaling, translation and per-joint noise. Output
+    has the same shape as the input, (N, 99) or (N, 33, 3).
+
+    Mirroring is off by default: a mirrored sitting_left pose is a
+    sitting_right pose, so it needs a label map to go with it.
+
+    Usage:
+        augmenter = KeypointAugmenter(seed=0)
+        X_aug, y_aug = augmenter(X, y)
+
+        # LabelEncoder classes: ... sitting_left (3), sitting_right (4)
+        augmenter = KeypointAugmenter(mirror_prob=0.5, mirror_labels={3: 4, 4: 3}, seed=0)
+    """
+
+    def __init__(self, mirror_prob: float = 0.0, max_rotation_deg: float = 10.0, scale_range: float = 0.1,
+                 max_shift: float = 0.05, noise_std: float = 0.005, aspect: float = 4 / 3,
+                 mirror_labels: Optional[Dict[int, int]] = None, seed: Optional[int] = None):
+        """
+        Args:
+            mirror_prob: Probability that a pose is mirrored; needs `mirror_labels`
+                when labels are augmented too
+            max_rotation_deg: Rotation drawn from +/- this many degrees
+            scale_range: Scale factor drawn from 1 +/- this
+            max_shift: Translation drawn from +/- this, in normalized units
+            noise_std: Standard deviation of per-joint noise
+            aspect: Frame width / height of the capture camera
+            mirror_labels: Class index -> class index it becomes when mirrored, for
+                every left/right class in both directions, e.g. {3: 4, 4: 3}.
+                Classes not in the map keep their label; pass {} if no class
+                depends on the side
+            seed: Seed for reproducible augmentation
+        """
+        self.mirror_prob = mirror_prob
+        self.max_rotation = np.deg2rad(max_rotation_deg)
+        self.scale_range = scale_range
+        self.max_shift = max_shift
+        self.noise_std = noise_std
+        self.aspect = aspect
+        self.mirror_labels = mirror_labels
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, keypoints: np.ndarray, labels: Optional[np.ndarray] = None,
+                 seed: Optional[int] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Args:
+            seed: Seed for this call alone; calls given a seed do not touch the
+                augmenter's own generator, so they can run in any order or in
+                parallel and still be repeatable
+        """
+        if labels is not None and self.mirror_prob > 0 and self.mirror_labels is None:
+            raise ValueError("mirroring labelled poses needs mirror_labels (class index -> mirrored class index)")
+        shape = np.shape(keypoints)
+        points = as_landmarks(keypoints)
+        n = len(points)
+        # Any int64 (tf.data.Dataset.random yields negative ones too) as an unsigned seed
+        rng = self.rng if seed is None else np.random.default_rng(int(seed) & 0xFFFFFFFFFFFFFFFF)
+
+        mirrored = rng.random(n) < self.mirror_prob
+        if self.mirror_prob > 0:
+            points = mirror(points, mirrored)
+        if self.max_rotation > 0:
+            points = rotate(points, rng.uniform(-self.max_rotation, self.max_rotation, n), self.aspect)
+        if self.scale_range > 0:
+            points = scale(points, rng.uniform(1 - self.scale_range, 1 + self.scale_range, n))
+        if self.max_shift > 0:
+            points = translate(points, rng.uniform(-self.max_shift, self.max_shift, (n, 2)))
+        if self.noise_std > 0:
+            points = jitter(points, self.noise_std, rng)
+
+        if labels is not None and self.mirror_labels:
+            original_labels = np.asarray(labels)
+            labels = original_labels.copy()
+            for original, swapped in self.mirror_labels.items():
+                labels[mirrored & (original_labels == original)] = swapped
+        return points.reshape(shape), labels
+
+
+def augment_arrays(keypoints: np.ndarray, labels: np.ndarray, copies: int = 1,
+                   augmenter: Optional[KeypointAugmenter] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Offline augmentation: the original rows followed by `copies` augmented copies.
+
+    Returns:
+        (keypoints, labels) with (copies + 1) * N rows
+    """
+    augmenter = augmenter or KeypointAugmenter()
+    keypoints = np.asarray(keypoints, dtype=np.float32)
+    tiled = np.concatenate([keypoints] * copies)
+    augmented, augmented_labels = augmenter(tiled, np.tile(labels, copies))
+    return np.concatenate([keypoints, augmented]), np.concatenate([labels, augmented_labels])
+
+
+def augmented_batches(batches: Iterable[Tuple[np.ndarray, np.ndarray]],
+                      augmenter: Optional[KeypointAugmenter] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Streaming augmentation of a (keypoints, labels) batch iterator.
+
+    Usage:
+        for X, y in augmented_batches(dataset.batches(256, indices=train, shuffle=True)):
+            ...
+    """
+    augmenter = augmenter or KeypointAugmenter()
+    for keypoints, labels in batches:
+        yield augmenter(keypoints, labels)
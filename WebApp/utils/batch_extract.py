@@ -0,0 +1,221 @@
+"""
+Offline keypoint extraction over a data/raw image tree.
+
+Images saved by save_raw / AsyncImageSaver live in raw_dir/<label>/<file>.
+A pool of processes, each with its own static-mode MediaPipe Pose, extracts
+keypoints and the parent process writes them through KeypointDatasetWriter.
+Processed files are recorded in a checkpoint file inside the dataset, together
+with the dataset row count they were committed at, so an interrupted run
+drops any rows written after the last commit and picks up where it stopped. Run from the WebApp directory:
+
+    python -m utils.batch_extract data/raw data/processed/raw_keypoints --processes 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.dataset_writer import KeypointDatasetWriter
+
+CHECKPOINT_NAME = "extracted.txt"
+COMMIT_MARK = "#rows"  # checkpoint line closing a commit: "#rows\t<dataset rows>"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+CHECKPOINT_EVERY = 512
+
+STATUS_OK = "ok"
+STATUS_NO_POSE = "no_pose"
+STATUS_UNREADABLE = "unreadable"
+
+# Set in each worker process by _init_worker
+_pose = None
+
+
+def find_images(raw_dir: str, extensions=IMAGE_EXTENSIONS) -> List[str]:
+    """Image paths relative to raw_dir, one label directory deep, sorted"""
+    images = []
+    for label in sorted(os.listdir(raw_dir)):
+        label_dir = os.path.join(raw_dir, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            if name.lower().endswith(extensions):
+                images.append(f"{label}/{name}")
+    return images
+
+
+def load_checkpoint(dataset_dir: str) -> Tuple[List[str], Optional[int]]:
+    """
+    Committed checkpoint lines, and the dataset row count at the last commit.
+
+    Lines after the last COMMIT_MARK belong to a commit that did not finish
+    and are left out. Checkpoints written before commit marks existed have
+    no row count (None); all their complete lines count.
+    """
+    path = os.path.join(dataset_dir, CHECKPOINT_NAME)
+    if not os.path.exists(path):
+        return [], None
+    committed, pending, rows = [], [], None
+    with open(path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # torn final write
+            if line.startswith(COMMIT_MARK):
+                committed += pending
+                pending = []
+                rows = int(line.split("\t", 1)[1])
+            elif line.strip():
+                pending.append(line)
+    return (committed, rows) if rows is not None else (pending, None)
+
+
+def parse_label(name: str):
+    """Label directory name: numeric names are class indices, others class names"""
+    return int(name) if name.isdigit() else name
+
+
+def _init_worker(model_complexity: int, min_detection_confidence: float):
+    global _pose
+    import mediapipe as mp
+
+    # Static mode: every image is independent, no tracking between them
+    _pose = mp.solutions.pose.Pose(static_image_mode=True, model_complexity=model_complexity,
+                                   min_detection_confidence=min_detection_confidence)
+
+
+def _extract(job: Tuple[str, str]) -> Tuple[str, Optional[np.ndarray], str]:
+    import cv2
+
+    raw_dir, rel_path = job
+    image = cv2.imread(os.path.join(raw_dir, rel_path))
+    if image is None:
+        return rel_path, None, STATUS_UNREADABLE
+    results = _pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.pose_landmarks:
+        return rel_path, None, STATUS_NO_POSE
+    # Same layout as keypoints_utils.keypoints_from_results; that module is not
+    # imported here because it builds its own video-mode Pose on import
+    keypoints = np.array([[lm.x, lm.y, lm.z] for lm in results.pose_landmarks.landmark], dtype=np.float32)
+    return rel_path, keypoints.ravel(), STATUS_OK
+
+
+class _Checkpointer:
+    """
+    Commits finished images in groups: the rows are flushed to the dataset,
+    then the images are listed in the checkpoint followed by the dataset's
+    row count. A crash in between leaves rows with no checkpoint entry; on
+    resume the dataset is truncated back to the last recorded row count and
+    those images are extracted again, so no row is ever written twice.
+    """
+
+    def __init__(self, writer: KeypointDatasetWriter, dataset_dir: str, lines: List[str] = (),
+                 committed_rows: Optional[int] = None):
+        """
+        Args:
+            lines, committed_rows: What load_checkpoint returned for `dataset_dir`
+        """
+        self.writer = writer
+        if committed_rows is not None:
+            writer.truncate(committed_rows)
+        # Rewrite the checkpoint without the tail of an unfinished commit
+        path = os.path.join(dataset_dir, CHECKPOINT_NAME)
+        with open(path + ".tmp", "w") as f:
+            f.writelines(lines)
+            f.write(f"{COMMIT_MARK}\t{len(writer)}\n")
+        os.replace(path + ".tmp", path)
+        self.file = open(path, "a")
+        self.keypoints: List[np.ndarray] = []
+        self.labels: list = []
+        self.lines: List[str] = []
+
+    def add(self, rel_path: str, keypoints: Optional[np.ndarray], status: str):
+        if keypoints is not None:
+            self.keypoints.append(keypoints)
+            self.labels.append(parse_label(rel_path.split("/", 1)[0]))
+        self.lines.append(f"{rel_path}\t{status}\n")
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def commit(self):
+        if self.keypoints:
+            self.writer.append_batch(np.stack(self.keypoints), self.labels)
+        self.writer.flush()
+        self.file.writelines(self.lines)
+        self.file.write(f"{COMMIT_MARK}\t{self.writer.rows}\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.keypoints, self.labels, self.lines = [], [], []
+
+    def close(self):
+        self.commit()
+        self.file.close()
+
+
+def extract_directory(raw_dir: str, dataset_dir: str, processes: Optional[int] = None, format: str = "npy",
+                      model_complexity: int = 1, min_detection_confidence: float = 0.5,
+                      checkpoint_every: int = CHECKPOINT_EVERY, chunksize: int = 8) -> dict:
+    """
+    Extract keypoints for every image under raw_dir not yet in the checkpoint.
+
+    Args:
+        processes: Worker processes; one per CPU by default
+        format: Dataset format for a new dataset, "npy" or "h5"
+        checkpoint_every: Images between dataset flushes and checkpoint writes
+        chunksize: Images handed to a worker at a time
+
+    Returns:
+        Counts per status, plus "skipped" and "seconds"
+    """
+    started = time.perf_counter()
+    lines, committed_rows = load_checkpoint(dataset_dir)
+    done = {line.split("\t", 1)[0] for line in lines}
+    todo = [path for path in find_images(raw_dir) if path not in done]
+    counts = {STATUS_OK: 0, STATUS_NO_POSE: 0, STATUS_UNREADABLE: 0, "skipped": len(done)}
+    if not todo:
+        counts["seconds"] = 0.0
+        return counts
+
+    processes = processes or os.cpu_count() or 1
+    context = multiprocessing.get_context("spawn")
+    writer = KeypointDatasetWriter(dataset_dir, chunk_size=checkpoint_every, format=format)
+    checkpointer = _Checkpointer(writer, dataset_dir, lines, committed_rows)
+    try:
+        with context.Pool(processes, initializer=_init_worker,
+                          initargs=(model_complexity, min_detection_confidence)) as pool:
+            jobs = ((raw_dir, path) for path in todo)
+            for index, (rel_path, keypoints, status) in enumerate(pool.imap_unordered(_extract, jobs, chunksize), 1):
+                checkpointer.add(rel_path, keypoints, status)
+                counts[status] += 1
+                if len(checkpointer) >= checkpoint_every:
+                    checkpointer.commit()
+                    elapsed = time.perf_counter() - started
+                    print(f"{index}/{len(todo)} images, {index / elapsed:.1f} img/s")
+    finally:
+        checkpointer.close()
+        writer.close()
+    counts["seconds"] = round(time.perf_counter() - started, 1)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract keypoints from a data/raw image tree in parallel")
+    parser.add_argument("raw_dir", help="Image tree, one directory per label")
+    parser.add_argument("dataset", help="Output dataset directory; re-running resumes")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=("npy", "h5"), default="npy")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=1)
+    parser.add_argument("--min-detection-confidence", type=float, default=0.5)
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY)
+    args = parser.parse_args()
+
+    counts = extract_directory(args.raw_dir, args.dataset, args.processes, args.format, args.model_complexity,
+                               args.min_detection_confidence, args.checkpoint_every)
+    print(", ".join(f"{key}: {value}" for key, value in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
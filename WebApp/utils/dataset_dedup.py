@@ -0,0 +1,136 @@
+"""
+Near-duplicate filtering for keypoint datasets.
+
+A subject sitting still in front of a 30 fps camera produces long runs of
+almost identical rows. This stage keeps one representative per
+neighbourhood: per label, a row is dropped when it lies within `eps`
+(Euclidean distance over the 99 keypoint values) of a row already kept.
+Run from the WebApp directory between extraction and training:
+
+    python -m utils.dataset_dedup data/processed/raw_keypoints data/processed/dedup --eps 0.02
+"""
+
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from utils.dataset_loader import KeypointDataset
+from utils.dataset_writer import KeypointDatasetWriter
+
+# Typical frame-to-frame landmark jitter of a still subject is ~0.002 per
+# coordinate, i.e. ~0.02 over 99 values
+EPSILON = 0.02
+INDEX_DIMS = 8
+
+
+def _project(keypoints: np.ndarray, dims: int, sample: int = 10000) -> np.ndarray:
+    """Coordinates along the top `dims` principal axes (an orthonormal projection)"""
+    rows = keypoints[np.linspace(0, len(keypoints) - 1, min(sample, len(keypoints))).astype(int)]
+    mean = rows.mean(axis=0)
+    _, _, axes = np.linalg.svd(rows - mean, full_matrices=False)
+    return (keypoints - mean) @ axes[:dims].T
+
+
+def dedup_mask(keypoints: np.ndarray, eps: float = EPSILON, index_dims: int = INDEX_DIMS) -> np.ndarray:
+    """
+    Boolean mask of rows to keep, for rows that share one label.
+
+    Rows are visited in order; each row not yet covered is kept and covers
+    every row within `eps` of it. Kept rows are thus more than `eps` apart,
+    and every dropped row is within `eps` of a kept one.
+
+    KD-trees slow to a crawl in 99 dimensions, so the tree indexes the rows
+    projected onto their top `index_dims` principal axes. A projection never
+    increases distances, so a ball query there returns every true neighbour
+    (plus a few extra), which are then checked at full dimension.
+
+    Args:
+        keypoints: (n, n_features) array
+        eps: Euclidean distance under which rows count as duplicates
+        index_dims: Dimensions of the projected index
+    """
+    keypoints = np.asarray(keypoints, dtype=np.float32)
+    keep = np.zeros(len(keypoints), dtype=bool)
+    if len(keypoints) == 0:
+        return keep
+    tree = cKDTree(_project(keypoints, min(index_dims, keypoints.shape[1])))
+    covered = np.zeros(len(keypoints), dtype=bool)
+    for i in range(len(keypoints)):
+        if covered[i]:
+            continue
+        keep[i] = True
+        candidates = np.asarray(tree.query_ball_point(tree.data[i], eps), dtype=np.intp)
+        candidates = candidates[~covered[candidates]]
+        distances = np.linalg.norm(keypoints[candidates] - keypoints[i], axis=1)
+        covered[candidates[distances <= eps]] = True
+    return keep
+
+
+def dedup_labels(keypoints: np.ndarray, labels: np.ndarray, eps: float = EPSILON) -> np.ndarray:
+    """dedup_mask applied separately to each label; rows of different labels never cancel out"""
+    labels = np.asarray(labels)
+    keep = np.zeros(len(labels), dtype=bool)
+    for label in np.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        keep[rows] = dedup_mask(keypoints[rows], eps)
+    return keep
+
+
+def dedup_dataset(src: str, dst: str, eps: float = EPSILON, format: Optional[str] = None,
+                  batch_size: int = 65536) -> Dict[str, Dict[str, int]]:
+    """
+    Write the deduplicated rows of dataset `src` to a new dataset `dst`, in their original order.
+
+    One label's rows are held in memory at a time.
+
+    Returns:
+        Per label name: {"before": rows, "after": rows kept}
+    """
+    report = {}
+    with KeypointDataset(src) as dataset:
+        labels = dataset.labels
+        keep = np.zeros(len(dataset), dtype=bool)
+        for label in np.unique(labels):
+            rows = np.flatnonzero(labels == label)
+            keypoints, _ = dataset.take(rows)
+            label_keep = dedup_mask(keypoints, eps)
+            keep[rows] = label_keep
+            name = dataset.classes[label] if 0 <= label < len(dataset.classes) else str(label)
+            report[name] = {"before": len(rows), "after": int(label_keep.sum())}
+
+        with KeypointDatasetWriter(dst, chunk_size=batch_size, format=format or dataset.format,
+                                   classes=dataset.classes, n_features=dataset.n_features) as writer:
+            for keypoints, batch_labels in dataset.batches(batch_size, indices=np.flatnonzero(keep)):
+                writer.append_batch(keypoints, batch_labels)
+    return report
+
+
+def format_report(report: Dict[str, Dict[str, int]]) -> str:
+    lines = [f"{'label':<20}{'before':>10}{'after':>10}{'removed':>10}"]
+    total_before = total_after = 0
+    for name, counts in report.items():
+        before, after = counts["before"], counts["after"]
+        total_before += before
+        total_after += after
+        lines.append(f"{name:<20}{before:>10}{after:>10}{(1 - after / before) if before else 0:>10.1%}")
+    removed = (1 - total_after / total_before) if total_before else 0
+    lines.append(f"{'total':<20}{total_before:>10}{total_after:>10}{removed:>10.1%}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drop near-duplicate keypoint rows from a dataset")
+    parser.add_argument("src", help="Input dataset directory")
+    parser.add_argument("dst", help="Output dataset directory")
+    parser.add_argument("--eps", type=float, default=EPSILON, help="Duplicate distance")
+    parser.add_argument("--format", choices=("npy", "h5"), default=None, help="Output format (default: as input)")
+    args = parser.parse_args()
+
+    report = dedup_dataset(args.src, args.dst, args.eps, args.format)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
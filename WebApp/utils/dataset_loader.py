@@ -0,0 +1,187 @@
+"""
+Memory-mapped access to keypoint datasets written by KeypointDatasetWriter.
+
+Nothing is read until a batch asks for it: .npy chunks are opened with
+np.load(mmap_mode="r") and HDF5 datasets are read by slice. Only the label
+column (4 bytes per row) is held in memory, for splits and stratification.
+Convert an existing CSV dataset from the WebApp directory with:
+
+    python -m utils.dataset_loader data/processed/dataset.csv data/processed/dataset
+"""
+
+import argparse
+import json
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.dataset_writer import H5_NAME, MANIFEST_NAME, KeypointDatasetWriter
+
+
+class KeypointDataset:
+    """
+    Read-only view of a chunked keypoint dataset.
+
+    Rows are addressed by a global index; `take` gathers arbitrary rows,
+    `batches` iterates in order or in a shuffled permutation, and `split`
+    produces train/validation index sets. Iterating with indices never
+    materializes more than one batch.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        self.path = path
+        self.format = self.manifest["format"]
+        self.n_features = self.manifest["n_features"]
+        self.classes: List[str] = self.manifest.get("classes", [])
+        self._h5 = None
+
+        if self.format == "h5":
+            import h5py
+
+            self._h5 = h5py.File(os.path.join(path, self.manifest.get("file", H5_NAME)), "r")
+            rows = self.manifest["rows"]
+            self._keypoints = [self._h5["keypoints"]]
+            self._labels = [self._h5["labels"]]
+            self._offsets = np.array([0, rows])
+        else:
+            chunks = self.manifest["chunks"]
+            self._keypoints = [np.load(os.path.join(path, c["keypoints"]), mmap_mode="r") for c in chunks]
+            self._labels = [np.load(os.path.join(path, c["labels"]), mmap_mode="r") for c in chunks]
+            self._offsets = np.concatenate([[0], np.cumsum([c["rows"] for c in chunks])])
+        self._all_labels: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __enter__(self) -> "KeypointDataset":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def labels(self) -> np.ndarray:
+        """The whole label column (int32), read once"""
+        if self._all_labels is None:
+            n = len(self)
+            self._all_labels = np.concatenate([np.asarray(labels[:n]) for labels in self._labels]) \
+                if self._labels else np.zeros(0, dtype=np.int32)
+        return self._all_labels
+
+    def take(self, indices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather rows by global index, in the order given.
+
+        Returns:
+            (keypoints of shape (n, n_features) float32, labels of shape (n,) int32)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        keypoints = np.empty((len(indices), self.n_features), dtype=np.float32)
+        # Read in ascending order: sequential for memmaps, required by h5py
+        order = np.argsort(indices, kind="stable")
+        sorted_indices = indices[order]
+        chunk_of = np.searchsorted(self._offsets, sorted_indices, side="right") - 1
+        for chunk in np.unique(chunk_of):
+            mask = chunk_of == chunk
+            local = sorted_indices[mask] - self._offsets[chunk]
+            if self._h5 is not None:
+                # h5py rejects repeated indices in fancy selections
+                unique, inverse = np.unique(local, return_inverse=True)
+                keypoints[order[mask]] = self._keypoints[chunk][unique][inverse]
+            else:
+                keypoints[order[mask]] = self._keypoints[chunk][local]
+        return keypoints, self.labels[indices]
+
+    def batches(self, batch_size: int = 256, indices: Optional[Sequence[int]] = None, shuffle: bool = False,
+                seed: Optional[int] = None, drop_remainder: bool = False) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Iterate over (keypoints, labels) batches.
+
+        Args:
+            indices: Rows to iterate over (e.g. from `split`); all rows by default
+            shuffle: Visit the rows in a random permutation
+            seed: Seed for the permutation
+            drop_remainder: Skip the last, smaller batch
+        """
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        if shuffle:
+            indices = np.random.default_rng(seed).permutation(indices)
+        stop = len(indices) - len(indices) % batch_size if drop_remainder else len(indices)
+        for start in range(0, stop, batch_size):
+            yield self.take(indices[start:start + batch_size])
+
+    def split(self, val_fraction: float = 0.2, seed: Optional[int] = 0,
+              stratify: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Train/validation split as sorted index arrays.
+
+        Args:
+            val_fraction: Share of rows held out for validation
+            stratify: Hold out the same share of every class
+        """
+        rng = np.random.default_rng(seed)
+        if stratify:
+            groups = [np.flatnonzero(self.labels == label) for label in np.unique(self.labels)]
+        else:
+            groups = [np.arange(len(self))]
+        val = []
+        for group in groups:
+            count = int(round(len(group) * val_fraction))
+            val.append(rng.choice(group, size=count, replace=False))
+        val = np.sort(np.concatenate(val)) if val else np.zeros(0, dtype=np.int64)
+        train = np.setdiff1d(np.arange(len(self)), val, assume_unique=True)
+        return train, val
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Materialize the whole dataset, e.g. for helpers.load_dataset callers"""
+        keypoints = np.concatenate([np.asarray(chunk[:]) for chunk in self._keypoints]) \
+            if self._keypoints else np.zeros((0, self.n_features), dtype=np.float32)
+        return keypoints[:len(self)], self.labels
+
+    def close(self):
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+
+def convert_csv(csv_path: str, out_dir: str, format: str = "npy", chunk_size: int = 65536,
+                classes: Optional[Sequence[str]] = None) -> int:
+    """
+    Convert a save_to_csv dataset (feature columns + label column) to the binary format.
+
+    The CSV is streamed in `chunk_size` row pieces, so it is never held in
+    memory whole. String labels become class indices; integer labels are
+    kept as they are.
+
+    Returns:
+        Number of rows written
+    """
+    import pandas as pd
+
+    with KeypointDatasetWriter(out_dir, chunk_size=chunk_size, format=format, classes=classes) as writer:
+        for frame in pd.read_csv(csv_path, header=0, chunksize=chunk_size):
+            features = frame.iloc[:, :-1].to_numpy(dtype=np.float32)
+            if features.shape[1] != writer.n_features:
+                raise ValueError(f"{csv_path}: expected {writer.n_features} feature columns, "
+                                 f"got {features.shape[1]}")
+            writer.append_batch(features, frame.iloc[:, -1].tolist())
+        return len(writer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a CSV keypoint dataset to the chunked binary format")
+    parser.add_argument("csv", help="Input CSV, e.g. data/processed/dataset.csv")
+    parser.add_argument("out", help="Output dataset directory")
+    parser.add_argument("--format", choices=("npy", "h5"), default="npy")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    rows = convert_csv(args.csv, args.out, args.format, args.chunk_size)
+    print(f"Wrote {rows} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Buffered, chunked keypoint dataset writer for capture sessions."""
+
+import datetime
+import json
+import os
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+H5_NAME = "data.h5"
+FORMAT_VERSION = 1
+NUM_FEATURES = 33 * 3
+
+Label = Union[int, str]
+
+
+class KeypointDatasetWriter:
+    """
+    Keeps a dataset open for a whole capture session.
+
+    `append` copies one row into a preallocated float32 buffer and is
+    otherwise free: no syscalls and no float formatting per sample. Every
+    `chunk_size` rows the buffer is flushed to disk in a binary columnar
+    layout inside the dataset directory:
+
+    - format "npy": keypoints_00000.npy (rows x 99 float32) and
+      labels_00000.npy (int32) per chunk
+    - format "h5": one data.h5 with resizable, chunked "keypoints" and
+      "labels" datasets (needs h5py)
+
+    manifest.json records the format, row count, chunks and class names.
+    It is rewritten atomically after every flush, so a crash loses at most
+    the rows still in the buffer.
+
+    Usage:
+        with KeypointDatasetWriter("data/processed/session_01", classes=classes) as writer:
+            writer.append(keypoints, label)
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1024, format: str = "npy",
+                 classes: Optional[Sequence[str]] = None, n_features: int = NUM_FEATURES):
+        """
+        Args:
+            path: Dataset directory; an existing dataset there is appended to
+            chunk_size: Rows buffered in memory between flushes
+            format: "npy" or "h5"
+            classes: Class names; string labels are mapped to their index
+            n_features: Values per row
+        """
+        if format not in ("npy", "h5"):
+            raise ValueError(f"unknown dataset format {format!r}")
+        self.path = path
+        self.chunk_size = chunk_size
+        self.n_features = n_features
+        self.classes: List[str] = [str(c) for c in classes] if classes is not None else []
+        self.chunks: List[dict] = []
+        self.rows = 0
+        self.format = format
+        self.created = datetime.datetime.now().isoformat(timespec="seconds")
+
+        self._keypoints = np.empty((chunk_size, n_features), dtype=np.float32)
+        self._labels = np.empty(chunk_size, dtype=np.int32)
+        self._buffered = 0
+        self._h5 = None
+
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            self._resume(manifest_path)
+        if self.format == "h5":
+            self._open_h5()
+
+    def _resume(self, manifest_path: str):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["format"] != self.format or manifest["n_features"] != self.n_features:
+            raise ValueError(f"{self.path} holds a {manifest['format']} dataset with "
+                             f"{manifest['n_features']} features")
+        self.rows = manifest["rows"]
+        self.chunks = manifest.get("chunks", [])
+        self.created = manifest.get("created", self.created)
+        for name in manifest.get("classes", []):
+            if name not in self.classes:
+                self.classes.append(name)
+
+    def _open_h5(self):
+        import h5py
+
+        self._h5 = h5py.File(os.path.join(self.path, H5_NAME), "a")
+        if "keypoints" not in self._h5:
+            self._h5.create_dataset("keypoints", shape=(0, self.n_features), maxshape=(None, self.n_features),
+                                    dtype="float32", chunks=(self.chunk_size, self.n_features))
+            self._h5.create_dataset("labels", shape=(0,), maxshape=(None,), dtype="int32",
+                                    chunks=(self.chunk_size,))
+
+    def __enter__(self) -> "KeypointDatasetWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows + self._buffered
+
+    def label_index(self, label: Label) -> int:
+        """Integer label, registering new class names as they appear"""
+        if isinstance(label, str):
+            if label not in self.classes:
+                self.classes.append(label)
+            return self.classes.index(label)
+        return int(label)
+
+    def append(self, keypoints, label: Label):
+        """Buffer one sample of `n_features` values"""
+        self._keypoints[self._buffered] = np.asarray(keypoints, dtype=np.float32).reshape(self.n_features)
+        self._labels[self._buffered] = self.label_index(label)
+        self._buffered += 1
+        if self._buffered == self.chunk_size:
+            self.flush()
+
+    def append_batch(self, keypoints: np.ndarray, labels: Sequence[Label]):
+        """Buffer many samples at once"""
+        keypoints = np.asarray(keypoints, dtype=np.float32).reshape(-1, self.n_features)
+        labels = np.fromiter((self.label_index(label) for label in labels), dtype=np.int32, count=len(keypoints))
+        start = 0
+        while start < len(keypoints):
+            count = min(self.chunk_size - self._buffered, len(keypoints) - start)
+            self._keypoints[self._buffered:self._buffered + count] = keypoints[start:start + count]
+            self._labels[self._buffered:self._buffered + count] = labels[start:start + count]
+            self._buffered += count
+            start += count
+            if self._buffered == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one chunk and update the manifest"""
+        if self._buffered == 0:
+            return
+        keypoints = self._keypoints[:self._buffered]
+        labels = self._labels[:self._buffered]
+
+        if self._h5 is not None:
+            for name, values in (("keypoints", keypoints), ("labels", labels)):
+                dataset = self._h5[name]
+                dataset.resize(self.rows + len(values), axis=0)
+                dataset[self.rows:] = values
+            self._h5.flush()
+        else:
+            index = len(self.chunks)
+            chunk = {"keypoints": f"keypoints_{index:05d}.npy", "labels": f"labels_{index:05d}.npy",
+                     "rows": int(self._buffered)}
+            for key, values in (("keypoints", keypoints), ("labels", labels)):
+                np.save(os.path.join(self.path, chunk[key]), values)
+            self.chunks.append(chunk)
+
+        self.rows += self._buffered
+        self._buffered = 0
+        self._write_manifest()
+
+    def truncate(self, rows: int):
+        """
+        Drop every flushed row from index `rows` on, e.g. rows a crashed run
+        wrote but never recorded elsewhere. Call before appending.
+        """
+        if rows >= self.rows:
+            return
+        if self._h5 is not None:
+            for name in ("keypoints", "labels"):
+                self._h5[name].resize(rows, axis=0)
+            self._h5.flush()
+        else:
+            kept, start = [], 0
+            for chunk in self.chunks:
+                keep = min(chunk["rows"], rows - start)
+                if keep <= 0:
+                    for key in ("keypoints", "labels"):
+                        os.remove(os.path.join(self.path, chunk[key]))
+                    continue
+                if keep < chunk["rows"]:
+                    for key in ("keypoints", "labels"):
+                        path = os.path.join(self.path, chunk[key])
+                        np.save(path, np.load(path)[:keep])
+                    chunk = dict(chunk, rows=int(keep))
+                kept.append(chunk)
+                start += chunk["rows"]
+            self.chunks = kept
+        self.rows = rows
+        self._write_manifest()
+
+    def manifest(self) -> dict:
+        manifest = {
+            "format": self.format,
+            "version": FORMAT_VERSION,
+            "n_features": self.n_features,
+            "dtype": "float32",
+            "rows": self.rows,
+            "classes": self.classes,
+            "created": self.created,
+            "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        if self.format == "h5":
+            manifest["file"] = H5_NAME
+        else:
+            manifest["chunks"] = self.chunks
+        return manifest
+
+    def _write_manifest(self):
+        path = os.path.join(self.path, MANIFEST_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.manifest(), f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """Flush what is left and release the file"""
+        self.flush()
+        if not os.path.exists(os.path.join(self.path, MANIFEST_NAME)):
+            self._write_manifest()
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
@@ -0,0 +1,14 @@
+"""Frame resizing helpers; the implementation lives in bpd_common.frame_utils, shared with the other app."""
+
+import numpy as np
+
+from bpd_common import frame_utils as _shared
+from bpd_common.frame_utils import resize_for_display, scale_keypoints  # noqa: F401
+
+# Width of the downscaled copy that pose estimation runs on in this app
+PROCESS_WIDTH = 640
+
+
+def resize_for_processing(frame: np.ndarray, width: int = PROCESS_WIDTH) -> np.ndarray:
+    """bpd_common.frame_utils.resize_for_processing with this app's PROCESS_WIDTH as default"""
+    return _shared.resize_for_processing(frame, width)
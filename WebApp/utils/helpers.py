@@ -14,6 +14,10 @@ def save_to_csv(keypoints: List[float], label: int, filename: str = "data/proces
     """
     Save keypoints and labels to a CSV file.
 
+    Opens the file and formats 99 floats as text for every sample; for
+    capture sessions use utils.dataset_writer.KeypointDatasetWriter, which
+    stays open and writes binary chunks.
+
     Args:
         keypoints: List of keypoint coordinates
         label: Class label
@@ -40,6 +44,9 @@ def save_raw(image: np.ndarray, label: Any, filename: str = "data/raw/") -> None
     Save raw images to a directory, organized by label.
     The images will be saved in: filename/label/image_timestamp.png
 
+    Encodes the PNG on the calling thread; capture loops should use
+    utils.image_saver.AsyncImageSaver instead.
+
     Args:
         image: Numpy array of the image to save
         label: Class label (will be converted to string)
@@ -61,10 +68,15 @@ def save_raw(image: np.ndarray, label: Any, filename: str = "data/raw/") -> None
 
 def load_dataset(filename: str = "data/processed/dataset.csv") -> Tuple[np.ndarray, np.ndarray]:
     """
-    Load dataset from a CSV file.
+    Load dataset from a CSV file or a binary dataset directory.
+
+    A directory written by KeypointDatasetWriter (or converted with
+    utils.dataset_loader) is read through memory maps, which is far faster
+    than parsing the CSV. For datasets that do not fit in memory, use
+    utils.dataset_loader.KeypointDataset and iterate in batches instead.
 
     Args:
-        filename: Path to input CSV file
+        filename: Path to input CSV file or dataset directory
 
     Returns:
         Tuple containing:
@@ -79,7 +91,13 @@ def load_dataset(filename: str = "data/processed/dataset.csv") -> Tuple[np.ndarr
             "2. Run: python main.py --mode capture\n"
             "3. Collect data for all posture classes"
         )
-    
+
+    if os.path.isdir(filename):
+        from utils.dataset_loader import KeypointDataset
+
+        with KeypointDataset(filename) as dataset:
+            return dataset.to_arrays()
+
     # Read data using pandas
     df = pd.read_csv(filename, header=0)  # Changed to read with header
 
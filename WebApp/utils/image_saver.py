@@ -0,0 +1,197 @@
+"""Background image saving for data capture."""
+
+import datetime
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import cv2
+import numpy as np
+
+FORMATS = ("jpg", "webp", "png")
+
+
+def imwrite_params(format: str, quality: int) -> List[int]:
+    """
+    cv2.imwrite parameters for `format`.
+
+    Args:
+        format: "jpg", "webp" or "png"
+        quality: 1-100 for JPEG/WebP; for PNG it maps to compression level
+            (100 = fastest, 0 = smallest), since PNG is always lossless
+    """
+    if format == "jpg":
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if format == "webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, quality]
+    if format == "png":
+        return [cv2.IMWRITE_PNG_COMPRESSION, round(9 * (100 - quality) / 100)]
+    raise ValueError(f"unknown image format {format!r}, expected one of {FORMATS}")
+
+
+class AsyncImageSaver:
+    """
+    Saves captured frames from worker threads so the capture loop never waits.
+
+    `save` only puts the frame on a bounded queue; a pool of threads encodes
+    and writes it (cv2 releases the GIL while encoding). Files land in
+    base_dir/label/<timestamp>_<n>.<format>, like helpers.save_raw. Label
+    directories are created once, on first use, instead of per image.
+
+    When the queue is full the saver applies backpressure: by default the
+    frame is dropped and counted (`dropped`), so the capture rate holds;
+    with block=True `save` waits for a free slot instead. `backlog` tells
+    the caller how close to full the queue is.
+
+    With `shards` (a utils.image_shards.ShardWriter) the encoded frames are
+    appended to tar shards instead of written as one file each.
+
+    The saver takes ownership of the frame: do not draw on it after `save`,
+    or pass copy=True.
+
+    Usage:
+        with AsyncImageSaver("data/raw/", format="jpg", quality=95) as saver:
+            saver.save(frame, label)
+    """
+
+    def __init__(self, base_dir: str = "data/raw/", format: str = "jpg", quality: int = 95,
+                 workers: int = 2, max_pending: int = 64, block: bool = False, shards=None):
+        """
+        Args:
+            base_dir: Root directory; one subdirectory per label
+            format: "jpg", "webp" or "png"
+            quality: Encoder quality, see imwrite_params
+            workers: Encoding threads
+            max_pending: Frames that may wait in the queue
+            block: Wait for a free slot instead of dropping when the queue is full
+            shards: ShardWriter to pack frames into; base_dir is then unused
+        """
+        self.base_dir = base_dir
+        self.format = format
+        self.params = imwrite_params(format, quality)
+        self.block = block
+        self.shards = shards
+        self.max_pending = max_pending
+        self.submitted = 0
+        self.saved = 0
+        self.dropped = 0
+        self.failed = 0
+        self._encode_seconds = 0.0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_pending)
+        self._counter = itertools.count()
+        self._dirs: Set[str] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"image-saver-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "AsyncImageSaver":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def backlog(self) -> float:
+        """Queue fill level, 0 (idle) to 1 (frames are being dropped or blocked)"""
+        return self.pending / self.max_pending
+
+    def _label_dir(self, label: Any) -> str:
+        directory = os.path.join(self.base_dir, str(label))
+        if directory not in self._dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._dirs.add(directory)
+        return directory
+
+    def save(self, image: np.ndarray, label: Any, copy: bool = False) -> bool:
+        """
+        Queue a frame for saving.
+
+        Returns:
+            False if the frame was dropped because the queue is full
+        """
+        if self._closed:
+            raise RuntimeError("AsyncImageSaver is closed")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filename = f"{timestamp}_{next(self._counter)}.{self.format}"
+        item = (image.copy() if copy else image, label, filename)
+        try:
+            self._queue.put(item, block=self.block)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            image, label, filename = item
+            started = time.perf_counter()
+            try:
+                if self.shards is not None:
+                    ok, data = cv2.imencode(f".{self.format}", image, self.params)
+                    if ok:
+                        self.shards.write_encoded(data.tobytes(), label, self.format,
+                                                  key=os.path.splitext(filename)[0])
+                else:
+                    with self._lock:
+                        directory = self._label_dir(label)
+                    ok = cv2.imwrite(os.path.join(directory, filename), image, self.params)
+            except (cv2.error, OSError):
+                ok = False
+            with self._lock:
+                self._encode_seconds += time.perf_counter() - started
+                if ok:
+                    self.saved += 1
+                else:
+                    self.failed += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Counters for logging or the capture UI"""
+        with self._lock:
+            done = self.saved + self.failed
+            return {
+                "submitted": self.submitted,
+                "saved": self.saved,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "pending": self.pending,
+                "backlog": round(self.backlog, 2),
+                "encode_ms": round(self._encode_seconds / done * 1000, 2) if done else 0.0,
+            }
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting frames and shut the workers down.
+
+        Args:
+            wait: Finish the queued frames first; otherwise they are discarded
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not wait:
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
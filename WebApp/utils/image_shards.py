@@ -0,0 +1,284 @@
+"""
+Packed tar shards for raw capture images.
+
+Instead of one small file per frame, encoded frames are appended to
+WebDataset-style tar shards (shard-00000.tar, shard-00001.tar, ...): each
+sample is a <key>.<ext> image member followed by a <key>.cls label member,
+so the shards also stream with tar or the webdataset library. index.tsv
+lists every sample with its shard and byte offset for random access.
+
+Pack an existing data/raw tree from the WebApp directory with:
+
+    python -m utils.image_shards data/raw data/shards
+"""
+
+import argparse
+import datetime
+import io
+import itertools
+import os
+import tarfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.image_saver import FORMATS, imwrite_params
+
+INDEX_NAME = "index.tsv"
+SHARD_PATTERN = "shard-{:05d}.tar"
+MAX_SHARD_BYTES = 256 * 1024 * 1024
+BLOCK_SIZE = tarfile.BLOCKSIZE
+
+
+class ShardWriter:
+    """
+    Appends encoded frames to size-capped tar shards.
+
+    A shard is closed and the next one started once it would grow past
+    `max_shard_bytes` (or hold `max_shard_samples` samples). Every
+    `flush_every` samples the open shard and then the index are flushed, so
+    an index line never reaches disk before its image bytes do. After a
+    crash the shard has no tar end-of-archive marker, but every indexed
+    sample in it is still readable; at most the last `flush_every - 1`
+    samples are lost. Opening an existing directory appends to it in a new
+    shard.
+    `write_encoded` is thread-safe, so AsyncImageSaver workers can share
+    one writer.
+
+    Usage:
+        with ShardWriter("data/shards", format="jpg", quality=95) as shards:
+            shards.write(frame, label)
+    """
+
+    def __init__(self, path: str, max_shard_bytes: int = MAX_SHARD_BYTES,
+                 max_shard_samples: Optional[int] = None, format: str = "jpg", quality: int = 95,
+                 flush_every: int = 1):
+        """
+        Args:
+            path: Shard directory
+            max_shard_bytes: Size at which a shard is closed
+            max_shard_samples: Sample count at which a shard is closed, no limit by default
+            flush_every: Samples between flushes of the open shard and the index
+            format: Image format for `write`, see image_saver.imwrite_params
+            quality: Encoder quality for `write`
+        """
+        self.path = path
+        self.max_shard_bytes = max_shard_bytes
+        self.max_shard_samples = max_shard_samples
+        self.format = format
+        self.params = imwrite_params(format, quality)
+        self.flush_every = max(1, flush_every)
+        self.samples = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._tar: Optional[tarfile.TarFile] = None
+        self._shard_samples = 0
+
+        os.makedirs(path, exist_ok=True)
+        self.shard = len([name for name in os.listdir(path) if name.startswith("shard-")])
+        index_path = os.path.join(path, INDEX_NAME)
+        self._index = open(index_path, "a")
+        if self._index.tell() > 0:
+            with open(index_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._index.write("\n")  # end a line cut short by a crash
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_shard(self):
+        self._tar = tarfile.open(os.path.join(self.path, SHARD_PATTERN.format(self.shard)), "w",
+                                 format=tarfile.USTAR_FORMAT)
+        self._shard_samples = 0
+
+    def _close_shard(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+            self._index.flush()
+            self.shard += 1
+
+    def _add(self, name: str, data: bytes, mtime: float) -> int:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = mtime
+        self._tar.addfile(info, io.BytesIO(data))
+        # addfile leaves the offset after the data, padded to a whole block
+        return self._tar.offset - -(-len(data) // BLOCK_SIZE) * BLOCK_SIZE
+
+    def new_key(self) -> str:
+        """Unique, time-ordered sample key, like the save_raw file names"""
+        return f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{next(self._counter)}"
+
+    def write(self, image: np.ndarray, label: Any, key: Optional[str] = None) -> str:
+        """Encode a frame and append it; returns its key"""
+        ok, data = cv2.imencode(f".{self.format}", image, self.params)
+        if not ok:
+            raise ValueError(f"could not encode image as {self.format}")
+        return self.write_encoded(data.tobytes(), label, self.format, key)
+
+    def write_encoded(self, data: bytes, label: Any, ext: str, key: Optional[str] = None) -> str:
+        """Append already encoded image bytes; returns the sample key"""
+        key = key or self.new_key()
+        label = str(label)
+        with self._lock:
+            if self._tar is not None and (
+                    self._tar.offset + len(data) > self.max_shard_bytes
+                    or self.max_shard_samples is not None and self._shard_samples >= self.max_shard_samples):
+                self._close_shard()
+            if self._tar is None:
+                self._open_shard()
+            now = time.time()
+            offset = self._add(f"{key}.{ext}", data, now)
+            self._add(f"{key}.cls", label.encode(), now)
+            self._index.write(f"{key}\t{label}\t{self.shard}\t{offset}\t{len(data)}\n")
+            self._shard_samples += 1
+            self.samples += 1
+            if self.samples % self.flush_every == 0:
+                self._tar.fileobj.flush()  # image bytes before the index line that points at them
+                self._index.flush()
+        return key
+
+    def close(self):
+        with self._lock:
+            self._close_shard()
+            self._index.close()
+
+
+class ShardReader:
+    """
+    Reads shards written by ShardWriter.
+
+    Random access (`reader[i]`, `get(key)`) uses the index and one seek and
+    read per sample. `stream` reads the shards front to back as tar streams, which
+    is the fast path for whole-dataset passes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.keys: List[str] = []
+        self.labels: List[str] = []
+        shards, offsets, sizes = [], [], []
+        with open(os.path.join(path, INDEX_NAME)) as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) != 5:
+                    continue  # a line cut short by a crash
+                self.keys.append(fields[0])
+                self.labels.append(fields[1])
+                shards.append(int(fields[2]))
+                offsets.append(int(fields[3]))
+                sizes.append(int(fields[4]))
+        self.shards = np.array(shards, dtype=np.int32)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.sizes = np.array(sizes, dtype=np.int64)
+        self._positions: Optional[Dict[str, int]] = None
+        self._files: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __enter__(self) -> "ShardReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_bytes(self, index: int) -> bytes:
+        """Encoded image bytes of sample `index`"""
+        shard = int(self.shards[index])
+        with self._lock:
+            f = self._files.get(shard)
+            if f is None:
+                f = self._files[shard] = open(os.path.join(self.path, SHARD_PATTERN.format(shard)), "rb")
+            f.seek(int(self.offsets[index]))
+            return f.read(int(self.sizes[index]))
+
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, str]:
+        """(decoded BGR image, label) of sample `index`"""
+        data = np.frombuffer(self.read_bytes(index), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR), self.labels[index]
+
+    def get(self, key: str) -> Tuple[np.ndarray, str]:
+        """(decoded BGR image, label) by sample key"""
+        if self._positions is None:
+            self._positions = {key: i for i, key in enumerate(self.keys)}
+        return self[self._positions[key]]
+
+    def stream(self, decode: bool = True) -> Iterator[Tuple[str, Any, str]]:
+        """
+        Yield (key, image, label) in write order, reading each shard sequentially.
+
+        Args:
+            decode: Decode images; otherwise yield the encoded bytes
+        """
+        for shard in np.unique(self.shards):
+            path = os.path.join(self.path, SHARD_PATTERN.format(shard))
+            sample: Dict[str, Any] = {}
+            with open(path, "rb") as f, tarfile.open(fileobj=f, mode="r|") as tar:
+                try:
+                    for member in tar:
+                        key, ext = member.name.rsplit(".", 1)
+                        data = tar.extractfile(member).read()
+                        if ext == "cls":
+                            image = sample.pop(key, None)
+                            if image is not None:
+                                yield key, image, data.decode()
+                        elif decode:
+                            sample[key] = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                        else:
+                            sample[key] = data
+                except tarfile.ReadError:
+                    pass  # shard cut short by a crash: keep what was complete
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+def pack_directory(raw_dir: str, out_dir: str, max_shard_bytes: int = MAX_SHARD_BYTES) -> int:
+    """
+    Pack a save_raw tree (raw_dir/<label>/<file>) into shards without re-encoding.
+
+    Returns:
+        Number of images packed
+    """
+    count = 0
+    with ShardWriter(out_dir, max_shard_bytes=max_shard_bytes) as shards:
+        for label in sorted(os.listdir(raw_dir)):
+            label_dir = os.path.join(raw_dir, label)
+            if not os.path.isdir(label_dir):
+                continue
+            for name in sorted(os.listdir(label_dir)):
+                stem, ext = os.path.splitext(name)
+                ext = ext[1:].lower()
+                if ext not in FORMATS and ext not in ("jpeg", "bmp"):
+                    continue
+                with open(os.path.join(label_dir, name), "rb") as f:
+                    shards.write_encoded(f.read(), label, ext, key=f"{label}_{stem}")
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a data/raw image tree into tar shards")
+    parser.add_argument("raw_dir", help="Image tree, one directory per label")
+    parser.add_argument("out", help="Shard directory")
+    parser.add_argument("--shard-mb", type=int, default=MAX_SHARD_BYTES // (1024 * 1024))
+    args = parser.parse_args()
+
+    count = pack_directory(args.raw_dir, args.out, args.shard_mb * 1024 * 1024)
+    print(f"Packed {count} images into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,22 @@ import numpy as np
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5)
 
-def extract_keypoints(image):
+def keypoints_from_results(results):
     """
-    Extract pose keypoints using MediaPipe Pose.
+    Extract pose keypoints from MediaPipe results that were already computed.
     """
-    results = pose.process(image)
     if results.pose_landmarks:
         keypoints = np.array([[lm.x, lm.y, lm.z] for lm in results.pose_landmarks.landmark]).flatten()
         return keypoints
     else:
         return None
 
+def extract_keypoints(image):
+    """
+    Extract pose keypoints using MediaPipe Pose.
+    """
+    return keypoints_from_results(pose.process(image))
+
 def extract_head_keypoints(image):
     """Extract head keypoints (nose, eyes, ears)"""
     results = pose.process(image)
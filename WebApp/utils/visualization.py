@@ -2,26 +2,46 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from utils.frame_utils import scale_keypoints
+
 mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
 
+def draw_keypoints(image, keypoints, color=(0, 255, 0), radius=2, thickness=2):
+    """
+    Draw a normalized keypoint array on the image, scaled to its size.
+
+    Args:
+        image: Image to draw on (any resolution)
+        keypoints: Flattened (99,) or (33, 3) array of normalized coordinates
+    """
+    points = scale_keypoints(keypoints, (image.shape[1], image.shape[0]))
+    for start, end in mp_pose.POSE_CONNECTIONS:
+        cv2.line(image, tuple(points[start]), tuple(points[end]), color, thickness)
+    for x, y in points:
+        cv2.circle(image, (int(x), int(y)), radius, color, -1)
+    return image
+
 def draw_landmarks(image, keypoints=None):
     """
     Draw pose landmarks on the image.
-    
+
+    Landmarks are normalized, so the image can be a display-sized frame
+    rather than the frame the pose was estimated on.
+
     Args:
         image: Input image
         keypoints: Numpy array of keypoints or MediaPipe results object
     """
-    # If keypoints is a numpy array, skip drawing
+    # If keypoints is a numpy array, scale it to the image and draw it
     if isinstance(keypoints, np.ndarray):
-        return image
-        
+        return draw_keypoints(image, keypoints)
+
     # If keypoints is MediaPipe results, draw landmarks
-    if hasattr(keypoints, 'pose_landmarks'):
+    if hasattr(keypoints, 'pose_landmarks') and keypoints.pose_landmarks:
         mp_drawing.draw_landmarks(
-            image, 
-            keypoints.pose_landmarks, 
+            image,
+            keypoints.pose_landmarks,
             mp_pose.POSE_CONNECTIONS
         )
-    return image
\ No newline at end of file
+    return image
@@ -0,0 +1,8 @@
+"""
+Code shared by DesktopApp and WebApp.
+
+Neither app is an installed package: DesktopApp runs from main.py, which
+adds the repository root to sys.path, and WebApp runs from its own
+directory with `python -m`, reaching these modules through its
+WebApp/bpd_common package.
+"""
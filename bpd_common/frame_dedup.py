@@ -0,0 +1,109 @@
+"""Static-scene frame deduplication in front of pose estimation."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+FINGERPRINT_SIZE = (32, 24)
+
+
+@dataclass
+class PostureResult:
+    """Output of the pose + classifier stages for one frame."""
+
+    landmarks: Any = None                   # MediaPipe NormalizedLandmarkList
+    keypoints: Optional[np.ndarray] = None  # Flattened (99,) keypoints
+    prediction: Optional[np.ndarray] = None  # Class probabilities, shape (1, n_classes)
+
+
+def fingerprint(frame: np.ndarray, size: Tuple[int, int] = FINGERPRINT_SIZE) -> np.ndarray:
+    """
+    Downsampled grayscale fingerprint of a frame.
+
+    Args:
+        frame: BGR/RGB or grayscale frame
+        size: Fingerprint size as (width, height)
+
+    Returns:
+        float32 array of shape (height, width)
+    """
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small.astype(np.float32)
+
+
+class FrameDeduplicator:
+    """
+    Reuses the last PostureResult while the scene does not change.
+
+    Each frame is reduced to a 32x24 fingerprint and compared, by mean
+    absolute difference, with the fingerprint of the last frame that was
+    actually processed. Below `threshold` the cached result is returned.
+    Comparing against the last processed frame (rather than the previous
+    one) means slow drift still triggers a refresh, and `max_skip` forces one
+    periodically regardless.
+
+    Usage:
+        result = dedup.lookup(frame)
+        if result is None:
+            result = run_pose_and_classifier(frame)
+            dedup.store(result)
+    """
+
+    def __init__(self, threshold: float = 2.0, max_skip: int = 15):
+        """
+        Args:
+            threshold: Mean absolute gray-level difference (0-255) treated as a change
+            max_skip: Maximum consecutive frames served from the cache
+        """
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.frames = 0
+        self.skipped = 0
+        self._reference: Optional[np.ndarray] = None
+        self._cached: Optional[PostureResult] = None
+        self._run = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of frames that skipped pose and classification"""
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def lookup(self, frame: np.ndarray) -> Optional[PostureResult]:
+        """Return the cached result if `frame` matches the reference, else None"""
+        self.frames += 1
+        current = fingerprint(frame)
+        if (
+            self._cached is not None
+            and self._run < self.max_skip
+            and float(np.mean(cv2.absdiff(current, self._reference))) < self.threshold
+        ):
+            self._run += 1
+            self.skipped += 1
+            return self._cached
+
+        self._reference = current
+        self._cached = None
+        self._run = 0
+        return None
+
+    def store(self, result: PostureResult):
+        """Cache the result computed for the frame passed to the last `lookup`"""
+        self._cached = result
+
+    def reset(self):
+        """Drop the reference and cached result"""
+        self._reference = None
+        self._cached = None
+        self._run = 0
+
+    def stats(self) -> Dict[str, object]:
+        """Skip counters for metrics"""
+        return {
+            "frames": self.frames,
+            "frames_skipped": self.skipped,
+            "skip_ratio": round(self.skip_ratio, 3),
+        }
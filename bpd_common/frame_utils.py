@@ -0,0 +1,60 @@
+"""Frame resizing helpers that keep pose processing separate from display, shared by both apps."""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+def resize_for_processing(frame: np.ndarray, width: int) -> np.ndarray:
+    """
+    Downscale a frame for pose estimation, keeping its aspect ratio.
+
+    MediaPipe returns landmarks normalized to [0, 1], so the result can be
+    drawn on a frame of any size. Frames that are already small enough are
+    returned as-is (never upscaled).
+
+    Args:
+        frame: Captured frame
+        width: Target width in pixels; each app sets its own PROCESS_WIDTH
+
+    Returns:
+        Frame with at most `width` pixels per row
+    """
+    h, w = frame.shape[:2]
+    if w <= width:
+        return frame
+    height = max(1, int(round(h * width / w)))
+    return cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def resize_for_display(frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Resize a frame to the exact (width, height) used for display.
+
+    Args:
+        frame: Captured frame
+        size: Display size as (width, height)
+
+    Returns:
+        Frame of the requested size
+    """
+    if (frame.shape[1], frame.shape[0]) == tuple(size):
+        return frame
+    interpolation = cv2.INTER_AREA if frame.shape[1] > size[0] else cv2.INTER_LINEAR
+    return cv2.resize(frame, tuple(size), interpolation=interpolation)
+
+
+def scale_keypoints(keypoints: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Convert normalized keypoints to integer pixel coordinates.
+
+    Args:
+        keypoints: Flattened (99,) or (33, 3) array of normalized x, y, z
+        size: Target image size as (width, height)
+
+    Returns:
+        (33, 2) int32 array of pixel coordinates
+    """
+    points = np.asarray(keypoints, dtype=np.float32).reshape(-1, 3)[:, :2]
+    return np.rint(points * np.array(size, dtype=np.float32)).astype(np.int32)
@@ -0,0 +1,80 @@
+"""Temporal smoothing of pose keypoints between extraction and classification."""
+
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+
+class OneEuroFilter:
+    """
+    Vectorized One-Euro filter over the (33, 3) keypoint array.
+
+    Every coordinate of every joint is filtered independently, but all state
+    (previous value, previous derivative) lives in NumPy arrays, so one call
+    costs a handful of array operations regardless of the joint count.
+    Slow movements are smoothed strongly (`min_cutoff`), fast ones follow the
+    signal closely (`beta` raises the cutoff with speed).
+
+    See: Casiez et al., "1 Euro Filter", CHI 2012.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 5.0, d_cutoff: float = 1.0):
+        """
+        Args:
+            min_cutoff: Cutoff frequency (Hz) when the joint is still
+            beta: Speed coefficient; higher reacts faster to movement
+            d_cutoff: Cutoff frequency (Hz) for the derivative estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x: Optional[np.ndarray] = None
+        self._dx: Optional[np.ndarray] = None
+        self._t: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        """Forget the history, e.g. when the person is lost"""
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    def __call__(self, keypoints: np.ndarray, timestamp: Optional[float] = None) -> np.ndarray:
+        """
+        Filter one set of keypoints.
+
+        Args:
+            keypoints: Flattened (99,) or (33, 3) array
+            timestamp: Capture time in seconds, `time.monotonic()` if None
+
+        Returns:
+            Smoothed keypoints with the same shape as the input
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        x = np.asarray(keypoints, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+
+        if self._x is None:
+            self._x = x.copy()
+            self._dx = np.zeros_like(x)
+            self._t = timestamp
+            return np.reshape(self._x, np.shape(keypoints)).copy()
+
+        dt = timestamp - self._t
+        if dt <= 0:
+            dt = 1.0 / 30
+        self._t = timestamp
+
+        dx = (x - self._x) / dt
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        self._x += self._alpha(cutoff, dt) * (x - self._x)
+        return np.reshape(self._x, np.shape(keypoints)).copy()
@@ -0,0 +1,51 @@
+"""Pure NumPy runtime for small dense posture classifiers (see WebApp/training/distill.py)."""
+
+import numpy as np
+
+
+class NumpyMLP:
+    """
+    Dense ReLU network with a softmax output, evaluated with NumPy only.
+
+    Quacks like the Keras model where the apps use it: `predict(x, verbose=0)`
+    as in OwnCamera and `model(x, training=False)` as in PostureClassifier.
+    Inputs may be (n, 99) or the (n, 33, 3, 1) CNN layout; they are
+    flattened either way.
+    """
+
+    def __init__(self, weights, biases):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyMLP":
+        """Load layers saved by `save` (arrays w0, b0, w1, b1, ...)"""
+        with np.load(path) as data:
+            layers = int(data["layers"])
+            return cls([data[f"w{i}"] for i in range(layers)], [data[f"b{i}"] for i in range(layers)])
+
+    def save(self, path: str):
+        arrays = {"layers": np.array(len(self.weights))}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    def logits(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32).reshape(len(x), -1)
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0.0)
+        return x @ self.weights[-1] + self.biases[-1]
+
+    def predict(self, x: np.ndarray, verbose: int = 0, batch_size=None) -> np.ndarray:
+        """Class probabilities of shape (n, n_classes)"""
+        logits = self.logits(x)
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def __call__(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        return self.predict(x)
+
+    def count_params(self) -> int:
+        return sum(w.size + b.size for w, b in zip(self.weights, self.biases))